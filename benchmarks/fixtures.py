@@ -0,0 +1,146 @@
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_NEWS = os.path.join(ROOT, "dummy_data", "sample_company_news.json")
+EMBEDDING_DIM = 384
+
+_WORDS = (
+    "revenue earnings margin guidance growth demand supply chain factory production deliveries "
+    "quarter outlook analyst upgrade downgrade shares stock investors regulators lawsuit recall "
+    "battery software autonomy pricing competition market europe china expansion partnership "
+    "acquisition layoffs hiring capex cash flow debt dividend buyback valuation forecast risk "
+    "inflation rates tariffs subsidies launch model platform chips cloud energy storage charging"
+).split()
+
+
+def _ts(date: str) -> int:
+    return int(datetime.strptime(date, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+def load_sample_news() -> List[Dict]:
+    """
+    dummy_data/sample_company_news.json in the shape Finnhub's company-news endpoint returns.
+    """
+    with open(SAMPLE_NEWS) as f:
+        articles = json.load(f)
+    return [{
+        "id": art["id"],
+        "datetime": int(datetime.fromisoformat(art["published_at"].replace("Z", "+00:00")).timestamp()),
+        "headline": art["title"],
+        "summary": art["text"],
+        "url": art["url"],
+        "source": art["source"],
+    } for art in articles]
+
+
+def synthetic_news(n: int, company: str, from_date: str, to_date: str, seed: int = 0) -> List[Dict]:
+    """
+    n distinct Finnhub-shaped news items about `company`, spread over the date window.
+    """
+    rng = np.random.default_rng(seed)
+    start, end = _ts(from_date), _ts(to_date) + 86399
+    stamps = rng.integers(start, end, size=n)
+    words = rng.integers(0, len(_WORDS), size=(n, 48))
+    numbers = rng.integers(1, 1000, size=(n, 3))
+    items = []
+    for i in range(n):
+        body = " ".join(_WORDS[w] for w in words[i])
+        items.append({
+            "id": f"synthetic_{i}",
+            "datetime": int(stamps[i]),
+            "headline": f"{company} {_WORDS[words[i, 0]]} {_WORDS[words[i, 1]]} update {i}",
+            "summary": f"{company} reported {numbers[i, 0]} {body} up {numbers[i, 1]} percent after {numbers[i, 2]} days.",
+            "url": f"https://news.example.com/{company.lower()}/{i}",
+            "source": f"Wire{i % 7}",
+        })
+    return items
+
+
+def synthetic_candles(from_ts: int, to_ts: int, seed: int = 0) -> Dict:
+    """
+    Daily Finnhub-style candles (random walk) covering [from_ts, to_ts].
+    """
+    t = np.arange(from_ts - from_ts % 86400, to_ts + 1, 86400)
+    if len(t) == 0:
+        return {}
+    rng = np.random.default_rng(seed)
+    c = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(t))))
+    o = c * (1 + rng.normal(0, 0.01, len(t)))
+    return {
+        "s": "ok",
+        "t": t.tolist(),
+        "o": o.tolist(),
+        "h": (np.maximum(o, c) * 1.01).tolist(),
+        "l": (np.minimum(o, c) * 0.99).tolist(),
+        "c": c.tolist(),
+        "v": rng.integers(1_000_000, 5_000_000, len(t)).astype(float).tolist(),
+    }
+
+
+class RecordedFinnhub:
+    """
+    Stand-in for FinnhubClient serving fixed news and synthetic candles.
+    """
+
+    def __init__(self, news: List[Dict]):
+        self.news = news
+
+    def fetch_company_news(self, symbol: str, from_date: str, to_date: str):
+        return list(self.news)
+
+    def fetch_prices(self, symbol: str, resolution: str = "D", from_timestamp: int = None, to_timestamp: int = None):
+        return synthetic_candles(from_timestamp, to_timestamp)
+
+
+class RecordedNewsApi:
+    def search_articles(self, query: str, from_date: str, to_date: str):
+        return []
+
+
+class RecordedSerper:
+    def search_web(self, query: str):
+        return []
+
+
+class StubLLM:
+    """
+    Replacement for AnalystAgent._call_groq: a fixed schema-valid Groq response,
+    returned after an optional simulated latency.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def __call__(self, messages: list, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        content = {
+            "summary": "Benchmark summary.",
+            "sentiment": "neutral",
+            "key_drivers": ["benchmark"],
+            "risks": ["benchmark"],
+            "evidence": [],
+            "confidence": 0.5,
+        }
+        return {"choices": [{"message": {"content": json.dumps(content)}}]}
+
+
+def fake_embed(texts: List[str], dim: int = EMBEDDING_DIM) -> np.ndarray:
+    """
+    Deterministic hashed bag-of-words vectors, L2-normalised, in place of the model.
+    """
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for i, text in enumerate(texts):
+        buckets = [zlib.crc32(tok.encode("utf-8")) % dim for tok in text.lower().split()]
+        np.add.at(vectors[i], buckets, 1.0)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
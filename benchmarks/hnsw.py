@@ -0,0 +1,148 @@
+import argparse
+import sys
+import os
+import json
+import time
+import logging
+import tempfile
+from itertools import product
+from typing import Dict, List
+from unittest.mock import patch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.fixtures import fake_embed, synthetic_news
+
+logger = logging.getLogger(__name__)
+
+TICKER = "BENCH"
+FROM_DATE = "2023-01-01"
+TO_DATE = "2023-12-31"
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "hnsw.json")
+
+
+def _articles(news: List[Dict]) -> List[Dict]:
+    return [{
+        "id": item["id"],
+        "title": item["headline"],
+        "text": item["summary"],
+        "url": item["url"],
+        "source": item["source"],
+        "published_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(item["datetime"])),
+    } for item in news]
+
+
+def _dir_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / (1024 * 1024)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, top_k: int) -> List[set]:
+    """
+    Brute-force cosine neighbours, the reference for recall.
+    """
+    unit = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    q = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    scores = q @ unit.T
+    return [set(np.argsort(-row, kind="stable")[:top_k].tolist()) for row in scores]
+
+
+def run_grid(docs: int, queries: int, top_k: int, ms: List[int], construction_efs: List[int],
+             search_efs: List[int], seed: int = 0) -> List[Dict]:
+    """
+    Build one collection per (M, construction_ef) from the same synthetic
+    corpus, then measure query latency and recall@top_k for each search_ef.
+    """
+    from chromadb.api.client import SharedSystemClient
+    from src.ingest.chroma_ingest import ChromaIngest, COLLECTION_PREFIX
+
+    articles = _articles(synthetic_news(docs, "Acme", FROM_DATE, TO_DATE, seed=seed))
+    texts = [f"{a['title']}\n{a['text']}" for a in articles]
+    vectors = fake_embed(texts)
+    lookup = dict(zip(texts, vectors))
+    query_texts = [f"{n['headline']}\n{n['summary']}"
+                   for n in synthetic_news(queries, "Acme", FROM_DATE, TO_DATE, seed=seed + 1)]
+    query_vectors = fake_embed(query_texts)
+    position = {a["id"]: i for i, a in enumerate(articles)}
+    truth = exact_top_k(vectors, query_vectors, top_k)
+
+    rows = []
+    for m, construction_ef in product(ms, construction_efs):
+        with tempfile.TemporaryDirectory() as workdir:
+            chroma = ChromaIngest(persist_dir=workdir, hnsw={"M": m, "construction_ef": construction_ef})
+            start = time.perf_counter()
+            with patch("src.ingest.chroma_ingest.embed_texts", side_effect=lambda t: np.array([lookup[x] for x in t])):
+                chroma.ingest_articles(TICKER, articles)
+            build_s = time.perf_counter() - start
+            index_mb = _dir_size_mb(workdir)
+
+            for search_ef in search_efs:
+                chroma.tune_hnsw(TICKER, search_ef=search_ef)
+                # Loaded indexes keep their search_ef; drop them so the new value is read
+                SharedSystemClient.clear_system_cache()
+                chroma = ChromaIngest(persist_dir=workdir)
+                col = chroma.client.get_collection(f"{COLLECTION_PREFIX}{TICKER.lower()}")
+                latencies, hits = [], 0
+                for i, vector in enumerate(query_vectors):
+                    start = time.perf_counter()
+                    result = col.query(query_embeddings=[vector.tolist()], n_results=top_k, include=[])
+                    latencies.append(time.perf_counter() - start)
+                    hits += len({position[d] for d in result["ids"][0]} & truth[i])
+                samples_ms = np.array(latencies) * 1000
+                rows.append({
+                    "M": m,
+                    "construction_ef": construction_ef,
+                    "search_ef": search_ef,
+                    "build_s": round(build_s, 3),
+                    "index_mb": round(index_mb, 2),
+                    "p50_ms": round(float(np.percentile(samples_ms, 50)), 3),
+                    "p95_ms": round(float(np.percentile(samples_ms, 95)), 3),
+                    "recall": round(hits / (top_k * len(query_vectors)), 4),
+                })
+                logger.warning(f"{rows[-1]}")
+    return rows
+
+
+def main(argv=None):
+    """
+    Compare HNSW parameters (M, construction_ef, search_ef) on a synthetic
+    corpus: build time, index size, query latency and recall against exact
+    search. Use it to pick values for CHROMA_HNSW_* / CHROMA_HNSW_OVERRIDES.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark HNSW parameters for a ticker collection")
+    parser.add_argument("--docs", type=int, default=20000, help="Documents in the collection")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--m", type=int, nargs="+", default=[8, 16, 32])
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    rows = run_grid(args.docs, args.queries, args.top_k, args.m, args.construction_ef, args.search_ef, args.seed)
+    output = {
+        "meta": {"docs": args.docs, "queries": args.queries, "top_k": args.top_k, "embeddings": "fake"},
+        "results": rows,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+
+    header = f"{'M':>4} {'c_ef':>5} {'s_ef':>5} {'build_s':>8} {'MB':>7} {'p50_ms':>7} {'p95_ms':>7} {'recall':>7}"
+    print(header)
+    for r in rows:
+        print(f"{r['M']:>4} {r['construction_ef']:>5} {r['search_ef']:>5} {r['build_s']:>8.2f} "
+              f"{r['index_mb']:>7.1f} {r['p50_ms']:>7.2f} {r['p95_ms']:>7.2f} {r['recall']:>7.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
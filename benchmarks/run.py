@@ -0,0 +1,290 @@
+import argparse
+import sys
+import os
+import json
+import time
+import platform
+import logging
+import tempfile
+import tracemalloc
+from contextlib import ExitStack
+from functools import partial
+from typing import Dict, List
+from unittest.mock import patch
+
+try:
+    import resource
+except ImportError:  # Windows: no peak RSS
+    resource = None
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.fixtures import (
+    RecordedFinnhub, RecordedNewsApi, RecordedSerper, StubLLM, fake_embed, load_sample_news, synthetic_news,
+)
+
+logger = logging.getLogger(__name__)
+
+COMPANY = "Tesla"
+TICKER = "TSLA"
+FROM_DATE = "2023-10-01"
+TO_DATE = "2023-10-31"
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+# A metric regresses when it is this much worse than the baseline (relative)...
+DEFAULT_TOLERANCE = 0.2
+# ...and also worse by more than this absolute amount, so tiny timings do not flap
+MIN_DELTA = {"_ms": 2.0, "_s": 0.01, "_mb": 10.0}
+
+# (orchestrator attribute, method, phase name)
+PHASES = (
+    ("collector", "collect", "collect"),
+    ("chroma", "ingest_articles", "ingest"),
+    ("chroma", "query", "retrieve"),
+    ("chroma", "query_aspects", "retrieve"),
+    ("analyst", "analyze", "analyze"),
+)
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of this process so far (monotonic across scenarios).
+    """
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class PhaseTimer:
+    """
+    Wraps instance methods to accumulate wall time (and optionally Python heap peak) per phase.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases: Dict[str, Dict] = {}
+
+    def wrap(self, obj, attr: str, phase: str):
+        original = getattr(obj, attr)
+
+        def timed(*args, **kwargs):
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                entry = self.phases.setdefault(phase, {"time_s": 0.0, "calls": 0})
+                entry["time_s"] += time.perf_counter() - start
+                entry["calls"] += 1
+                if self.trace_memory:
+                    peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+                    entry["python_peak_mb"] = max(entry.get("python_peak_mb", 0.0), peak)
+
+        setattr(obj, attr, timed)
+
+
+def build_orchestrator(persist_dir: str, news: List[Dict], retrieval_mode: str, hybrid: bool, llm_latency: float):
+    """
+    Orchestrator wired to recorded providers, a stubbed LLM and a scratch Chroma directory.
+    """
+    from src.ingest.chroma_ingest import ChromaIngest
+    from src.orchestrator import Orchestrator
+
+    with patch("src.orchestrator.ChromaIngest", partial(ChromaIngest, persist_dir=persist_dir)):
+        orchestrator = Orchestrator(retrieval_mode=retrieval_mode, hybrid=hybrid)
+    orchestrator.collector.finnhub = RecordedFinnhub(news)
+    orchestrator.collector.newsapi = RecordedNewsApi()
+    orchestrator.collector.serper = RecordedSerper()
+    orchestrator.collector.price_store = None
+    orchestrator.analyst.cache = None
+    orchestrator.analyst._call_groq = StubLLM(llm_latency)
+    orchestrator._save_result = lambda ticker, report: None
+    return orchestrator
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ms = np.array(samples) * 1000
+    return {"p50_ms": float(np.percentile(ms, 50)), "p95_ms": float(np.percentile(ms, 95))}
+
+
+def run_scenario(news: List[Dict], args) -> Dict:
+    """
+    One Orchestrator.run over `news` (cold), a second run over the same inputs
+    (everything already ingested), then repeated retrieval queries.
+    """
+    from src.agents.analyst import AnalystAgent
+    from src.ingest.chroma_ingest import ChromaIngest
+    from src.orchestrator import ASPECT_QUERIES
+
+    with tempfile.TemporaryDirectory() as workdir:
+        orchestrator = build_orchestrator(
+            os.path.join(workdir, "chroma"), news, args.retrieval, args.hybrid, args.llm_latency
+        )
+        timer = PhaseTimer(trace_memory=args.trace_memory)
+        for attr, method, phase in PHASES:
+            timer.wrap(getattr(orchestrator, attr), method, phase)
+
+        if args.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        report = orchestrator.run(COMPANY, TICKER, FROM_DATE, TO_DATE, top_k=args.top_k)
+        total = time.perf_counter() - start
+        phases = {name: dict(entry) for name, entry in timer.phases.items()}
+
+        start = time.perf_counter()
+        orchestrator.run(COMPANY, TICKER, FROM_DATE, TO_DATE, top_k=args.top_k)
+        rerun_total = time.perf_counter() - start
+        if args.trace_memory:
+            tracemalloc.stop()
+
+        # Time retrieval directly, outside the phase wrappers
+        chroma = orchestrator.chroma
+        query_text = f"Latest financial performance, strategic moves, risks, and market outlook for {COMPANY}"
+        aspects = {name: q.format(company=COMPANY) for name, q in ASPECT_QUERIES.items()}
+        queries = {
+            "query_single": lambda: ChromaIngest.query(chroma, TICKER, query_text, args.top_k, FROM_DATE, TO_DATE),
+            "query_hybrid": lambda: ChromaIngest.query(chroma, TICKER, query_text, args.top_k, FROM_DATE, TO_DATE,
+                                                       hybrid=True),
+            "query_aspects": lambda: ChromaIngest.query_aspects(chroma, TICKER, aspects, top_k=args.top_k,
+                                                                from_date=FROM_DATE, to_date=TO_DATE),
+        }
+        latencies = {}
+        for name, fn in queries.items():
+            samples = []
+            for _ in range(args.queries):
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+            latencies[name] = _percentiles(samples)
+
+    collect_s = phases.get("collect", {}).get("time_s", 0.0)
+    ingest_s = phases.get("ingest", {}).get("time_s", 0.0)
+    return {
+        "articles": len(news),
+        "report_fallback": AnalystAgent.is_fallback(report),
+        "total_s": total,
+        "rerun_total_s": rerun_total,
+        "phases": phases,
+        "collect_articles_per_s": len(news) / collect_s if collect_s else None,
+        "ingest_docs_per_s": len(news) / ingest_s if ingest_s else None,
+        "retrieval": latencies,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def flatten(results: Dict, prefix: str = "") -> Dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Human-readable regressions of `current` against `baseline` scenario results.
+    Metrics ending in _per_s should grow; _s, _ms and _mb ones should shrink; counts are ignored.
+    """
+    now, before = flatten(current), flatten(baseline)
+    regressions = []
+    for name in sorted(now.keys() & before.keys()):
+        old, new = before[name], now[name]
+        if name.endswith("_per_s"):
+            if old > 0 and new < old * (1 - tolerance):
+                regressions.append(f"{name}: {old:.1f} -> {new:.1f} ({(new / old - 1) * 100:+.0f}%)")
+            continue
+        suffix = next((s for s in MIN_DELTA if name.endswith(s)), None)
+        if suffix is None:
+            continue
+        if new > old * (1 + tolerance) and new - old > MIN_DELTA[suffix]:
+            change = f"{(new / old - 1) * 100:+.0f}%" if old else "new"
+            regressions.append(f"{name}: {old:.3f} -> {new:.3f} ({change})")
+    return regressions
+
+
+def main(argv=None):
+    """
+    Offline benchmarks for the full pipeline: recorded provider responses from
+    dummy_data plus synthetic corpora, a stubbed LLM and optionally fake
+    embeddings. Writes per-phase timings, throughput and peak memory to JSON
+    and flags regressions against a baseline file.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline offline")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10000],
+                        help="Synthetic corpus sizes (articles) to run besides the sample data")
+    parser.add_argument("--fake-embeddings", action="store_true",
+                        help="Use hashed bag-of-words vectors instead of the embedding model")
+    parser.add_argument("--retrieval", choices=["single", "aspects"], default="single")
+    parser.add_argument("--hybrid", action="store_true")
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=20, help="Timed retrieval queries per mode")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated LLM latency in seconds")
+    parser.add_argument("--trace-memory", action="store_true", help="Record Python heap peak per phase (slower)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with ExitStack() as stack:
+        if args.fake_embeddings:
+            stack.enter_context(patch("src.ingest.chroma_ingest.embed_texts", side_effect=fake_embed))
+        else:
+            # Measure the model, not the embedding cache
+            stack.enter_context(patch("src.ingest.embeddings.get_embedding_cache", return_value=None))
+
+        scenarios = {"sample": load_sample_news()}
+        for size in sorted(args.sizes):
+            scenarios[f"synthetic_{size}"] = synthetic_news(size, COMPANY, FROM_DATE, TO_DATE)
+
+        results = {}
+        for name, news in scenarios.items():
+            logger.warning(f"Running scenario '{name}' ({len(news)} articles)")
+            results[name] = run_scenario(news, args)
+
+    output = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "fake_embeddings": args.fake_embeddings,
+            "retrieval": args.retrieval,
+            "hybrid": args.hybrid,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline.get("results", {}), args.tolerance)
+        output["regressions"] = regressions
+
+    for path in [args.output] + ([args.baseline] if args.save_baseline else []):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(output, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    if regressions:
+        print(f"{len(regressions)} regression(s) against {args.baseline}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
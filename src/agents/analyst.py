@@ -1,23 +1,36 @@
 import os
-import requests
 import json
+import time
 import logging
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from src import telemetry
+from src.agents.context_packer import ContextPacker
+from src.clients import transport
+from src.clients.cache import get_llm_cache, LLM_CACHE_TTL
+from src.utils.json_stream import IncrementalJSONObjectParser
 from src.utils.validators import validate_analyst_output
 
 logger = logging.getLogger(__name__)
 
-GROQ_ENDPOINT = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_BASE_URL = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
+GROQ_ENDPOINT = f"{GROQ_BASE_URL}/chat/completions"
 MODEL_ID = "llama-3.3-70b-versatile"
+# Completions can take a while, so the read timeout is longer than for the data APIs
+GROQ_TIMEOUT = (transport.CONNECT_TIMEOUT, float(os.getenv("GROQ_TIMEOUT", "30")))
+# Generation params, shared by the request and the cache key
+MAX_TOKENS = 1024
+TEMPERATURE = 0.1
 
 class AnalystAgent:
-    def __init__(self):
+    def __init__(self, cache=None, packer: ContextPacker = None):
         self.api_key = os.getenv("GROQ_API_KEY")
         if not self.api_key:
             logger.warning("GROQ_API_KEY is not set.")
+        self.cache = cache if cache is not None else get_llm_cache()
+        self.packer = packer or ContextPacker()
 
-    def _call_groq(self, messages: list, max_tokens=1024, temperature=0.1):
+    def _call_groq(self, messages: list, max_tokens=MAX_TOKENS, temperature=TEMPERATURE):
         """
         Call Groq Chat Completions API.
         """
@@ -37,19 +50,64 @@ class AnalystAgent:
             "response_format": {"type": "json_object"} # Enforce JSON mode
         }
 
+        response = None
         try:
-            response = requests.post(GROQ_ENDPOINT, headers=headers, json=payload, timeout=30)
+            response = transport.post(GROQ_ENDPOINT, headers=headers, json=payload, timeout=GROQ_TIMEOUT)
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.RequestException as e:
+        except transport.RequestException as e:
             logger.error(f"Groq API call failed: {e}")
-            if response.text:
+            if response is not None and response.text:
                 logger.error(f"Groq Error details: {response.text}")
             raise
 
-    def analyze(self, company: str, price_summary: dict, doc_snippets: list):
+    def _stream_groq(self, messages: list, max_tokens=MAX_TOKENS, temperature=TEMPERATURE):
         """
-        Generate intelligence report.
+        Call Groq Chat Completions API with `stream: true` and yield content deltas
+        from the server-sent events as they arrive.
+        JSON mode is not combined with streaming, so the system prompt alone asks for JSON.
+        """
+        if not self.api_key:
+            raise ValueError("Groq API key missing")
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+        payload = {
+            "model": MODEL_ID,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+
+        # The read timeout applies per chunk, so long generations don't time out
+        response = transport.post(GROQ_ENDPOINT, headers=headers, json=payload, timeout=GROQ_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                choices = event.get("choices") or []
+                if choices:
+                    delta = choices[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        except transport.RequestException as e:
+            logger.error(f"Groq streaming call failed: {e}")
+            raise
+        finally:
+            response.close()
+
+    def _build_messages(self, company: str, price_summary: dict, doc_snippets: list) -> list:
+        """
+        Render the system and user messages for an analysis request.
         """
         # Format documents for prompt
         docs_text = ""
@@ -94,7 +152,7 @@ JSON SCHEMA:
 COMPANY: {company}
 
 PRICE DATA:
-{json.dumps(price_summary, indent=2)}
+{json.dumps(price_summary, separators=(",", ":"))}
 
 DOCUMENTS:
 {docs_text}
@@ -102,16 +160,47 @@ DOCUMENTS:
 Analyze and generate the JSON report.
 """
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message}
         ]
 
+    @staticmethod
+    def _cache_params(messages: list) -> dict:
+        """
+        Everything that determines the completion: model, rendered messages and generation params.
+        """
+        return {
+            "model": MODEL_ID,
+            "messages": json.dumps(messages, sort_keys=True),
+            "max_tokens": MAX_TOKENS,
+            "temperature": TEMPERATURE
+        }
+
+    def analyze(self, company: str, price_summary: dict, doc_snippets: list, query: str = None):
+        """
+        Generate intelligence report.
+        Documents are packed into the prompt's token budget, ranked against `query`
+        (defaults to the company name).
+        Identical requests are answered from the LLM cache and marked with `cached: True`.
+        """
+        doc_snippets = self.packer.pack(doc_snippets, query or company)
+        messages = self._build_messages(company, price_summary, doc_snippets)
+        cache_params = self._cache_params(messages)
+
+        if self.cache is not None:
+            cached = self.cache.get(GROQ_ENDPOINT, cache_params)
+            if cached is not None:
+                logger.info("Using cached analysis (inputs unchanged)")
+                return dict(cached, cached=True)
+
         try:
             # Call Groq
             logger.info("Sending analysis request to Groq...")
-            result = self._call_groq(messages)
-            
+            with telemetry.span("llm.groq"):
+                result = self._call_groq(messages)
+            self._count_usage(result.get("usage"))
+
             content = result['choices'][0]['message']['content']
             
             # Parse JSON
@@ -122,19 +211,93 @@ Analyze and generate the JSON report.
                 logger.debug(f"Raw output: {content}")
                 raise ValueError("Invalid JSON from LLM")
 
-            # Validate
-            validate_analyst_output(data)
-            
-            return data
+            return self._finalize(data, cache_params)
 
         except Exception as e:
             logger.error(f"Analysis failed: {e}")
             # Return basic fallback to avoid crashing UI
-            return {
-                "summary": "Analysis failed due to technical error.",
-                "sentiment": "neutral",
-                "key_drivers": [],
-                "risks": ["Analysis Error"],
-                "evidence": [],
-                "confidence": 0.0
-            }
+            return self._fallback_report()
+
+    def analyze_stream(self, company: str, price_summary: dict, doc_snippets: list, query: str = None):
+        """
+        Streaming variant of analyze.
+        Yields {"type": "field", "name": ..., "value": ...} as each top-level field of
+        the report completes, then {"type": "report", "report": ...} with the validated
+        report (or the fallback report on failure).
+        """
+        doc_snippets = self.packer.pack(doc_snippets, query or company)
+        messages = self._build_messages(company, price_summary, doc_snippets)
+        cache_params = self._cache_params(messages)
+
+        if self.cache is not None:
+            cached = self.cache.get(GROQ_ENDPOINT, cache_params)
+            if cached is not None:
+                logger.info("Using cached analysis (inputs unchanged)")
+                for name, value in cached.items():
+                    yield {"type": "field", "name": name, "value": value}
+                yield {"type": "report", "report": dict(cached, cached=True)}
+                return
+
+        parser = IncrementalJSONObjectParser()
+        data = {}
+        try:
+            logger.info("Streaming analysis request to Groq...")
+            start = time.perf_counter()
+            for delta in self._stream_groq(messages):
+                for name, value in parser.feed(delta):
+                    data[name] = value
+                    yield {"type": "field", "name": name, "value": value}
+                if parser.done:
+                    break
+
+            telemetry.record_span("llm.groq", (time.perf_counter() - start) * 1000, stream=True)
+            if not parser.done:
+                logger.debug(f"Raw output: {parser.text}")
+                raise ValueError("Incomplete JSON from LLM")
+
+            report = self._finalize(data, cache_params)
+        except Exception as e:
+            logger.error(f"Streaming analysis failed: {e}")
+            report = self._fallback_report()
+        yield {"type": "report", "report": report}
+
+    @staticmethod
+    def _count_usage(usage: dict):
+        """
+        Token counts reported by Groq, if any.
+        """
+        for field in ("prompt_tokens", "completion_tokens"):
+            if usage and usage.get(field):
+                telemetry.count(f"llm.{field}", usage[field])
+
+    def _finalize(self, data: dict, cache_params: dict) -> dict:
+        """
+        Validate a parsed report, cache it and mark it as freshly generated.
+        """
+        validate_analyst_output(data)
+
+        # Only validated reports are cached
+        if self.cache is not None:
+            self.cache.set(GROQ_ENDPOINT, cache_params, data, ttl=LLM_CACHE_TTL)
+
+        return dict(data, cached=False)
+
+    @staticmethod
+    def _fallback_report() -> dict:
+        return {
+            "fallback": True,
+            "summary": "Analysis failed due to technical error.",
+            "sentiment": "neutral",
+            "key_drivers": [],
+            "risks": ["Analysis Error"],
+            "evidence": [],
+            "confidence": 0.0,
+            "cached": False
+        }
+
+    @staticmethod
+    def is_fallback(report: dict) -> bool:
+        """
+        True for the placeholder returned by _fallback_report when analysis failed.
+        """
+        return bool(report) and report.get("fallback") is True
@@ -0,0 +1,163 @@
+import os
+import re
+import math
+import logging
+from datetime import datetime
+from typing import List, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Token budget for the DOCUMENTS block of the analyst prompt
+ANALYST_TOKEN_BUDGET = int(os.getenv("ANALYST_TOKEN_BUDGET", "2000"))
+# Upper bound for a single document after sentence trimming
+MAX_DOC_TOKENS = int(os.getenv("ANALYST_MAX_DOC_TOKENS", "160"))
+# Weight of recency vs. relevance when ranking documents
+RECENCY_WEIGHT = 0.3
+RECENCY_HALF_LIFE_DAYS = 3.0
+# Word-shingle Jaccard above which two snippets count as overlapping
+OVERLAP_THRESHOLD = 0.6
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "to", "was", "were", "will", "with", "this",
+    "latest", "moves", "market",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9$%.]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap token estimate (~4 characters per token for English text).
+    """
+    return math.ceil(len(text) / 4) if text else 0
+
+
+def _words(text: str) -> List[str]:
+    return [w.strip(".") for w in _WORD_RE.findall(text.lower()) if w.strip(".")]
+
+
+def _terms(text: str) -> set:
+    return {w for w in _words(text) if len(w) > 2 and w not in STOPWORDS}
+
+
+def _shingles(text: str, k: int = 3) -> set:
+    words = _words(text)
+    if len(words) < k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def _parse_time(value: str) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class ContextPacker:
+    """
+    Fit retrieved documents into a token budget for the analyst prompt:
+    overlapping snippets are dropped, each document is trimmed to its most
+    query-relevant sentences, and documents are added by relevance and
+    recency until the budget is used. IDs, URLs and metadata are kept as-is.
+    """
+
+    def __init__(self, token_budget: int = ANALYST_TOKEN_BUDGET, max_doc_tokens: int = MAX_DOC_TOKENS):
+        self.token_budget = token_budget
+        self.max_doc_tokens = max_doc_tokens
+
+    def pack(self, docs: List[Dict], query: str) -> List[Dict]:
+        if not docs:
+            return []
+        query_terms = _terms(query)
+        ranked = self._rank(docs, query_terms)
+        unique = self._drop_overlaps(ranked)
+
+        packed, used = [], 0
+        for doc in unique:
+            snippet = self._trim(doc, query_terms)
+            # ID/URL header lines count against the budget too
+            cost = estimate_tokens(snippet) + estimate_tokens(f"ID: {doc['id']}\nURL: {doc['metadata'].get('url', '')}\n")
+            if used + cost > self.token_budget:
+                continue
+            packed.append(dict(doc, snippet=snippet))
+            used += cost
+
+        logger.info(f"Packed {len(packed)}/{len(docs)} documents into ~{used} tokens (budget {self.token_budget})")
+        return packed
+
+    def _text(self, doc: Dict) -> str:
+        return doc.get("full_text") or doc.get("snippet") or ""
+
+    def _rank(self, docs: List[Dict], query_terms: set) -> List[Dict]:
+        """
+        Order by a blend of relevance (vector distance, else term overlap) and
+        recency relative to the newest document in the set.
+        """
+        times = [_parse_time(d.get("metadata", {}).get("published_at", "")) for d in docs]
+        known = [t for t in times if t is not None]
+        newest = max(known, key=lambda t: t.timestamp()) if known else None
+
+        scored = []
+        for pos, (doc, published) in enumerate(zip(docs, times)):
+            if doc.get("distance") is not None:
+                relevance = max(0.0, 1.0 - float(doc["distance"]))
+            else:
+                terms = _terms(self._text(doc))
+                relevance = len(terms & query_terms) / len(query_terms) if query_terms else 0.0
+            recency = 0.0
+            if published is not None and newest is not None:
+                age_days = max(0.0, (newest.timestamp() - published.timestamp()) / 86400)
+                recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+            score = (1 - RECENCY_WEIGHT) * relevance + RECENCY_WEIGHT * recency
+            scored.append((-score, pos, doc))
+        scored.sort(key=lambda s: (s[0], s[1]))
+        return [doc for _, _, doc in scored]
+
+    def _drop_overlaps(self, ranked: List[Dict]) -> List[Dict]:
+        kept, kept_shingles = [], []
+        for doc in ranked:
+            shingles = _shingles(self._text(doc))
+            overlaps = False
+            for other in kept_shingles:
+                if not shingles or not other:
+                    continue
+                inter = len(shingles & other)
+                if inter / len(shingles | other) >= OVERLAP_THRESHOLD or inter / min(len(shingles), len(other)) >= 0.9:
+                    overlaps = True
+                    break
+            if not overlaps:
+                kept.append(doc)
+                kept_shingles.append(shingles)
+        return kept
+
+    def _trim(self, doc: Dict, query_terms: set) -> str:
+        """
+        Keep the title line plus the highest-scoring sentences, in original order,
+        within max_doc_tokens.
+        """
+        text = self._text(doc).strip()
+        if estimate_tokens(text) <= self.max_doc_tokens:
+            return text
+        sentences = [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+        if not sentences:
+            return text[:self.max_doc_tokens * 4]
+
+        # The first line is the title; always keep it
+        chosen = {0}
+        used = estimate_tokens(sentences[0])
+        order = sorted(
+            range(1, len(sentences)),
+            key=lambda i: (-len(_terms(sentences[i]) & query_terms), i)
+        )
+        for i in order:
+            cost = estimate_tokens(sentences[i])
+            if used + cost <= self.max_doc_tokens:
+                chosen.add(i)
+                used += cost
+        trimmed = " ".join(sentences[i] for i in sorted(chosen))
+        return trimmed[:self.max_doc_tokens * 4]
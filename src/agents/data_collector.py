@@ -1,21 +1,40 @@
-import uuid
+import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timezone
 import hashlib
 from typing import List, Dict
 
+from src import telemetry
 from src.clients.finnhub_client import FinnhubClient
 from src.clients.newsapi_client import NewsApiClient
 from src.clients.serper_client import SerperClient
-from src.utils.validators import validate_article
+from src.clients.price_store import get_price_store
+from src.analytics.prices import summarize as summarize_prices
+from src.utils.ids import canonicalize_url, make_article_id
+from src.utils.near_dup import NearDuplicateDetector
+from src.utils.validators import validate_articles
 
 logger = logging.getLogger(__name__)
 
+# Below this many raw articles the Serper web search is used as a fallback
+MIN_ARTICLES = 5
+# Run provider calls in parallel unless explicitly disabled
+COLLECT_CONCURRENT = os.getenv("COLLECT_CONCURRENT", "1") != "0"
+# Estimated Jaccard similarity above which two articles count as the same story (0 disables)
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+
 class DataCollector:
-    def __init__(self):
+    def __init__(self, concurrent: bool = COLLECT_CONCURRENT, max_workers: int = 4,
+                 near_dup_threshold: float = NEAR_DUP_THRESHOLD, price_store=None):
         self.finnhub = FinnhubClient()
         self.newsapi = NewsApiClient()
         self.serper = SerperClient()
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        self.near_dup = NearDuplicateDetector(near_dup_threshold) if near_dup_threshold > 0 else None
+        self.price_store = price_store if price_store is not None else get_price_store()
 
     def _normalize_finnhub_news(self, items: List[Dict]) -> List[Dict]:
         normalized = []
@@ -26,7 +45,8 @@ class DataCollector:
                 pub_date = datetime.fromtimestamp(pub_ts, tz=timezone.utc).isoformat()
                 
                 article = {
-                    "id": str(item.get('id', uuid.uuid4())),
+                    # Finnhub IDs are stable; derive one from the URL/content otherwise
+                    "id": str(item['id']) if item.get('id') else make_article_id(item.get('url', ''), item.get('headline', ''), item.get('summary', '')),
                     "source": item.get('source', 'Finnhub'),
                     "title": item.get('headline', ''),
                     "text": item.get('summary', ''),
@@ -44,11 +64,12 @@ class DataCollector:
         normalized = []
         for item in items:
             try:
+                text = item.get('description', '') or item.get('content', '') or ''
                 article = {
-                    "id": str(uuid.uuid4()), # NewsAPI doesn't always perform IDs
+                    "id": make_article_id(item.get('url', ''), item.get('title', ''), text), # NewsAPI doesn't provide IDs
                     "source": item.get('source', {}).get('name', 'NewsAPI'),
                     "title": item.get('title', ''),
-                    "text": item.get('description', '') or item.get('content', '') or '', 
+                    "text": text,
                     "url": item.get('url', ''),
                     "published_at": item.get('publishedAt', datetime.now(timezone.utc).isoformat()),
                     "language": "en",
@@ -69,12 +90,13 @@ class DataCollector:
                 pub_date = datetime.now(timezone.utc).isoformat()
 
                 article = {
-                    "id": str(uuid.uuid4()),
+                    "id": make_article_id(item.get('link', ''), item.get('title', ''), item.get('snippet', '')),
                     "source": "SerperWeb",
                     "title": item.get('title', ''),
                     "text": item.get('snippet', ''),
                     "url": item.get('link', ''),
                     "published_at": pub_date,
+                    "date_estimated": True,
                     "language": "en",
                     "ingested_at": datetime.now(timezone.utc).isoformat()
                 }
@@ -93,8 +115,8 @@ class DataCollector:
             if not art['url'] or not art['title']:
                 continue
 
-            # Simple hash for duplicate checking
-            url_hash = art['url'].strip().lower()
+            # Canonical URL catches tracking-param and http/https variants
+            url_hash = canonicalize_url(art['url'])
             title_hash = art['title'].strip().lower()
 
             if url_hash in seen_urls:
@@ -105,80 +127,170 @@ class DataCollector:
             seen_urls.add(url_hash)
             seen_titles.add(title_hash)
             unique_articles.append(art)
+
+        # Syndicated copies with reworded headlines or different URLs
+        if self.near_dup is not None and len(unique_articles) > 1:
+            is_dup = self.near_dup.duplicate_mask([f"{a['title']} {a['text']}" for a in unique_articles])
+            if is_dup.any():
+                logger.info(f"Dropped {int(is_dup.sum())} near-duplicate articles")
+                unique_articles = [a for a, dup in zip(unique_articles, is_dup) if not dup]
             
         return unique_articles
 
-    def collect(self, company_name: str, ticker: str, from_date: str, to_date: str) -> Dict:
+    def _timed(self, timings: Dict, source: str, fn, *args):
         """
-        Collects data from all sources, normalizes, and deduplicates.
-        Returns a dict with 'articles' and 'price_data'.
+        Call a provider function and record its wall-clock duration in seconds.
         """
-        logger.info(f"Starting data collection for {company_name} ({ticker})")
-        
+        start = time.perf_counter()
+        try:
+            with telemetry.span(f"provider.{source}"):
+                return fn(*args)
+        finally:
+            timings[source] = round(time.perf_counter() - start, 4)
+
+    def _fetch_finnhub_news(self, ticker: str, from_date: str, to_date: str) -> List[Dict]:
+        return self._normalize_finnhub_news(self.finnhub.fetch_company_news(ticker, from_date, to_date))
+
+    def _fetch_newsapi(self, company_name: str, ticker: str, from_date: str, to_date: str) -> List[Dict]:
+        return self._normalize_newsapi_articles(self.newsapi.search_articles(f"{company_name} {ticker}", from_date, to_date))
+
+    def _fetch_serper(self, company_name: str, ticker: str) -> List[Dict]:
+        return self._normalize_serper_results(self.serper.search_web(f"{company_name} {ticker} news"))
+
+    def _fetch_price_summary(self, ticker: str, from_date: str, to_date: str) -> Dict:
+        # Finnhub requires unix timestamp for candles
+        dt_from = datetime.fromisoformat(from_date) if 'T' in from_date else datetime.strptime(from_date, "%Y-%m-%d")
+        dt_to = datetime.fromisoformat(to_date) if 'T' in to_date else datetime.strptime(to_date, "%Y-%m-%d")
+
+        ts_from = int(dt_from.timestamp())
+        ts_to = int(dt_to.timestamp())
+
+        if self.price_store is not None:
+            # Only ranges not already stored locally hit Finnhub
+            price_data = self.price_store.get(ticker, ts_from, ts_to, fetch=self.finnhub.fetch_prices)
+        else:
+            price_data = self.finnhub.fetch_prices(ticker, from_timestamp=ts_from, to_timestamp=ts_to)
+        # Start/end/high/low/change plus returns, volatility, drawdown, VWAP, gaps and volume spikes
+        return summarize_prices(price_data or {})
+
+    def _collect_sequential(self, company_name: str, ticker: str, from_date: str, to_date: str, timings: Dict):
         all_articles = []
 
         # 1. Finnhub News
         try:
-            finnhub_news = self.finnhub.fetch_company_news(ticker, from_date, to_date)
-            all_articles.extend(self._normalize_finnhub_news(finnhub_news))
+            all_articles.extend(self._timed(timings, "finnhub_news", self._fetch_finnhub_news, ticker, from_date, to_date))
         except Exception as e:
             logger.error(f"Finnhub collection failed: {e}")
 
         # 2. NewsAPI
         try:
-            newsapi_articles = self.newsapi.search_articles(f"{company_name} {ticker}", from_date, to_date)
-            all_articles.extend(self._normalize_newsapi_articles(newsapi_articles))
+            all_articles.extend(self._timed(timings, "newsapi", self._fetch_newsapi, company_name, ticker, from_date, to_date))
         except Exception as e:
             logger.error(f"NewsAPI collection failed: {e}")
 
         # 3. Serper Fallback (if raw collection low)
-        if len(all_articles) < 5:
+        if len(all_articles) < MIN_ARTICLES:
             logger.info("Low article count, triggering Serper fallback...")
             try:
-                serper_results = self.serper.search_web(f"{company_name} {ticker} news")
-                all_articles.extend(self._normalize_serper_results(serper_results))
+                all_articles.extend(self._timed(timings, "serper", self._fetch_serper, company_name, ticker))
             except Exception as e:
                 logger.error(f"Serper collection failed: {e}")
 
-        # Deduplicate
-        unique_articles = self._deduplicate(all_articles)
-        logger.info(f"Collected {len(all_articles)} raw articles, {len(unique_articles)} after dedupe.")
-
-        # Validate
-        valid_articles = []
-        for art in unique_articles:
-            try:
-                validate_article(art)
-                valid_articles.append(art)
-            except Exception:
-                pass # Already logged in validator
-
-        # Fetch Prices
+        # 4. Prices
         price_summary = {}
         try:
-            # Finnhub requires unix timestamp for candles
-            dt_from = datetime.fromisoformat(from_date) if 'T' in from_date else datetime.strptime(from_date, "%Y-%m-%d")
-            dt_to = datetime.fromisoformat(to_date) if 'T' in to_date else datetime.strptime(to_date, "%Y-%m-%d")
-            
-            ts_from = int(dt_from.timestamp())
-            ts_to = int(dt_to.timestamp())
-            
-            price_data = self.finnhub.fetch_prices(ticker, from_timestamp=ts_from, to_timestamp=ts_to)
-            if price_data:
-                # Calculate simple summary
-                closes = price_data.get('c', [])
-                if closes:
-                    price_summary = {
-                        "current_price": closes[-1],
-                        "start_price": closes[0],
-                        "high": max(closes),
-                        "low": min(closes),
-                        "change_percent": ((closes[-1] - closes[0]) / closes[0]) * 100
-                    }
+            price_summary = self._timed(timings, "finnhub_prices", self._fetch_price_summary, ticker, from_date, to_date)
         except Exception as e:
             logger.error(f"Price collection failed: {e}")
 
+        return all_articles, price_summary
+
+    def _collect_concurrent(self, company_name: str, ticker: str, from_date: str, to_date: str, timings: Dict):
+        """
+        Fire all provider calls at once and merge results as they arrive.
+
+        Serper is started speculatively as soon as a finished news source comes
+        back thin, instead of waiting for the other one. Its results are only
+        kept if the primary sources together stay below MIN_ARTICLES, so the
+        output matches the sequential path.
+        """
+        results = {"finnhub_news": [], "newsapi": [], "serper": []}
+        price_summary = {}
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                pool.submit(telemetry.bind(self._timed), timings, "finnhub_news", self._fetch_finnhub_news, ticker, from_date, to_date): "finnhub_news",
+                pool.submit(telemetry.bind(self._timed), timings, "newsapi", self._fetch_newsapi, company_name, ticker, from_date, to_date): "newsapi",
+                pool.submit(telemetry.bind(self._timed), timings, "finnhub_prices", self._fetch_price_summary, ticker, from_date, to_date): "finnhub_prices",
+            }
+            primary_pending = {"finnhub_news", "newsapi"}
+            serper_future = None
+            pending = set(futures)
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    source = futures[fut]
+                    try:
+                        value = fut.result()
+                    except Exception as e:
+                        logger.error(f"{source} collection failed: {e}")
+                        value = {} if source == "finnhub_prices" else []
+
+                    if source == "finnhub_prices":
+                        price_summary = value
+                    else:
+                        results[source] = value
+                        primary_pending.discard(source)
+
+                primary_count = len(results["finnhub_news"]) + len(results["newsapi"])
+                early_result_in = len(primary_pending) < 2
+                if serper_future is None and early_result_in and primary_count < MIN_ARTICLES:
+                    logger.info("Low article count so far, starting Serper fallback speculatively...")
+                    serper_future = pool.submit(telemetry.bind(self._timed), timings, "serper", self._fetch_serper, company_name, ticker)
+                    futures[serper_future] = "serper"
+                    pending.add(serper_future)
+                elif serper_future is not None and not primary_pending and primary_count >= MIN_ARTICLES:
+                    # Primary sources turned out sufficient, stop waiting on the speculative call
+                    pending.discard(serper_future)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        all_articles = results["finnhub_news"] + results["newsapi"]
+        if len(all_articles) < MIN_ARTICLES:
+            all_articles.extend(results["serper"])
+        return all_articles, price_summary
+
+    def collect(self, company_name: str, ticker: str, from_date: str, to_date: str) -> Dict:
+        """
+        Collects data from all sources, normalizes, and deduplicates.
+        Returns a dict with 'articles', 'prices' and per-source 'timings' (seconds).
+        """
+        logger.info(f"Starting data collection for {company_name} ({ticker})")
+
+        timings = {}
+        start = time.perf_counter()
+        if self.concurrent:
+            all_articles, price_summary = self._collect_concurrent(company_name, ticker, from_date, to_date, timings)
+        else:
+            all_articles, price_summary = self._collect_sequential(company_name, ticker, from_date, to_date, timings)
+        timings["total"] = round(time.perf_counter() - start, 4)
+
+        # Deduplicate
+        with telemetry.span("dedupe"):
+            unique_articles = self._deduplicate(all_articles)
+        logger.info(f"Collected {len(all_articles)} raw articles, {len(unique_articles)} after dedupe.")
+
+        # Validate (one summary log line for all failures)
+        with telemetry.span("validate"):
+            valid_articles, _ = validate_articles(unique_articles)
+        telemetry.count("articles.raw", len(all_articles))
+        telemetry.count("articles.duplicates", len(all_articles) - len(unique_articles))
+        telemetry.count("articles.invalid", len(unique_articles) - len(valid_articles))
+
         return {
             "articles": valid_articles,
-            "prices": price_summary
+            "prices": price_summary,
+            "timings": timings
         }
@@ -0,0 +1,186 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Trading days used to annualize realized volatility
+PERIODS_PER_YEAR = 252
+# Open more than this far from the previous close counts as a gap day
+GAP_THRESHOLD = 0.02
+# Volume z-score at or above which a day counts as a spike
+VOLUME_SPIKE_Z = 2.0
+
+FIELDS = ("o", "h", "l", "c", "v")
+
+
+def align_panel(payloads: Dict[str, Dict]) -> Tuple[List[str], np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Align Finnhub candle payloads on the union of their timestamps.
+    Returns (tickers, timestamps, {field: 2D array of shape (tickers, days)});
+    days a ticker did not trade and fields a payload lacks are NaN.
+    Payloads without 't' are indexed by position.
+    """
+    tickers = [tk for tk, p in payloads.items() if p and p.get("c") is not None and len(p["c"])]
+    stamps = {}
+    for tk in tickers:
+        p = payloads[tk]
+        t = p.get("t")
+        stamps[tk] = np.asarray(t if t is not None and len(t) else np.arange(len(p["c"])), dtype=np.int64)
+    t_all = np.unique(np.concatenate([stamps[tk] for tk in tickers])) if tickers else np.zeros(0, dtype=np.int64)
+
+    panel = {f: np.full((len(tickers), len(t_all)), np.nan) for f in FIELDS}
+    for row, tk in enumerate(tickers):
+        cols = np.searchsorted(t_all, stamps[tk])
+        for f in FIELDS:
+            values = payloads[tk].get(f)
+            if values is not None and len(values) == len(cols):
+                panel[f][row, cols] = values
+    return tickers, t_all, panel
+
+
+def returns(closes: np.ndarray) -> np.ndarray:
+    """
+    Simple period returns along the last axis (one element shorter), each
+    against the last valid close, so days another ticker traded (NaN in
+    this row of a panel) do not drop the return spanning them.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return closes[..., 1:] / _ffill(closes)[..., :-1] - 1
+
+
+def realized_volatility(closes: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    """
+    Annualized standard deviation of log returns along the last axis.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        log_ret = np.log1p(returns(closes))
+    counts = np.sum(~np.isnan(log_ret), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(np.nansum((log_ret - _nanmean(log_ret)[..., None]) ** 2, axis=-1) / (counts - 1))
+    return np.where(counts > 1, std * np.sqrt(periods_per_year), np.nan)
+
+
+def max_drawdown(closes: np.ndarray) -> np.ndarray:
+    """
+    Largest peak-to-trough decline along the last axis, as a negative fraction.
+    """
+    peak = np.fmax.accumulate(closes, axis=-1)
+    with np.errstate(invalid="ignore"):
+        drawdown = closes / peak - 1
+    return _nanmin(drawdown)
+
+
+def vwap(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """
+    Volume-weighted average of the typical price (h + l + c) / 3.
+    """
+    typical = (high + low + close) / 3
+    mask = ~(np.isnan(typical) | np.isnan(volume))
+    weight = np.where(mask, volume, 0.0)
+    total = weight.sum(axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, (np.where(mask, typical, 0.0) * weight).sum(axis=-1) / total, np.nan)
+
+
+def gap_mask(opens: np.ndarray, closes: np.ndarray, threshold: float = GAP_THRESHOLD) -> np.ndarray:
+    """
+    True on days whose open is at least `threshold` away from the previous
+    (last valid) close.
+    """
+    mask = np.zeros(closes.shape, dtype=bool)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mask[..., 1:] = np.abs(opens[..., 1:] / _ffill(closes)[..., :-1] - 1) >= threshold
+    return mask
+
+
+def volume_spike_mask(volume: np.ndarray, z: float = VOLUME_SPIKE_Z) -> np.ndarray:
+    """
+    True on days whose volume z-score within the window is at least `z`.
+    """
+    mean = _nanmean(volume)[..., None]
+    counts = np.sum(~np.isnan(volume), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(np.nansum((volume - mean) ** 2, axis=-1) / counts)[..., None]
+        return (volume - mean) / std >= z
+
+
+def summarize_panel(payloads: Dict[str, Dict], gap_threshold: float = GAP_THRESHOLD,
+                    spike_z: float = VOLUME_SPIKE_Z) -> Dict[str, Dict]:
+    """
+    Price summary per ticker, computed for all tickers at once on the aligned panel.
+    Tickers without close prices map to {}.
+    """
+    tickers, t, panel = align_panel(payloads)
+    summaries = {tk: {} for tk in payloads}
+    if not tickers:
+        return summaries
+
+    c = panel["c"]
+    valid = ~np.isnan(c)
+    rows = np.arange(len(tickers))
+    first = valid.argmax(axis=1)
+    last = c.shape[1] - 1 - valid[:, ::-1].argmax(axis=1)
+    start, end = c[rows, first], c[rows, last]
+
+    daily = returns(c)
+    vol = realized_volatility(c)
+    mdd = max_drawdown(c)
+    vw = vwap(panel["h"], panel["l"], c, panel["v"])
+    gaps = gap_mask(panel["o"], c, gap_threshold)
+    spikes = volume_spike_mask(panel["v"], spike_z)
+    has_t = all(payloads[tk].get("t") is not None and len(payloads[tk]["t"]) for tk in tickers)
+    days = t.astype("datetime64[s]").astype("datetime64[D]").astype(str) if has_t else t.astype(str)
+
+    for i, tk in enumerate(tickers):
+        summaries[tk] = {
+            "current_price": float(end[i]),
+            "start_price": float(start[i]),
+            "high": float(np.nanmax(c[i])),
+            "low": float(np.nanmin(c[i])),
+            "change_percent": float((end[i] - start[i]) / start[i] * 100),
+            "intraday_high": _round(np.nanmax(panel["h"][i]) if (~np.isnan(panel["h"][i])).any() else np.nan),
+            "intraday_low": _round(np.nanmin(panel["l"][i]) if (~np.isnan(panel["l"][i])).any() else np.nan),
+            "mean_daily_return_percent": _round(_nanmean(daily[i]) * 100),
+            "volatility_percent": _round(vol[i] * 100),
+            "max_drawdown_percent": _round(mdd[i] * 100),
+            "vwap": _round(vw[i]),
+            "trading_days": int(valid[i].sum()),
+            "gap_days": days[gaps[i]].tolist(),
+            "volume_spikes": days[spikes[i]].tolist(),
+        }
+    return summaries
+
+
+def summarize(payload: Dict, gap_threshold: float = GAP_THRESHOLD, spike_z: float = VOLUME_SPIKE_Z) -> Dict:
+    """
+    Price summary for a single Finnhub candle payload ({} if it has no closes).
+    """
+    return summarize_panel({"_": payload}, gap_threshold, spike_z)["_"]
+
+
+def _ffill(a: np.ndarray) -> np.ndarray:
+    """
+    Carry the last non-NaN value forward along the last axis.
+    """
+    positions = np.where(~np.isnan(a), np.arange(a.shape[-1]), 0)
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    return np.take_along_axis(a, positions, axis=-1)
+
+
+def _nanmean(a: np.ndarray) -> np.ndarray:
+    counts = np.sum(~np.isnan(a), axis=-1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, np.nansum(a, axis=-1) / counts, np.nan)
+
+
+def _nanmin(a: np.ndarray) -> np.ndarray:
+    filled = np.where(np.isnan(a), np.inf, a)
+    out = filled.min(axis=-1) if a.shape[-1] else np.full(a.shape[:-1], np.inf)
+    return np.where(np.isinf(out), np.nan, out)
+
+
+def _round(value, digits: int = 4):
+    """
+    Rounded float, or None when the metric is undefined for the window.
+    """
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
@@ -0,0 +1,221 @@
+import argparse
+import sys
+import os
+import json
+import time
+import logging
+import threading
+import multiprocessing
+from multiprocessing.managers import BaseManager
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.analyst import AnalystAgent
+from src.job_runner import job_key, load_jobs, run_job
+
+logger = logging.getLogger(__name__)
+
+# Provider name -> API host, for --limit
+PROVIDER_HOSTS = {
+    "finnhub": "finnhub.io",
+    "newsapi": "newsapi.org",
+    "serper": "google.serper.dev",
+    "groq": "api.groq.com",
+}
+
+# Per-worker state, created once by _init_worker
+_orchestrator = None
+# The batch's one ChromaIngest, living in the ChromaManager process
+_chroma = None
+
+
+def load_completed(path: str) -> set:
+    """
+    Keys of jobs that already succeeded in a previous (possibly interrupted) run.
+    """
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from an interrupted run
+            if record.get("status") == "ok":
+                done.add(record["key"])
+    return done
+
+
+def _terminate_last_line(path: str):
+    """
+    Make sure appended records start on a fresh line after an interrupted write.
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    with open(path, "rb+") as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def _open_chroma():
+    """
+    Default store for a batch: CHROMA_DB_DIR, with the embedding model warmed.
+    """
+    from src.ingest.chroma_ingest import ChromaIngest
+    from src.ingest.embeddings import get_model
+
+    get_model()
+    return ChromaIngest()
+
+
+def _serve_chroma(factory):
+    """
+    Runs in the ChromaManager process and returns the one ChromaIngest that
+    every worker's proxy talks to. Requests arrive on one thread per worker.
+    """
+    global _chroma
+    if _chroma is None:
+        load_dotenv()
+        logging.basicConfig(level=logging.INFO)
+        _chroma = factory()
+        _chroma.lock = threading.Lock()
+    return _chroma
+
+
+class ChromaManager(BaseManager):
+    """
+    Process that owns the batch's Chroma client. PersistentClients opened on
+    one directory by several processes each keep their own in-memory HNSW
+    index and miss each other's writes, so workers ingest and query through
+    this single process instead (embedding included).
+    """
+
+
+ChromaManager.register("chroma", callable=_serve_chroma)
+
+
+def _build_orchestrator(chroma):
+    from src.orchestrator import Orchestrator
+
+    return Orchestrator(chroma=chroma)
+
+
+def _init_worker(host_limits: dict, chroma, orchestrator_factory):
+    """
+    Runs once per worker process: builds a long-lived Orchestrator that serves
+    every job handed to this worker, using the shared Chroma proxy.
+    """
+    global _orchestrator
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    from src.clients import transport
+
+    for host, semaphore in host_limits.items():
+        transport.set_host_limit(host, semaphore)
+    _orchestrator = orchestrator_factory(chroma)
+
+
+def _run_job(job: dict) -> dict:
+    start = time.perf_counter()
+    record = {"key": job_key(job), "job": job}
+    try:
+        record["report"] = run_job(_orchestrator, job)
+        if AnalystAgent.is_fallback(record["report"]):
+            # Keep the report for inspection, but let a resumed run retry the job
+            record["status"] = "error"
+            record["error"] = "analysis fell back"
+        else:
+            record["status"] = "ok"
+    except Exception as e:
+        logger.error(f"Job {record['key']} failed: {e}")
+        record["status"] = "error"
+        record["error"] = str(e)
+    record["elapsed"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def parse_limits(values: list) -> dict:
+    """
+    Turn ['finnhub=2', 'groq=1'] into {'finnhub.io': 2, 'api.groq.com': 1}.
+    """
+    limits = {}
+    for value in values or []:
+        name, _, count = value.partition("=")
+        name = name.strip().lower()
+        host = PROVIDER_HOSTS.get(name) or urlsplit(f"//{name}").hostname
+        if not host or not count.isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid provider limit '{value}', expected e.g. finnhub=2")
+        limits[host] = int(count)
+    return limits
+
+
+def run_batch(jobs: list, output_path: str, workers: int = 2, limits: dict = None,
+              chroma_factory=_open_chroma, orchestrator_factory=_build_orchestrator) -> dict:
+    """
+    Run jobs across a process pool, appending one JSON line per finished job
+    to `output_path`. Jobs already recorded as successful are skipped.
+
+    `chroma_factory()` builds the store in the ChromaManager process and
+    `orchestrator_factory(chroma)` builds each worker's pipeline around its
+    proxy; both must be picklable (module-level).
+    """
+    completed = load_completed(output_path)
+    pending, seen = [], set(completed)
+    for job in jobs:
+        key = job_key(job)
+        if key not in seen:
+            seen.add(key)
+            pending.append(job)
+    logger.info(f"{len(jobs)} jobs, {len(jobs) - len(pending)} already done or duplicated, {len(pending)} to run")
+
+    summary = {"ok": 0, "error": 0, "skipped": len(jobs) - len(pending)}
+    if not pending:
+        return summary
+
+    ctx = multiprocessing.get_context("spawn")
+    host_limits = {host: ctx.BoundedSemaphore(n) for host, n in (limits or {}).items()}
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    _terminate_last_line(output_path)
+    with open(output_path, "a") as out, ChromaManager(ctx=ctx) as manager, ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(host_limits, manager.chroma(chroma_factory), orchestrator_factory)
+    ) as pool:
+        futures = [pool.submit(_run_job, job) for job in pending]
+        for fut in as_completed(futures):
+            record = fut.result()
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+            summary[record["status"]] += 1
+            logger.info(f"[{sum(summary.values()) - summary['skipped']}/{len(pending)}] {record['key']}: {record['status']} in {record['elapsed']}s")
+    return summary
+
+
+def main():
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Run many company reports from a JSONL job file")
+    parser.add_argument("--jobs", required=True, help="JSONL file of {company, ticker, from, to, top_k} jobs")
+    parser.add_argument("--output", default="output/batch_results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, default=2, help="Number of worker processes")
+    parser.add_argument("--limit", action="append", metavar="PROVIDER=N",
+                        help="Max concurrent requests to a provider across all workers (finnhub, newsapi, serper, groq)")
+
+    args = parser.parse_args()
+
+    summary = run_batch(load_jobs(args.jobs), args.output, workers=args.workers, limits=parse_limits(args.limit))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from src import telemetry
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("CACHE_DIR", "./.cache")
+# Responses for windows that reach today or later expire after this many seconds
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "900"))
+RESPONSE_CACHE_MAX_MB = float(os.getenv("RESPONSE_CACHE_MAX_MB", "200"))
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "1") != "0"
+# LLM analyses are cached separately so they can be sized and expired on their own
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "50"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") != "0"
+
+# Credentials never become part of a cache key
+SECRET_PARAMS = {"token", "apikey", "api_key", "key"}
+
+_cache = None
+_llm_cache = None
+_cache_lock = threading.Lock()
+
+
+def normalize_params(params: dict) -> str:
+    """
+    Canonical JSON for request params: secrets dropped, keys sorted, values as strings.
+    """
+    clean = {
+        str(k): str(v) for k, v in (params or {}).items()
+        if v is not None and str(k).lower() not in SECRET_PARAMS
+    }
+    return json.dumps(clean, sort_keys=True, separators=(",", ":"))
+
+
+def make_key(endpoint: str, params: dict) -> str:
+    return hashlib.sha256(f"{endpoint}\n{normalize_params(params)}".encode("utf-8")).hexdigest()
+
+
+def _start_of_today_utc() -> datetime:
+    now = datetime.now(timezone.utc)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def ttl_for_date(to_date: str):
+    """
+    TTL for a 'YYYY-MM-DD' (or ISO) range end: None (never expires) when the
+    range ends before today, otherwise the default TTL.
+    """
+    try:
+        day = datetime.fromisoformat(to_date[:10]).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return RESPONSE_CACHE_TTL
+    return None if day < _start_of_today_utc() else RESPONSE_CACHE_TTL
+
+
+def ttl_for_timestamp(to_timestamp: int):
+    """
+    TTL for a UNIX timestamp range end, same rule as ttl_for_date.
+    """
+    if to_timestamp is None:
+        return RESPONSE_CACHE_TTL
+    return None if to_timestamp < _start_of_today_utc().timestamp() else RESPONSE_CACHE_TTL
+
+
+class ResponseCache:
+    """
+    On-disk JSON response cache backed by SQLite.
+
+    Entries are keyed by endpoint and normalized params, expire after their TTL
+    (or never, for immutable past ranges) and the least recently used ones are
+    evicted once the total payload size exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str = None, max_bytes: int = None, name: str = "response"):
+        # Label for hit/miss counters
+        self.name = name
+        self.path = path or os.path.join(CACHE_DIR, "responses.sqlite3")
+        self.max_bytes = max_bytes if max_bytes is not None else int(RESPONSE_CACHE_MAX_MB * 1024 * 1024)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    endpoint TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, endpoint: str, params: dict):
+        """
+        Return the cached value, or None on a miss or expired entry.
+        """
+        key = make_key(endpoint, params)
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                telemetry.count(f"cache.{self.name}.miss")
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                telemetry.count(f"cache.{self.name}.miss")
+                return None
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        telemetry.count(f"cache.{self.name}.hit")
+        logger.debug(f"Cache hit for {endpoint}")
+        return json.loads(value)
+
+    def set(self, endpoint: str, params: dict, value, ttl=RESPONSE_CACHE_TTL):
+        """
+        Store a JSON-serializable value. `ttl=None` stores it without expiry.
+        """
+        key = make_key(endpoint, params)
+        payload = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, endpoint, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, payload, len(payload), expires_at, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info(f"Evicted {evicted} cached responses (size limit {self.max_bytes} bytes)")
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+
+def get_response_cache():
+    """
+    Return the process-wide response cache, or None when RESPONSE_CACHE=0.
+    """
+    global _cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def get_llm_cache():
+    """
+    Return the process-wide LLM response cache, or None when LLM_CACHE=0.
+    """
+    global _llm_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _llm_cache is None:
+        with _cache_lock:
+            if _llm_cache is None:
+                _llm_cache = ResponseCache(
+                    path=os.path.join(CACHE_DIR, "llm.sqlite3"),
+                    max_bytes=int(LLM_CACHE_MAX_MB * 1024 * 1024),
+                    name="llm"
+                )
+    return _llm_cache
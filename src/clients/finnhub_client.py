@@ -1,20 +1,23 @@
 import os
-import requests
 import logging
 from datetime import datetime
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from src.clients import transport
+from src.clients.cache import RESPONSE_CACHE_TTL, get_response_cache, ttl_for_date, ttl_for_timestamp
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://finnhub.io/api/v1"
+BASE_URL = os.getenv("FINNHUB_BASE_URL", "https://finnhub.io/api/v1")
 
 class FinnhubClient:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.api_key = os.getenv("FINNHUB_API_KEY")
         if not self.api_key:
             logger.warning("FINNHUB_API_KEY is not set.")
+        self.cache = cache if cache is not None else get_response_cache()
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def fetch_company_news(self, symbol: str, from_date: str, to_date: str):
@@ -32,14 +35,22 @@ class FinnhubClient:
             "to": to_date,
             "token": self.api_key
         }
-        
+
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                logger.info(f"Using cached Finnhub news for {symbol} ({len(cached)} items)")
+                return cached
+
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             logger.info(f"Fetched {len(data)} news items for {symbol} from Finnhub")
+            if self.cache is not None:
+                self.cache.set(url, params, data, ttl=ttl_for_date(to_date))
             return data
-        except requests.exceptions.RequestException as e:
+        except transport.RequestException as e:
             logger.error(f"Error fetching Finnhub news: {e}")
             raise
 
@@ -49,9 +60,11 @@ class FinnhubClient:
         Fetch stock candles (prices) from Finnhub.
         Resolution: Supported resolution includes 1, 5, 15, 30, 60, D, W, M.
         Timestamps are UNIX timestamps.
+        Returns {} when Finnhub has no candles for the range, and None when no
+        request was made (no API key), so callers do not mistake it for "no data".
         """
         if not self.api_key:
-            return {}
+            return None
 
         url = f"{BASE_URL}/stock/candle"
         params = {
@@ -61,17 +74,28 @@ class FinnhubClient:
             "to": to_timestamp,
             "token": self.api_key
         }
-        
+
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                logger.info(f"Using cached price data for {symbol}")
+                return cached
+
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             if data.get('s') == 'ok':
                 logger.info(f"Fetched price data for {symbol} from Finnhub")
-                return data
+                ttl = ttl_for_timestamp(to_timestamp)
             else:
                 logger.warning(f"No price data found for {symbol}")
-                return {}
-        except requests.exceptions.RequestException as e:
+                data = {}
+                # "no_data" can be transient (plan limits, late candles), so never keep it for good
+                ttl = RESPONSE_CACHE_TTL
+            if self.cache is not None:
+                self.cache.set(url, params, data, ttl=ttl)
+            return data
+        except transport.RequestException as e:
             logger.error(f"Error fetching Finnhub prices: {e}")
             raise
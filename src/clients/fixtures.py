@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import logging
+from urllib.parse import parse_qsl, urlsplit
+
+from src.clients.cache import normalize_params
+
+logger = logging.getLogger(__name__)
+
+# Response headers worth keeping; everything else (cookies, request ids) is dropped
+KEPT_HEADERS = ("content-type", "retry-after")
+
+
+def body_digest(body) -> str:
+    """
+    sha256 of a request body. JSON bodies are hashed in canonical form (sorted
+    keys, compact) so the same payload matches however it was serialized.
+    """
+    if body is None or body == b"" or body == "":
+        return ""
+    if isinstance(body, (bytes, str)):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            raw = body.encode("utf-8") if isinstance(body, str) else body
+            return hashlib.sha256(raw).hexdigest()
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def fixture_key(method: str, url: str, params: dict = None, body=None) -> str:
+    """
+    Identity of a recorded request: method, URL without query string, params
+    without credentials and the body hash. Query-string params in `url` are
+    folded into `params`.
+    """
+    parts = urlsplit(url)
+    merged = dict(parse_qsl(parts.query, keep_blank_values=True))
+    merged.update(params or {})
+    base = f"{parts.scheme}://{parts.netloc}{parts.path}"
+    raw = f"{method.upper()}\0{base}\0{normalize_params(merged)}\0{body_digest(body)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """
+    Recorded HTTP responses, one JSON file per request under
+    `<root>/<host>/<key>.json`. Only the status, a few headers and the body are
+    stored; credentials never reach the files.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, url: str, key: str) -> str:
+        host = urlsplit(url).hostname or "unknown"
+        return os.path.join(self.root, host, f"{key}.json")
+
+    def save(self, method: str, url: str, params: dict, body, status: int, headers: dict, content: bytes):
+        key = fixture_key(method, url, params, body)
+        path = self.path(url, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        parts = urlsplit(url)
+        record = {
+            "method": method.upper(),
+            "url": f"{parts.scheme}://{parts.netloc}{parts.path}",
+            "params": json.loads(normalize_params(params)),
+            "status": status,
+            "headers": {k: v for k, v in (headers or {}).items() if k.lower() in KEPT_HEADERS},
+            "body": content.decode("utf-8", errors="replace"),
+        }
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f, indent=1)
+        os.replace(tmp, path)
+        logger.debug(f"Recorded {method} {record['url']} -> {path}")
+        return path
+
+    def load(self, method: str, url: str, params: dict = None, body=None):
+        """
+        The recorded response dict, or None if this request was never recorded.
+        """
+        path = self.path(url, fixture_key(method, url, params, body))
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+
+def to_response(record: dict, url: str):
+    """
+    Build a requests.Response from a recorded fixture.
+    """
+    import requests
+
+    response = requests.models.Response()
+    response.status_code = record["status"]
+    response.headers.update(record.get("headers", {}))
+    response._content = record["body"].encode("utf-8")
+    response._content_consumed = True
+    response.encoding = "utf-8"
+    response.url = url
+    response.reason = "Recorded"
+    return response
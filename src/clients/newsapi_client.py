@@ -1,18 +1,21 @@
 import os
-import requests
 import logging
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from src.clients import transport
+from src.clients.cache import get_response_cache, ttl_for_date
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://newsapi.org/v2"
+BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2")
 
 class NewsApiClient:
-    def __init__(self):
+    def __init__(self, cache=None):
         self.api_key = os.getenv("NEWSAPI_KEY")
         if not self.api_key:
             logger.warning("NEWSAPI_KEY is not set.")
+        self.cache = cache if cache is not None else get_response_cache()
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     def search_articles(self, query: str, from_date: str, to_date: str):
@@ -32,14 +35,22 @@ class NewsApiClient:
             "language": "en",
             "apiKey": self.api_key
         }
-        
+
+        if self.cache is not None:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                logger.info(f"Using cached NewsAPI articles for '{query}' ({len(cached)} items)")
+                return cached
+
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = transport.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             articles = data.get("articles", [])
             logger.info(f"Fetched {len(articles)} articles for '{query}' from NewsAPI")
+            if self.cache is not None:
+                self.cache.set(url, params, articles, ttl=ttl_for_date(to_date))
             return articles
-        except requests.exceptions.RequestException as e:
+        except transport.RequestException as e:
             logger.error(f"Error fetching NewsAPI articles: {e}")
             raise
@@ -0,0 +1,214 @@
+import os
+import re
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src import telemetry
+from src.clients.cache import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", os.path.join(CACHE_DIR, "prices"))
+PRICE_STORE_ENABLED = os.getenv("PRICE_STORE", "1") != "0"
+
+# One row per candle, sorted by timestamp
+CANDLE_DTYPE = np.dtype([("t", "<i8"), ("o", "<f8"), ("h", "<f8"), ("l", "<f8"), ("c", "<f8"), ("v", "<f8")])
+FIELDS = ("o", "h", "l", "c", "v")
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def _start_of_today() -> int:
+    now = datetime.now(timezone.utc)
+    return int(datetime(now.year, now.month, now.day, tzinfo=timezone.utc).timestamp())
+
+
+def merge_intervals(intervals: List[Tuple[int, int]]) -> List[List[int]]:
+    """
+    Sort and merge inclusive [start, end] second ranges, joining adjacent ones.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def subtract_intervals(start: int, end: int, covered: List[List[int]]) -> List[Tuple[int, int]]:
+    """
+    Parts of [start, end] not inside any of the merged `covered` ranges.
+    """
+    gaps = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start - 1))
+        cursor = max(cursor, c_end + 1)
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def payload_to_rows(payload: Dict) -> np.ndarray:
+    """
+    Finnhub candle payload ({'t', 'o', 'h', 'l', 'c', 'v'} lists) as CANDLE_DTYPE rows.
+    Payloads without timestamps cannot be stored and give an empty array.
+    """
+    t = (payload or {}).get("t")
+    if t is None or len(t) == 0:
+        return np.zeros(0, dtype=CANDLE_DTYPE)
+    rows = np.zeros(len(t), dtype=CANDLE_DTYPE)
+    rows["t"] = t
+    for f in FIELDS:
+        values = payload.get(f)
+        rows[f] = values if values is not None and len(values) == len(t) else np.nan
+    return rows
+
+
+class PriceStore:
+    """
+    Incremental local candle store, one directory per ticker and resolution.
+
+    Candles live in a sorted `candles.npy` that reads memory-map, so `read`
+    returns zero-copy slices. `coverage.json` lists the [start, end] second
+    ranges already fetched, and `get` only asks the provider for the gaps.
+    Ranges reaching today are refetched until the day has closed, since the
+    current candle is still moving.
+    """
+
+    def __init__(self, root: str = PRICE_STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _dir(self, ticker: str, resolution: str) -> str:
+        return os.path.join(self.root, re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{ticker}_{resolution}"))
+
+    @contextmanager
+    def _file_lock(self, path: str):
+        """
+        Serialize writers across processes sharing the same store directory.
+        """
+        os.makedirs(path, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(path, ".lock"), "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def coverage(self, ticker: str, resolution: str = "D") -> List[List[int]]:
+        path = os.path.join(self._dir(ticker, resolution), "coverage.json")
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return json.load(f)
+
+    def _candles(self, path: str) -> np.ndarray:
+        candles_path = os.path.join(path, "candles.npy")
+        if not os.path.exists(candles_path) or os.path.getsize(candles_path) == 0:
+            return np.zeros(0, dtype=CANDLE_DTYPE)
+        try:
+            return np.load(candles_path, mmap_mode="r")
+        except ValueError:
+            # np.memmap cannot map a zero-row array
+            return np.zeros(0, dtype=CANDLE_DTYPE)
+
+    def read(self, ticker: str, from_ts: int, to_ts: int, resolution: str = "D") -> np.ndarray:
+        """
+        Stored candles with from_ts <= t <= to_ts, as a read-only view of the mapped file.
+        """
+        candles = self._candles(self._dir(ticker, resolution))
+        lo = np.searchsorted(candles["t"], from_ts, side="left")
+        hi = np.searchsorted(candles["t"], to_ts, side="right")
+        return candles[lo:hi]
+
+    def missing(self, ticker: str, from_ts: int, to_ts: int, resolution: str = "D") -> List[Tuple[int, int]]:
+        return subtract_intervals(from_ts, to_ts, self.coverage(ticker, resolution))
+
+    def write(self, ticker: str, resolution: str, rows: np.ndarray, covered: Optional[Tuple[int, int]] = None):
+        """
+        Merge rows into the store (new rows win on equal timestamps) and
+        record `covered` as fetched.
+        """
+        path = self._dir(ticker, resolution)
+        with self._lock, self._file_lock(path):
+            if len(rows):
+                existing = np.array(self._candles(path))
+                # Later rows win: reverse before np.unique keeps the first occurrence
+                combined = np.concatenate([existing, rows])[::-1]
+                _, keep = np.unique(combined["t"], return_index=True)
+                tmp = os.path.join(path, "candles.tmp.npy")
+                np.save(tmp, combined[keep])
+                os.replace(tmp, os.path.join(path, "candles.npy"))
+            if covered is not None:
+                intervals = merge_intervals([tuple(iv) for iv in self.coverage(ticker, resolution)] + [covered])
+                tmp = os.path.join(path, "coverage.tmp.json")
+                with open(tmp, "w") as f:
+                    json.dump(intervals, f)
+                os.replace(tmp, os.path.join(path, "coverage.json"))
+
+    def get(self, ticker: str, from_ts: int, to_ts: int, fetch: Callable, resolution: str = "D") -> Dict:
+        """
+        Finnhub-shaped candle payload for [from_ts, to_ts], fetching only uncovered
+        ranges via fetch(ticker, resolution, from_ts, to_ts). A range is recorded
+        as covered only when fetch answered (possibly with no candles); None
+        means nothing was asked and the range stays missing. Columns are views
+        into the store; returns {} when there are no candles.
+        """
+        gaps = self.missing(ticker, from_ts, to_ts, resolution)
+        if gaps:
+            logger.info(f"Fetching {len(gaps)} missing price range(s) for {ticker} ({resolution})")
+        else:
+            logger.info(f"Price data for {ticker} ({resolution}) served from local store")
+        telemetry.count("price_store.gaps", len(gaps))
+        closed_until = _start_of_today() - 1
+        for start, end in gaps:
+            payload = fetch(ticker, resolution, start, end)
+            if payload is None:
+                continue
+            rows = payload_to_rows(payload)
+            covered = (start, min(end, closed_until)) if start <= closed_until else None
+            self.write(ticker, resolution, rows, covered)
+
+        candles = self.read(ticker, from_ts, to_ts, resolution)
+        if len(candles) == 0:
+            return {}
+        payload = {"s": "ok", "t": candles["t"]}
+        for f in FIELDS:
+            payload[f] = candles[f]
+        return payload
+
+
+def get_price_store() -> Optional[PriceStore]:
+    """
+    Return the process-wide price store, or None when PRICE_STORE=0.
+    """
+    global _store
+    if not PRICE_STORE_ENABLED:
+        return None
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
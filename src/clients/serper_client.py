@@ -1,13 +1,14 @@
 import os
-import requests
 import logging
 import json
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from src.clients import transport
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-BASE_URL = "https://google.serper.dev/search"
+BASE_URL = os.getenv("SERPER_BASE_URL", "https://google.serper.dev/search")
 
 class SerperClient:
     def __init__(self):
@@ -33,12 +34,12 @@ class SerperClient:
         })
         
         try:
-            response = requests.post(BASE_URL, headers=headers, data=payload, timeout=10)
+            response = transport.post(BASE_URL, headers=headers, data=payload)
             response.raise_for_status()
             data = response.json()
             organic_results = data.get("organic", [])
             logger.info(f"Fetched {len(organic_results)} web search results for '{query}' from Serper")
             return organic_results
-        except requests.exceptions.RequestException as e:
+        except transport.RequestException as e:
             logger.error(f"Error fetching Serper results: {e}")
             raise
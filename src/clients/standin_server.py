@@ -0,0 +1,189 @@
+import argparse
+import sys
+import os
+import json
+import time
+import random
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.clients.fixtures import FixtureStore
+
+logger = logging.getLogger(__name__)
+
+# Base-URL variables and the upstream each one replaces
+UPSTREAMS = {
+    "FINNHUB_BASE_URL": "finnhub.io/api/v1",
+    "NEWSAPI_BASE_URL": "newsapi.org/v2",
+    "SERPER_BASE_URL": "google.serper.dev/search",
+    "GROQ_BASE_URL": "api.groq.com/openai/v1",
+}
+STATS_PATH = "/_standin/stats"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Maps /<original host>/<path>?<query> back to https://<original host>/<path>
+    and answers with the recorded fixture for that request.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._serve("GET")
+
+    def do_POST(self):
+        self._serve("POST")
+
+    def _serve(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        parts = urlsplit(self.path)
+        if parts.path == STATS_PATH:
+            return self._send(200, {"Content-Type": "application/json"}, json.dumps(self.server.snapshot()))
+
+        server = self.server
+        delay = server.latency + (server.jitter * server.uniform() if server.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        fault = server.pick_fault()
+        if fault == 429:
+            server.bump("rate_limited")
+            return self._send(429, {"Content-Type": "application/json", "Retry-After": str(server.retry_after)},
+                              json.dumps({"error": "Too Many Requests (stand-in)"}))
+        if fault == 500:
+            server.bump("errors")
+            return self._send(500, {"Content-Type": "application/json"},
+                              json.dumps({"error": "Internal Server Error (stand-in)"}))
+
+        host, _, rest = parts.path.lstrip("/").partition("/")
+        original = f"https://{host}/{rest}"
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        record = server.store.load(method, original, params, body)
+        if record is None:
+            server.bump("missing")
+            logger.warning(f"No fixture for {method} {original} {params}")
+            return self._send(404, {"Content-Type": "application/json"},
+                              json.dumps({"error": f"No recorded response for {method} {original}"}))
+        server.bump("served")
+        self._send(record["status"], record.get("headers", {}), record["body"])
+
+    def _send(self, status: int, headers: dict, body: str):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the data and LLM providers, serving fixtures recorded
+    with HTTP_MODE=record. Adds a fixed latency (plus uniform jitter) to every
+    response and fails the given fraction of requests with 500s or 429s.
+    """
+    daemon_threads = True
+
+    def __init__(self, fixture_dir: str, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 jitter: float = 0.0, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 retry_after: int = 1, seed: int = None):
+        super().__init__((host, port), StandInHandler)
+        self.store = FixtureStore(fixture_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"served": 0, "missing": 0, "errors": 0, "rate_limited": 0}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def base_urls(self) -> dict:
+        """
+        Base-URL environment settings that point every client at this server.
+        """
+        return {env: f"{self.base_url}/{upstream}" for env, upstream in UPSTREAMS.items()}
+
+    def uniform(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def pick_fault(self):
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return None
+
+    def bump(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+    def start(self) -> threading.Thread:
+        """
+        Serve from a daemon thread (for tests and in-process load runs).
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+
+def main():
+    """
+    Serve recorded provider responses locally, e.g. for load tests without network access.
+    """
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Stand-in server for recorded provider responses")
+    parser.add_argument("--fixtures", default=os.getenv("HTTP_FIXTURE_DIR", "./fixtures/http"),
+                        help="Directory written by HTTP_MODE=record")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = StandInServer(
+        args.fixtures, args.host, args.port, latency=args.latency, jitter=args.jitter,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after, seed=args.seed
+    )
+    print(f"Serving fixtures from {args.fixtures} on {server.base_url} (stats at {server.base_url}{STATS_PATH})")
+    print("Point the pipeline at it with:")
+    for env, url in server.base_urls().items():
+        print(f"  export {env}={url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import os
+import threading
+import logging
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+
+from src import telemetry
+
+logger = logging.getLogger(__name__)
+
+# Number of per-host pools kept alive and connections per host pool
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+# Default (connect, read) timeouts in seconds
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+# "live" (default), "record" (live, saving every response) or "replay" (recorded responses only)
+HTTP_MODE = os.getenv("HTTP_MODE", "live")
+HTTP_FIXTURE_DIR = os.getenv("HTTP_FIXTURE_DIR", "./fixtures/http")
+
+_session = None
+_session_lock = threading.Lock()
+# Optional per-host concurrency limits (threading or multiprocessing semaphores)
+_host_limits = {}
+_fixtures = None
+
+
+def __getattr__(name):
+    # requests is only imported once something actually talks HTTP
+    if name == "RequestException":
+        import requests
+        return requests.exceptions.RequestException
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def build_session(pool_connections: int = POOL_CONNECTIONS, pool_maxsize: int = POOL_MAXSIZE):
+    """
+    Create a session with keep-alive connection pools for http and https hosts.
+    Retries are left to the callers (tenacity), so the adapter never retries.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Return the process-wide session shared by all API clients.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                logger.info(f"Creating shared HTTP session (pools={POOL_CONNECTIONS}, maxsize={POOL_MAXSIZE})")
+                _session = build_session()
+    return _session
+
+
+def configure(pool_connections: int = None, pool_maxsize: int = None):
+    """
+    Replace the shared session with one using the given pool sizes.
+    """
+    global _session
+    with _session_lock:
+        old = _session
+        _session = build_session(
+            pool_connections or POOL_CONNECTIONS,
+            pool_maxsize or POOL_MAXSIZE
+        )
+    if old is not None:
+        old.close()
+
+
+def set_host_limit(host: str, semaphore):
+    """
+    Cap concurrent requests to `host` with the given semaphore. Passing a
+    multiprocessing semaphore shares the cap across worker processes.
+    """
+    _host_limits[host.lower()] = semaphore
+
+
+def clear_host_limits():
+    _host_limits.clear()
+
+
+def set_mode(mode: str, fixture_dir: str = None):
+    """
+    Switch between live, record and replay at runtime (HTTP_MODE sets the default).
+    """
+    global HTTP_MODE, _fixtures
+    if mode not in ("live", "record", "replay"):
+        raise ValueError(f"Unknown HTTP mode '{mode}'")
+    HTTP_MODE = mode
+    _fixtures = None
+    if fixture_dir:
+        global HTTP_FIXTURE_DIR
+        HTTP_FIXTURE_DIR = fixture_dir
+
+
+def get_fixtures():
+    global _fixtures
+    if _fixtures is None:
+        from src.clients.fixtures import FixtureStore
+
+        _fixtures = FixtureStore(HTTP_FIXTURE_DIR)
+    return _fixtures
+
+
+def _replay(method: str, url: str, kwargs: dict):
+    import requests
+    from src.clients.fixtures import to_response
+
+    body = kwargs.get("json", kwargs.get("data"))
+    record = get_fixtures().load(method, url, kwargs.get("params"), body)
+    if record is None:
+        raise requests.ConnectionError(f"No recorded response for {method} {url} in {HTTP_FIXTURE_DIR}")
+    return to_response(record, url)
+
+
+def _record(method: str, url: str, kwargs: dict, response):
+    body = kwargs.get("json", kwargs.get("data"))
+    # Reading .content also drains streamed responses; replay serves them whole
+    get_fixtures().save(method, url, kwargs.get("params"), body,
+                        response.status_code, dict(response.headers), response.content)
+
+
+def request(method: str, url: str, timeout=None, **kwargs):
+    """
+    Send a request through the shared, pooled session.
+    `timeout` may be a number or a (connect, read) tuple; defaults come from the environment.
+    """
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    host = (urlsplit(url).hostname or "").lower()
+    limit = _host_limits.get(host) if _host_limits else None
+    if HTTP_MODE == "replay":
+        return _replay(method, url, kwargs)
+    with telemetry.span("http", host=host), limit if limit is not None else nullcontext():
+        response = get_session().request(method, url, timeout=timeout, **kwargs)
+    if HTTP_MODE == "record":
+        _record(method, url, kwargs, response)
+    return response
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    return request("POST", url, **kwargs)
@@ -1,99 +1,310 @@
-import chromadb
-from chromadb.config import Settings
 import os
+import json
+import time
 import uuid
+import hashlib
 import logging
+from contextlib import nullcontext
 from typing import List, Dict
 from datetime import datetime
 
+import numpy as np
+
+from src import telemetry
 from src.ingest.embeddings import embed_texts
+from src.ingest.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from src.utils.dates import to_timestamp, day_range
+from src.utils.ids import canonicalize_url, make_article_id
 
 logger = logging.getLogger(__name__)
 
 # Default persistence directory
 CHROMA_DIR = os.getenv("CHROMA_DB_DIR", "./chroma_db")
+COLLECTION_PREFIX = "ticker_"
+# Page size when scanning whole collections
+SCAN_BATCH = 1000
+# MMR trade-off between relevance (1.0) and diversity (0.0)
+MMR_LAMBDA = 0.7
+# Candidates taken from each of the dense and lexical rankings before fusion
+HYBRID_FETCH_K = 30
+
+# HNSW parameters for new collections; unset means Chroma's defaults (M=16, 100, 100).
+# M and construction_ef are fixed when the index is built (change them with a rebuild),
+# search_ef can be changed on a live collection.
+HNSW_KEYS = ("M", "construction_ef", "search_ef")
+HNSW_DEFAULTS = {
+    key: int(os.environ[env]) for key, env in (
+        ("M", "CHROMA_HNSW_M"),
+        ("construction_ef", "CHROMA_HNSW_CONSTRUCTION_EF"),
+        ("search_ef", "CHROMA_HNSW_SEARCH_EF"),
+    ) if os.getenv(env)
+}
+# Per-ticker overrides as JSON, e.g. {"tsla": {"M": 32, "search_ef": 200}}
+HNSW_OVERRIDES = json.loads(os.getenv("CHROMA_HNSW_OVERRIDES") or "{}")
+# Retention defaults for compact.py; 0 disables a rule
+RETENTION_DAYS = int(os.getenv("CHROMA_RETENTION_DAYS", "0"))
+RETENTION_MAX_DOCS = int(os.getenv("CHROMA_RETENTION_MAX_DOCS", "0"))
+# Rebuild a collection once this fraction of its documents was deleted
+REBUILD_THRESHOLD = float(os.getenv("CHROMA_REBUILD_THRESHOLD", "0.2"))
+REBUILD_SUFFIX = "__rebuild"
 
 class ChromaIngest:
-    def __init__(self, persist_dir=CHROMA_DIR):
+    def __init__(self, persist_dir=CHROMA_DIR, lock=None, hnsw: Dict = None):
+        # Optional lock around collection reads/writes, for callers sharing this
+        # instance across threads. Processes must not open the same persist_dir
+        # side by side: each keeps its own HNSW index and misses the others' writes.
+        self.lock = lock if lock is not None else nullcontext()
+        self.persist_dir = persist_dir
+        # HNSW parameters for collections created by this instance (before per-ticker overrides)
+        self.hnsw = dict(HNSW_DEFAULTS if hnsw is None else hnsw)
+        self._lexical = {}
         # Initialize Client
         # Using persistent client for local storage
         try:
+            import chromadb
+
             self.client = chromadb.PersistentClient(path=persist_dir)
             logger.info(f"Initialized ChromaDB at {persist_dir}")
         except Exception as e:
             logger.error(f"Failed to init ChromaDB: {e}")
             raise
 
-    def ensure_collection(self, name: str):
+    def list_tickers(self) -> List[str]:
         """
-        Get or create a collection.
+        Tickers that have a collection in this database.
         """
-        return self.client.get_or_create_collection(
-            name=name,
-            metadata={"hnsw:space": "cosine"} # Use cosine similarity
+        return sorted(
+            name[len(COLLECTION_PREFIX):] for name in self._collection_names()
+            if name.startswith(COLLECTION_PREFIX) and not name.endswith(REBUILD_SUFFIX)
         )
 
-    def ingest_articles(self, company_ticker: str, articles: List[Dict]):
+    def _collection_names(self) -> List[str]:
+        return [col if isinstance(col, str) else col.name for col in self.client.list_collections()]
+
+    def hnsw_params(self, company_ticker: str) -> Dict:
+        """
+        HNSW parameters a new collection for this ticker is built with.
+        """
+        params = dict(self.hnsw)
+        params.update(HNSW_OVERRIDES.get(company_ticker.lower(), {}))
+        unknown = set(params) - set(HNSW_KEYS)
+        if unknown:
+            raise ValueError(f"Unknown HNSW parameter(s) for {company_ticker}: {', '.join(sorted(unknown))}")
+        return params
+
+    @staticmethod
+    def _collection_metadata(hnsw: Dict) -> Dict:
+        metadata = {"hnsw:space": "cosine"} # Use cosine similarity
+        metadata.update({f"hnsw:{key}": int(value) for key, value in hnsw.items() if value is not None})
+        return metadata
+
+    def ensure_collection(self, name: str, hnsw: Dict = None):
+        """
+        Get or create a collection. New collections get `hnsw`, or the
+        parameters configured for their ticker; existing ones keep theirs.
+        """
+        if hnsw is None:
+            hnsw = self.hnsw_params(name[len(COLLECTION_PREFIX):] if name.startswith(COLLECTION_PREFIX) else name)
+        return self.client.get_or_create_collection(name=name, metadata=self._collection_metadata(hnsw))
+
+    @staticmethod
+    def hnsw_settings(col) -> Dict:
+        """
+        HNSW parameters an existing collection actually uses.
+        """
+        config = (getattr(col, "configuration_json", None) or {}).get("hnsw") or {}
+        if config:
+            return {
+                "M": config.get("max_neighbors"),
+                "construction_ef": config.get("ef_construction"),
+                "search_ef": config.get("ef_search"),
+            }
+        metadata = col.metadata or {}
+        return {key: metadata.get(f"hnsw:{key}") for key in HNSW_KEYS}
+
+    def _lexical_index(self, collection_name: str) -> LexicalIndex:
+        """
+        BM25 index stored next to the Chroma files; reloaded if another process saved it.
+        """
+        path = os.path.join(self.persist_dir, "lexical", f"{collection_name}.npz")
+        index = self._lexical.get(collection_name)
+        if index is None or (os.path.exists(path) and os.path.getmtime(path) != index.mtime):
+            index = self._lexical[collection_name] = LexicalIndex(path)
+        return index
+
+    def _max_batch_size(self) -> int:
+        """
+        Largest number of records the client accepts in one write.
+        """
+        try:
+            return self.client.get_max_batch_size()
+        except AttributeError:
+            return SCAN_BATCH
+
+    @staticmethod
+    def _content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def ingest_articles(self, company_ticker: str, articles: List[Dict]) -> Dict:
         """
         Ingest a list of articles into a collection named after the ticker.
+        Articles already stored with the same content hash are skipped, so only
+        new or changed documents are embedded.
+        Returns counts of 'added', 'updated' and 'skipped' documents.
         """
-        collection_name = f"ticker_{company_ticker.lower()}"
+        collection_name = f"{COLLECTION_PREFIX}{company_ticker.lower()}"
         col = self.ensure_collection(collection_name)
-        
+        stats = {"added": 0, "updated": 0, "skipped": 0}
+
         if not articles:
-            return
+            return stats
 
-        # Prepare batch
-        ids = []
-        documents = []
-        metadatas = []
-        
+        # Prepare batch (last occurrence wins for repeated IDs)
+        batch = {}
         for art in articles:
             # Simple chunking: Use first 1000 chars if text is too long
             # In a real app, use a proper text splitter
             text_content = f"{art['title']}\n{art['text']}"
-            
+
             # Using article ID as vector ID
-            ids.append(art['id'])
-            documents.append(text_content)
-            metadatas.append({
+            published_ts = to_timestamp(art['published_at'])
+            batch[art['id']] = (text_content, {
                 "source": art['source'],
                 "url": art['url'],
-                "published_at": art['published_at'], 
-                "title": art['title']
+                "published_at": art['published_at'],
+                # Numeric copy for date-window filtering at query time
+                "published_ts": published_ts if published_ts is not None else 0,
+                # Publish date is a stand-in (e.g. web results without a date)
+                "date_estimated": bool(art.get('date_estimated', False)) or published_ts is None,
+                "title": art['title'],
+                "content_hash": self._content_hash(text_content)
             })
 
-        # Generate embeddings
-        logger.info(f"Generating embeddings for {len(documents)} documents...")
-        embeddings = embed_texts(documents).tolist()
-
-        # Add to Chroma
-        # upsert helps avoid duplicate key errors if re-running
-        col.upsert(
-            ids=ids,
-            documents=documents,
-            metadatas=metadatas,
-            embeddings=embeddings
+        # Look up what is already stored (one call per max-size batch)
+        stored = {}
+        batch_ids = list(batch.keys())
+        step = self._max_batch_size()
+        for i in range(0, len(batch_ids), step):
+            with self.lock:
+                existing = col.get(ids=batch_ids[i:i + step], include=["metadatas"])
+            stored.update((doc_id, meta or {}) for doc_id, meta in zip(existing["ids"], existing["metadatas"]))
+
+        ids = []
+        documents = []
+        metadatas = []
+        changed = set()
+        backfill_ids = []
+        backfill_metadatas = []
+        for doc_id, (text_content, metadata) in batch.items():
+            if doc_id in stored:
+                if stored[doc_id].get("content_hash") == metadata["content_hash"]:
+                    stats["skipped"] += 1
+                    # Documents stored before date filtering only need their metadata refreshed
+                    if "published_ts" not in stored[doc_id]:
+                        backfill_ids.append(doc_id)
+                        backfill_metadatas.append(metadata)
+                    continue
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            ids.append(doc_id)
+            documents.append(text_content)
+            metadatas.append(metadata)
+            changed.add(doc_id)
+
+        if documents:
+            # Generate embeddings
+            logger.info(f"Generating embeddings for {len(documents)} documents...")
+            with telemetry.span("embed", texts=len(documents)):
+                embeddings = embed_texts(documents).tolist()
+
+            # Add to Chroma
+            # upsert helps avoid duplicate key errors if re-running
+            for i in range(0, len(ids), step):
+                with self.lock, telemetry.span("chroma.upsert"):
+                    col.upsert(
+                        ids=ids[i:i + step],
+                        documents=documents[i:i + step],
+                        metadatas=metadatas[i:i + step],
+                        embeddings=embeddings[i:i + step]
+                    )
+        if backfill_ids:
+            for i in range(0, len(backfill_ids), step):
+                with self.lock:
+                    col.update(ids=backfill_ids[i:i + step], metadatas=backfill_metadatas[i:i + step])
+            logger.info(f"Backfilled date metadata for {len(backfill_ids)} documents")
+
+        # Keep the lexical index in step: changed documents plus any stored before it existed
+        with self.lock:
+            lexical = self._lexical_index(collection_name)
+            lex_ids = [doc_id for doc_id in batch if doc_id in changed or doc_id not in lexical]
+            if lex_ids:
+                lexical.upsert(
+                    lex_ids,
+                    [batch[d][0] for d in lex_ids],
+                    [batch[d][1]["published_ts"] for d in lex_ids],
+                    [batch[d][1]["date_estimated"] for d in lex_ids]
+                )
+                lexical.save()
+        logger.info(
+            f"Ingested into collection '{collection_name}': "
+            f"{stats['added']} added, {stats['updated']} updated, {stats['skipped']} unchanged"
         )
-        logger.info(f"Ingested {len(documents)} into collection '{collection_name}'")
+        return stats
 
-    def query(self, company_ticker: str, query_text: str, top_k: int = 5):
+    def _get_collection(self, company_ticker: str):
         """
-        Retrieve relevant documents.
+        Existing collection for a ticker, or None.
         """
-        collection_name = f"ticker_{company_ticker.lower()}"
+        import chromadb.errors
+
+        # Older releases raise ValueError for a missing collection and have no NotFoundError
+        NotFoundError = getattr(chromadb.errors, "NotFoundError", ValueError)
+
+        collection_name = f"{COLLECTION_PREFIX}{company_ticker.lower()}"
         try:
-            col = self.client.get_collection(collection_name)
-        except ValueError:
-             logger.warning(f"Collection {collection_name} not found.")
-             return []
+            return self.client.get_collection(collection_name)
+        except (ValueError, NotFoundError):
+            logger.warning(f"Collection {collection_name} not found.")
+            return None
+
+    @staticmethod
+    def _date_filter(from_date: str = None, to_date: str = None):
+        """
+        Chroma `where` clause restricting candidates to the run's date window.
+        Documents whose publish date is only estimated are always candidates.
+        """
+        start, end = day_range(from_date, to_date)
+        bounds = []
+        if start is not None:
+            bounds.append({"published_ts": {"$gte": start}})
+        if end is not None:
+            bounds.append({"published_ts": {"$lte": end}})
+        if not bounds:
+            return None
+        in_window = bounds[0] if len(bounds) == 1 else {"$and": bounds}
+        return {"$or": [in_window, {"date_estimated": True}]}
+
+    def query(self, company_ticker: str, query_text: str, top_k: int = 5,
+              from_date: str = None, to_date: str = None, hybrid: bool = False):
+        """
+        Retrieve relevant documents.
+        With from_date/to_date, only articles published in that window are searched.
+        With hybrid=True, dense and BM25 rankings are fused with reciprocal rank fusion.
+        """
+        col = self._get_collection(company_ticker)
+        if col is None:
+            return []
 
         query_embedding = embed_texts([query_text]).tolist()
+        n_results = max(top_k, HYBRID_FETCH_K) if hybrid else top_k
         
-        results = col.query(
-            query_embeddings=query_embedding,
-            n_results=top_k
-        )
+        with self.lock, telemetry.span("chroma.query"):
+            results = col.query(
+                query_embeddings=query_embedding,
+                n_results=n_results,
+                where=self._date_filter(from_date, to_date)
+            )
         
         # Flatten results
         # results structure: {'ids': [[...]], 'documents': [[...]], 'metadatas': [[...]]}
@@ -102,13 +313,335 @@ class ChromaIngest:
             ids = results['ids'][0]
             docs = results['documents'][0]
             metas = results['metadatas'][0]
+            dists = results['distances'][0] if results.get('distances') else [None] * len(ids)
             
             for i in range(len(ids)):
                 retrieved.append({
                     "id": ids[i],
                     "snippet": docs[i][:500], # Return first 500 chars as snippet
                     "full_text": docs[i],
-                    "metadata": metas[i]
+                    "metadata": metas[i],
+                    "distance": dists[i]
                 })
-                
+
+        if hybrid:
+            with telemetry.span("lexical.search"):
+                retrieved = self._fuse_lexical(col, retrieved, query_text, top_k, from_date, to_date)
         return retrieved
+
+    def _fuse_lexical(self, col, dense: List[Dict], query_text: str, top_k: int,
+                      from_date: str = None, to_date: str = None) -> List[Dict]:
+        """
+        Reciprocal rank fusion of the dense hits with BM25 hits from the lexical index.
+        Lexical-only hits are fetched from Chroma in one get() call.
+        """
+        start, end = day_range(from_date, to_date)
+        with self.lock:
+            lexical = self._lexical_index(col.name).search(
+                query_text, top_n=max(top_k, HYBRID_FETCH_K), start_ts=start, end_ts=end
+            )
+        fused = reciprocal_rank_fusion([[d["id"] for d in dense], [doc_id for doc_id, _ in lexical]])[:top_k]
+
+        by_id = {d["id"]: d for d in dense}
+        missing = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+        if missing:
+            with self.lock:
+                extra = col.get(ids=missing, include=["documents", "metadatas"])
+            for doc_id, doc, meta in zip(extra["ids"], extra["documents"], extra["metadatas"]):
+                by_id[doc_id] = {
+                    "id": doc_id,
+                    "snippet": doc[:500],
+                    "full_text": doc,
+                    "metadata": meta,
+                    "distance": None
+                }
+        return [dict(by_id[doc_id], rrf_score=score) for doc_id, score in fused if doc_id in by_id]
+
+    def query_aspects(self, company_ticker: str, aspect_queries: Dict[str, str], top_k: int = 5,
+                      fetch_k: int = None, lambda_mult: float = MMR_LAMBDA,
+                      from_date: str = None, to_date: str = None):
+        """
+        Retrieve documents covering several aspects at once.
+        All aspect queries are embedded in one batch and sent as a single
+        col.query; the per-aspect candidates are then merged with maximal
+        marginal relevance so the top_k are both relevant and diverse.
+        Each result lists the aspects it was retrieved for.
+        from_date/to_date restrict candidates as in query.
+        """
+        col = self._get_collection(company_ticker)
+        if col is None or not aspect_queries:
+            return []
+
+        names = list(aspect_queries.keys())
+        query_embeddings = embed_texts([aspect_queries[n] for n in names]).tolist()
+        fetch_k = fetch_k or max(2 * top_k, top_k + 5)
+
+        with self.lock, telemetry.span("chroma.query"):
+            results = col.query(
+                query_embeddings=query_embeddings,
+                n_results=fetch_k,
+                where=self._date_filter(from_date, to_date),
+                include=["documents", "metadatas", "distances", "embeddings"]
+            )
+
+        # Union of candidates; relevance is the best similarity over aspects
+        candidates = {}
+        for q, aspect in enumerate(names):
+            for i, doc_id in enumerate(results["ids"][q]):
+                relevance = 1.0 - float(results["distances"][q][i])
+                cand = candidates.get(doc_id)
+                if cand is None:
+                    candidates[doc_id] = cand = {
+                        "document": results["documents"][q][i],
+                        "metadata": results["metadatas"][q][i],
+                        "embedding": results["embeddings"][q][i],
+                        "relevance": relevance,
+                        "aspects": []
+                    }
+                cand["relevance"] = max(cand["relevance"], relevance)
+                cand["aspects"].append(aspect)
+
+        if not candidates:
+            return []
+
+        ids = list(candidates.keys())
+        relevance = np.array([candidates[i]["relevance"] for i in ids])
+        vectors = np.array([candidates[i]["embedding"] for i in ids], dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        similarity = vectors @ vectors.T
+
+        selected = [int(np.argmax(relevance))]
+        max_sim = similarity[selected[0]].copy()
+        while len(selected) < min(top_k, len(ids)):
+            scores = lambda_mult * relevance - (1 - lambda_mult) * max_sim
+            scores[selected] = -np.inf
+            nxt = int(np.argmax(scores))
+            selected.append(nxt)
+            max_sim = np.maximum(max_sim, similarity[nxt])
+
+        retrieved = []
+        for idx in selected:
+            cand = candidates[ids[idx]]
+            retrieved.append({
+                "id": ids[idx],
+                "snippet": cand["document"][:500],
+                "full_text": cand["document"],
+                "metadata": cand["metadata"],
+                "distance": 1.0 - cand["relevance"],
+                "aspects": cand["aspects"]
+            })
+        return retrieved
+
+    def _scan(self, col, include: List[str], where: Dict = None):
+        """
+        Yield (ids, documents/metadatas...) pages covering a whole collection
+        (or the documents matching `where`).
+        """
+        offset = 0
+        while True:
+            with self.lock:
+                page = col.get(include=include, where=where, limit=SCAN_BATCH, offset=offset)
+            if not page["ids"]:
+                break
+            yield page
+            offset += len(page["ids"])
+
+    def compact_duplicates(self, company_ticker: str) -> Dict:
+        """
+        Collapse documents that refer to the same article (same canonical URL,
+        or same content when there is no URL) into a single entry.
+        The survivor is the one carrying the deterministic ID when present,
+        else the most recently published copy.
+        Returns counts of documents 'kept' and 'removed'.
+        """
+        col = self._get_collection(company_ticker)
+        if col is None:
+            return {"kept": 0, "removed": 0}
+
+        groups = {}
+        for page in self._scan(col, include=["metadatas", "documents"]):
+            for doc_id, doc, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+                meta = meta or {}
+                canonical = canonicalize_url(meta.get("url", ""))
+                group_key = canonical or f"content:{self._content_hash(doc or '')}"
+                expected_id = make_article_id(meta.get("url", ""), meta.get("title", ""), "")
+                groups.setdefault(group_key, []).append((doc_id, expected_id, meta.get("published_at", "")))
+
+        to_delete = []
+        for members in groups.values():
+            if len(members) < 2:
+                continue
+            members.sort(key=lambda m: (m[0] == m[1], m[2], m[0]), reverse=True)
+            to_delete.extend(m[0] for m in members[1:])
+
+        self._delete(col, to_delete)
+        stats = {"kept": len(groups), "removed": len(to_delete)}
+        logger.info(f"Compacted '{col.name}': {stats['removed']} duplicates removed, {stats['kept']} kept")
+        return stats
+
+    def _delete(self, col, ids: List[str]):
+        """
+        Delete documents from a collection and its lexical index.
+        """
+        if not ids:
+            return
+        with self.lock:
+            for start in range(0, len(ids), SCAN_BATCH):
+                col.delete(ids=ids[start:start + SCAN_BATCH])
+            lexical = self._lexical_index(col.name)
+            lexical.remove(ids)
+            lexical.save()
+
+    def apply_retention(self, company_ticker: str, max_age_days: int = None, max_docs: int = None,
+                        now: float = None) -> Dict:
+        """
+        Delete articles published more than `max_age_days` ago, then the oldest
+        ones beyond `max_docs`. Articles without a known publish date, or with
+        an estimated one (e.g. Serper results stamped with their fetch time),
+        are never expired by age but are the first to go when trimming by count.
+        Returns counts of documents 'expired', 'trimmed' and 'kept'.
+        """
+        stats = {"expired": 0, "trimmed": 0, "kept": 0}
+        col = self._get_collection(company_ticker)
+        if col is None:
+            return stats
+
+        to_delete = []
+        if max_age_days:
+            cutoff = int((now if now is not None else time.time()) - max_age_days * 86400)
+            where = {"$and": [
+                {"published_ts": {"$gt": 0}}, {"published_ts": {"$lt": cutoff}}, {"date_estimated": False}
+            ]}
+            for page in self._scan(col, include=[], where=where):
+                to_delete.extend(page["ids"])
+            stats["expired"] = len(to_delete)
+
+        with self.lock:
+            total = col.count()
+        excess = total - len(to_delete) - (max_docs or 0)
+        if max_docs and excess > 0:
+            expired = set(to_delete)
+            dated = []
+            for page in self._scan(col, include=["metadatas"]):
+                for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                    if doc_id not in expired:
+                        meta = meta or {}
+                        published_ts = 0 if meta.get("date_estimated") else meta.get("published_ts") or 0
+                        dated.append((published_ts, doc_id))
+            dated.sort()
+            trimmed = [doc_id for _, doc_id in dated[:excess]]
+            to_delete.extend(trimmed)
+            stats["trimmed"] = len(trimmed)
+
+        self._delete(col, to_delete)
+        stats["kept"] = total - len(to_delete)
+        logger.info(
+            f"Retention on '{col.name}': {stats['expired']} expired, {stats['trimmed']} trimmed, {stats['kept']} kept"
+        )
+        return stats
+
+    def rebuild(self, company_ticker: str, hnsw: Dict = None) -> Dict:
+        """
+        Recreate a ticker's collection from its stored embeddings (nothing is
+        re-embedded), so the HNSW index no longer carries deleted entries and
+        picks up `hnsw` (default: the ticker's configured parameters).
+        The lexical index is rebuilt from the same documents.
+        Returns the number of 'documents', elapsed 'seconds' and the new 'hnsw' settings.
+        """
+        name = f"{COLLECTION_PREFIX}{company_ticker.lower()}"
+        tmp_name = f"{name}{REBUILD_SUFFIX}"
+        hnsw = self.hnsw_params(company_ticker) if hnsw is None else hnsw
+        start = time.perf_counter()
+
+        # Holds the lock throughout: writes made to the old collection during the copy would be lost
+        with self.lock:
+            existing = set(self._collection_names())
+            if tmp_name in existing:
+                if name in existing:
+                    # Copy from an interrupted rebuild; the original is still intact
+                    self.client.delete_collection(tmp_name)
+                else:
+                    # Interrupted after the original was dropped; the copy is complete
+                    self.client.get_collection(tmp_name).modify(name=name)
+                    existing.add(name)
+            if name not in existing:
+                return {"documents": 0, "seconds": 0.0, "hnsw": {}}
+
+            source = self.client.get_collection(name)
+            target = self.client.create_collection(name=tmp_name, metadata=self._collection_metadata(hnsw))
+            lexical = self._lexical_index(name)
+            lexical.clear()
+            copied = 0
+            while True:
+                page = source.get(include=["documents", "metadatas", "embeddings"], limit=SCAN_BATCH, offset=copied)
+                if not page["ids"]:
+                    break
+                target.add(
+                    ids=page["ids"],
+                    documents=page["documents"],
+                    metadatas=page["metadatas"],
+                    embeddings=page["embeddings"]
+                )
+                metadatas = [meta or {} for meta in page["metadatas"]]
+                lexical.upsert(
+                    page["ids"],
+                    page["documents"],
+                    [meta.get("published_ts", 0) for meta in metadatas],
+                    [meta.get("date_estimated", False) for meta in metadatas]
+                )
+                copied += len(page["ids"])
+
+            self.client.delete_collection(name)
+            target.modify(name=name)
+            lexical.save()
+
+        stats = {
+            "documents": copied,
+            "seconds": round(time.perf_counter() - start, 3),
+            "hnsw": self.hnsw_settings(self.client.get_collection(name)),
+        }
+        logger.info(f"Rebuilt '{name}' with {copied} documents in {stats['seconds']}s, HNSW {stats['hnsw']}")
+        return stats
+
+    def set_search_ef(self, company_ticker: str, search_ef: int) -> bool:
+        """
+        Change search_ef without a rebuild. Chroma applies it the next time the
+        index is loaded (e.g. by the next process); a process that already has
+        it open keeps the old value. False when the collection does not exist
+        or this Chroma version cannot change it in place.
+        """
+        col = self._get_collection(company_ticker)
+        if col is None:
+            return False
+        try:
+            with self.lock:
+                col.modify(configuration={"hnsw": {"ef_search": int(search_ef)}})
+        except TypeError:
+            return False
+        return True
+
+    def tune_hnsw(self, company_ticker: str, M: int = None, construction_ef: int = None,
+                  search_ef: int = None) -> Dict:
+        """
+        Apply HNSW parameters to an existing collection: search_ef in place
+        when possible, M and construction_ef through a rebuild.
+        Returns the collection's settings afterwards (empty if it does not exist).
+        """
+        col = self._get_collection(company_ticker)
+        if col is None:
+            return {}
+        wanted = {k: v for k, v in (("M", M), ("construction_ef", construction_ef), ("search_ef", search_ef))
+                  if v is not None}
+        current = self.hnsw_settings(col)
+        changes = {k: v for k, v in wanted.items() if current.get(k) != v}
+        if not changes:
+            return current
+
+        needs_rebuild = any(k != "search_ef" for k in changes)
+        if not needs_rebuild and not self.set_search_ef(company_ticker, changes["search_ef"]):
+            needs_rebuild = True
+        if needs_rebuild:
+            params = {k: v for k, v in current.items() if v is not None}
+            params.update(wanted)
+            self.rebuild(company_ticker, hnsw=params)
+        return self.hnsw_settings(self._get_collection(company_ticker))
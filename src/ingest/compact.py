@@ -0,0 +1,79 @@
+import argparse
+import sys
+import os
+import json
+import logging
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.ingest.chroma_ingest import (
+    ChromaIngest, CHROMA_DIR, REBUILD_THRESHOLD, RETENTION_DAYS, RETENTION_MAX_DOCS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def maintain(chroma: ChromaIngest, ticker: str, max_age_days: int = None, max_docs: int = None,
+             rebuild: bool = False, rebuild_threshold: float = REBUILD_THRESHOLD, hnsw: dict = None) -> dict:
+    """
+    Collapse duplicates, apply retention, then rebuild the collection when
+    asked to, when at least `rebuild_threshold` of its documents were deleted,
+    or when `hnsw` changes M/construction_ef. A search_ef-only change is applied in place.
+    """
+    summary = {"duplicates": chroma.compact_duplicates(ticker)}
+    summary["retention"] = chroma.apply_retention(ticker, max_age_days=max_age_days, max_docs=max_docs)
+
+    removed = summary["duplicates"]["removed"] + summary["retention"]["expired"] + summary["retention"]["trimmed"]
+    before = summary["retention"]["kept"] + removed
+    if rebuild or (before and removed / before >= rebuild_threshold):
+        params = chroma.hnsw_params(ticker)
+        params.update(hnsw or {})
+        summary["rebuild"] = chroma.rebuild(ticker, hnsw=params)
+    elif hnsw:
+        summary["hnsw"] = chroma.tune_hnsw(ticker, **hnsw)
+    return summary
+
+
+def main():
+    """
+    Maintenance for per-ticker collections: collapses duplicate copies of the
+    same article, removes articles outside the retention policy and rebuilds
+    indexes after large deletions or to change HNSW parameters.
+    """
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Compact per-ticker Chroma collections")
+    parser.add_argument("--ticker", action="append", help="Ticker to compact (repeatable, default: all)")
+    parser.add_argument("--persist-dir", default=CHROMA_DIR, help="Chroma persistence directory")
+    parser.add_argument("--max-age-days", type=int, default=RETENTION_DAYS,
+                        help="Delete articles published more than this many days ago (0: keep all)")
+    parser.add_argument("--max-docs", type=int, default=RETENTION_MAX_DOCS,
+                        help="Keep at most this many articles per ticker, newest first (0: no limit)")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild every collection from stored embeddings")
+    parser.add_argument("--rebuild-threshold", type=float, default=REBUILD_THRESHOLD,
+                        help="Rebuild once this fraction of a collection was deleted")
+    parser.add_argument("--hnsw-m", type=int, help="HNSW M (links per node); applied with a rebuild")
+    parser.add_argument("--hnsw-construction-ef", type=int, help="HNSW construction_ef; applied with a rebuild")
+    parser.add_argument("--hnsw-search-ef", type=int, help="HNSW search_ef; applied in place where possible")
+    args = parser.parse_args()
+
+    hnsw = {k: v for k, v in (
+        ("M", args.hnsw_m), ("construction_ef", args.hnsw_construction_ef), ("search_ef", args.hnsw_search_ef)
+    ) if v is not None}
+
+    chroma = ChromaIngest(persist_dir=args.persist_dir)
+    tickers = args.ticker or chroma.list_tickers()
+
+    summary = {}
+    for ticker in tickers:
+        summary[ticker] = maintain(
+            chroma, ticker, max_age_days=args.max_age_days, max_docs=args.max_docs,
+            rebuild=args.rebuild, rebuild_threshold=args.rebuild_threshold, hnsw=hnsw
+        )
+
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
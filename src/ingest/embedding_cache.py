@@ -0,0 +1,210 @@
+import os
+import re
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: only in-process locking
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("CACHE_DIR", "./.cache")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "100000"))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE", "1") != "0"
+
+# One slot per cached vector: sha256 hex key of (model, text) and last-use tick
+INDEX_DTYPE = np.dtype([("key", "S64"), ("tick", "<i8")])
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def text_key(model_name: str, text: str) -> bytes:
+    return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest().encode("ascii")
+
+
+class EmbeddingCache:
+    """
+    Persistent, content-addressed embedding store for one model.
+
+    Vectors live in a memory-mapped float32 array (`vectors.npy`) and the
+    slot index in a parallel memory-mapped record array (`index.npy`), so
+    both are shared through the OS page cache and nothing is rewritten on
+    insert. When all `capacity` slots are used the least recently used slot
+    is overwritten. `get` returns copies, since a slot can be reused for
+    another text by any later insert (here or in another process).
+    """
+
+    def __init__(self, model_name: str, capacity: int = EMBEDDING_CACHE_SIZE, cache_dir: str = CACHE_DIR):
+        self.model_name = model_name
+        self.capacity = capacity
+        self.dir = os.path.join(cache_dir, "embeddings", re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._index = None
+        self._slots: Dict[bytes, int] = {}
+        self._tick = 0
+        self._open()
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _paths(self):
+        return os.path.join(self.dir, "vectors.npy"), os.path.join(self.dir, "index.npy")
+
+    def _open(self):
+        vec_path, idx_path = self._paths()
+        if not (os.path.exists(vec_path) and os.path.exists(idx_path)):
+            return
+        try:
+            vectors = np.lib.format.open_memmap(vec_path, mode="r+")
+            index = np.lib.format.open_memmap(idx_path, mode="r+")
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache at {self.dir}: {e}")
+            return
+        if len(index) != self.capacity or len(vectors) != self.capacity or index.dtype != INDEX_DTYPE:
+            logger.info(f"Embedding cache at {self.dir} has a different layout, starting fresh")
+            return
+        self._vectors, self._index = vectors, index
+        used = np.flatnonzero(index["key"] != b"")
+        self._slots = {index["key"][i]: int(i) for i in used}
+        self._tick = int(index["tick"].max()) if len(used) else 0
+        logger.info(f"Opened embedding cache with {len(self._slots)} vectors ({self.model_name})")
+
+    def _create(self, dim: int):
+        os.makedirs(self.dir, exist_ok=True)
+        vec_path, idx_path = self._paths()
+        self._vectors = np.lib.format.open_memmap(vec_path, mode="w+", dtype=np.float32, shape=(self.capacity, dim))
+        self._index = np.lib.format.open_memmap(idx_path, mode="w+", dtype=INDEX_DTYPE, shape=(self.capacity,))
+        self._slots = {}
+        self._tick = 0
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Serialize writers across processes sharing the same cache directory.
+        """
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.dir, exist_ok=True)
+        with open(os.path.join(self.dir, ".lock"), "w") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+
+    def _resolve(self, key: bytes) -> Optional[int]:
+        slot = self._slots.get(key)
+        # Another process may have reused the slot since we indexed it
+        if slot is not None and self._index["key"][slot] != key:
+            del self._slots[key]
+            slot = None
+        return slot
+
+    def get_many(self, keys: List[bytes]) -> Dict[int, np.ndarray]:
+        """
+        Look up keys; returns {position in `keys`: vector copy} for the hits.
+        """
+        with self._lock:
+            if self._index is None:
+                return {}
+            hits = {}
+            unresolved = []
+            for pos, key in enumerate(keys):
+                slot = self._resolve(key)
+                if slot is None:
+                    unresolved.append(pos)
+                else:
+                    hits[pos] = slot
+            # Pick up entries written by other processes since we opened the index
+            if unresolved:
+                wanted = np.array([keys[pos] for pos in unresolved], dtype="S64")
+                for slot in np.flatnonzero(np.isin(self._index["key"], wanted)):
+                    self._slots[self._index["key"][slot]] = int(slot)
+                for pos in unresolved:
+                    slot = self._slots.get(keys[pos])
+                    if slot is not None:
+                        hits[pos] = slot
+
+            if not hits:
+                return {}
+            self._tick += 1
+            slots = np.fromiter(hits.values(), dtype=np.int64, count=len(hits))
+            self._index["tick"][slots] = self._tick
+            # Fancy indexing copies out of the map before the lock is released
+            vectors = self._vectors[slots]
+            return {pos: vectors[i] for i, pos in enumerate(hits)}
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        return self.get_many([key]).get(0)
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray):
+        """
+        Store vectors for keys, evicting least recently used slots when full.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(keys) == 0:
+            return
+        with self._lock, self._file_lock():
+            if self._vectors is None:
+                # Another process may have created the files since we looked
+                self._open()
+            if self._vectors is None:
+                self._create(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dim {vectors.shape[1]} does not match cache dim {self.dim}")
+
+            new_keys = [k for k in dict.fromkeys(keys) if self._resolve(k) is None]
+            if not new_keys:
+                return
+            new_keys = new_keys[-self.capacity:]
+            slots = self._allocate(len(new_keys))
+            rows = {k: i for i, k in enumerate(keys)}
+            self._tick += 1
+            for key, slot in zip(new_keys, slots):
+                old = self._index["key"][slot]
+                if old:
+                    self._slots.pop(old, None)
+                # Write the vector before publishing its key
+                self._vectors[slot] = vectors[rows[key]]
+                self._index[slot] = (key, self._tick)
+                self._slots[key] = int(slot)
+            self._vectors.flush()
+            self._index.flush()
+
+    def _allocate(self, n: int) -> np.ndarray:
+        free = np.flatnonzero(self._index["key"] == b"")[:n]
+        if len(free) == n:
+            return free
+        needed = n - len(free)
+        ticks = np.where(self._index["key"] == b"", np.iinfo(np.int64).max, self._index["tick"])
+        lru = np.argpartition(ticks, needed - 1)[:needed]
+        return np.concatenate([free, lru])
+
+
+def get_embedding_cache(model_name: str) -> Optional[EmbeddingCache]:
+    """
+    Return the process-wide cache for a model, or None when EMBEDDING_CACHE=0.
+    """
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    cache = _caches.get(model_name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(model_name)
+            if cache is None:
+                cache = _caches[model_name] = EmbeddingCache(model_name)
+    return cache
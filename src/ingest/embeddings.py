@@ -1,9 +1,11 @@
-from sentence_transformers import SentenceTransformer
 import os
 import logging
 from typing import List
 import numpy as np
 
+from src import telemetry
+from src.ingest.embedding_cache import get_embedding_cache, text_key
+
 logger = logging.getLogger(__name__)
 
 # Singleton wrapper
@@ -13,19 +15,49 @@ MODEL_NAME = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 def get_model():
     global MODEL
     if MODEL is None:
+        # Deferred: importing sentence_transformers pulls in torch
+        from sentence_transformers import SentenceTransformer
+
         logger.info(f"Loading embedding model: {MODEL_NAME}")
         MODEL = SentenceTransformer(MODEL_NAME)
     return MODEL
 
+def _encode(texts: List[str]) -> np.ndarray:
+    model = get_model()
+    telemetry.count("embeddings.encoded", len(texts))
+    with telemetry.span("embed.model", texts=len(texts)):
+        # show_progress_bar=False to keep logs clean
+        return model.encode(texts, show_progress_bar=False)
+
 def embed_texts(texts: List[str]) -> np.ndarray:
     """
     Generate embeddings for a list of texts.
     Returns a numpy array of embeddings.
+    Texts already seen with this model are served from the persistent
+    embedding cache; the model is only loaded and run for the misses.
     """
     if not texts:
         return np.array([])
-        
-    model = get_model()
-    # show_progress_bar=False to keep logs clean
-    embeddings = model.encode(texts, show_progress_bar=False)
-    return embeddings
+
+    cache = get_embedding_cache(MODEL_NAME)
+    if cache is None:
+        return _encode(texts)
+
+    keys = [text_key(MODEL_NAME, t) for t in texts]
+    hits = cache.get_many(keys)
+    telemetry.count("cache.embedding.hit", len(hits))
+    telemetry.count("cache.embedding.miss", len(texts) - len(hits))
+    if len(hits) == len(texts):
+        return np.stack([hits[i] for i in range(len(texts))])
+
+    # Encode each distinct missing text once
+    missing = {}
+    for i, key in enumerate(keys):
+        if i not in hits:
+            missing.setdefault(key, texts[i])
+    logger.debug(f"Embedding cache: {len(hits)} hits, {len(missing)} texts to encode")
+    encoded = np.asarray(_encode(list(missing.values())), dtype=np.float32)
+    fresh = dict(zip(missing.keys(), encoded))
+    result = np.stack([hits[i] if i in hits else fresh[key] for i, key in enumerate(keys)])
+    cache.put_many(list(missing.keys()), encoded)
+    return result
@@ -0,0 +1,191 @@
+import os
+import re
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[.&'][a-z0-9]+)*")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "its", "of", "on", "or", "that", "the", "to", "was", "were", "will", "with",
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercased word tokens; keeps tickers, numbers and names like 'at&t' or 'q3'.
+    """
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+class LexicalIndex:
+    """
+    In-process BM25 index for one collection.
+
+    Documents are kept as term-id/term-frequency arrays and persisted as one
+    .npz file (vocabulary plus CSR-packed int32 postings). Scoring
+    gathers each query term's postings and accumulates BM25 contributions
+    with a single np.bincount, so queries stay in the low milliseconds.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = None
+        self._vocab: Dict[str, int] = {}
+        self._docs: Dict[str, Tuple[np.ndarray, np.ndarray, int, bool]] = {}
+        self._postings = None
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str):
+        return doc_id in self._docs
+
+    def _load(self):
+        with np.load(self.path, allow_pickle=False) as data:
+            vocab = data["vocab"].tolist()
+            doc_ids = data["doc_ids"].tolist()
+            ptr, term_ids, tfs = data["ptr"], data["term_ids"], data["tfs"]
+            published_ts, estimated = data["published_ts"], data["date_estimated"]
+        self._vocab = {t: i for i, t in enumerate(vocab)}
+        self._docs = {
+            doc_id: (term_ids[ptr[i]:ptr[i + 1]], tfs[ptr[i]:ptr[i + 1]], int(published_ts[i]), bool(estimated[i]))
+            for i, doc_id in enumerate(doc_ids)
+        }
+        self._postings = None
+        self.mtime = os.path.getmtime(self.path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        doc_ids = list(self._docs.keys())
+        rows = [self._docs[d] for d in doc_ids]
+        lengths = np.array([len(r[0]) for r in rows], dtype=np.int64)
+        ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=ptr[1:])
+        vocab = sorted(self._vocab, key=self._vocab.get)
+        tmp = f"{self.path}.tmp.npz"
+        np.savez(
+            tmp,
+            vocab=np.array(vocab, dtype=str),
+            doc_ids=np.array(doc_ids, dtype=str),
+            ptr=ptr,
+            term_ids=np.concatenate([r[0] for r in rows]) if rows else np.zeros(0, dtype=np.int32),
+            tfs=np.concatenate([r[1] for r in rows]) if rows else np.zeros(0, dtype=np.int32),
+            published_ts=np.array([r[2] for r in rows], dtype=np.int64),
+            date_estimated=np.array([r[3] for r in rows], dtype=bool),
+        )
+        os.replace(tmp, self.path)
+        self.mtime = os.path.getmtime(self.path)
+
+    def upsert(self, ids: List[str], texts: List[str], published_ts: List[int], date_estimated: List[bool]):
+        for doc_id, text, ts, est in zip(ids, texts, published_ts, date_estimated):
+            tokens = tokenize(text)
+            term_ids = np.fromiter(
+                (self._vocab.setdefault(t, len(self._vocab)) for t in tokens), dtype=np.int32, count=len(tokens)
+            )
+            terms, counts = np.unique(term_ids, return_counts=True)
+            self._docs[doc_id] = (terms.astype(np.int32), counts.astype(np.int32), int(ts or 0), bool(est))
+        self._postings = None
+
+    def clear(self):
+        self._vocab = {}
+        self._docs = {}
+        self._postings = None
+
+    def remove(self, ids: List[str]):
+        for doc_id in ids:
+            self._docs.pop(doc_id, None)
+        self._postings = None
+
+    def _build_postings(self):
+        """
+        Invert the per-document arrays into term-sorted postings (CSR by term).
+        """
+        doc_ids = list(self._docs.keys())
+        rows = [self._docs[d] for d in doc_ids]
+        n_terms = len(self._vocab)
+        if rows:
+            terms = np.concatenate([r[0] for r in rows])
+            tfs = np.concatenate([r[1] for r in rows]).astype(np.float32)
+            doc_len = np.array([r[1].sum() for r in rows], dtype=np.float32)
+            doc_idx = np.repeat(np.arange(len(rows)), [len(r[0]) for r in rows])
+        else:
+            terms = np.zeros(0, dtype=np.int32)
+            tfs = np.zeros(0, dtype=np.float32)
+            doc_len = np.zeros(0, dtype=np.float32)
+            doc_idx = np.zeros(0, dtype=np.int64)
+        order = np.argsort(terms, kind="stable")
+        term_ptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=n_terms), out=term_ptr[1:])
+        avgdl = float(doc_len.mean()) if len(doc_len) else 0.0
+        self._postings = {
+            "doc_ids": doc_ids,
+            "term_ptr": term_ptr,
+            "doc_idx": doc_idx[order],
+            "tfs": tfs[order],
+            "norm": BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avgdl) if avgdl else np.ones_like(doc_len),
+            "published_ts": np.array([r[2] for r in rows], dtype=np.int64),
+            "date_estimated": np.array([r[3] for r in rows], dtype=bool),
+        }
+
+    def search(self, query: str, top_n: int = 10, start_ts: Optional[int] = None,
+               end_ts: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        BM25 top_n (doc_id, score) pairs, optionally restricted to a publish window
+        (documents with estimated dates always qualify).
+        """
+        if not self._docs:
+            return []
+        if self._postings is None:
+            self._build_postings()
+        p = self._postings
+        n_docs = len(p["doc_ids"])
+
+        term_ids = sorted({self._vocab[t] for t in tokenize(query) if t in self._vocab})
+        if not term_ids:
+            return []
+        starts, ends = p["term_ptr"][term_ids], p["term_ptr"][np.array(term_ids) + 1]
+        df = (ends - starts).astype(np.float32)
+        idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        sel = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+        docs = p["doc_idx"][sel]
+        tfs = p["tfs"][sel]
+        weights = np.repeat(idf, (ends - starts))
+        contrib = weights * tfs * (BM25_K1 + 1) / (tfs + p["norm"][docs])
+        scores = np.bincount(docs, weights=contrib, minlength=n_docs)
+
+        if start_ts is not None or end_ts is not None:
+            ts = p["published_ts"]
+            in_window = np.ones(n_docs, dtype=bool)
+            if start_ts is not None:
+                in_window &= ts >= start_ts
+            if end_ts is not None:
+                in_window &= ts <= end_ts
+            scores[~(in_window | p["date_estimated"])] = 0.0
+
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > top_n:
+            hits = hits[np.argpartition(-scores[hits], top_n - 1)[:top_n]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(p["doc_ids"][i], float(scores[i])) for i in hits]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists: score(d) = sum over lists of 1 / (k + rank).
+    """
+    fused = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
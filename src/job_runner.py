@@ -0,0 +1,78 @@
+import json
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Fields every report job (batch line, service request, queued job) must carry
+REQUIRED_FIELDS = ("company", "ticker", "from", "to")
+
+
+def job_key(job: dict) -> str:
+    """
+    Identity of a job: same ticker, window and top_k is the same job.
+    """
+    return "|".join([
+        str(job["ticker"]).upper(),
+        str(job["from"]),
+        str(job["to"]),
+        str(job.get("top_k", 5)),
+    ])
+
+
+def load_jobs(path: str) -> list:
+    """
+    Read a JSONL file of {company, ticker, from, to, top_k} jobs.
+    """
+    jobs = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            job = json.loads(line)
+            missing = [k for k in REQUIRED_FIELDS if k not in job]
+            if missing:
+                raise ValueError(f"{path}:{line_no}: job is missing {', '.join(missing)}")
+            jobs.append(job)
+    return jobs
+
+
+def run_job(orchestrator, job: dict) -> dict:
+    """
+    Run the pipeline for one job dict and return the report.
+    """
+    return orchestrator.run(
+        company=job["company"],
+        ticker=job["ticker"],
+        from_date=job["from"],
+        to_date_param=job["to"],
+        top_k=int(job.get("top_k", 5))
+    )
+
+
+def build_orchestrator(retrieval_mode: str = None, hybrid: bool = None):
+    """
+    Orchestrator for a multi-threaded process (report service, job workers).
+    """
+    from src.orchestrator import Orchestrator, RETRIEVAL_MODE, HYBRID_RETRIEVAL
+
+    orchestrator = Orchestrator(
+        retrieval_mode=retrieval_mode or RETRIEVAL_MODE,
+        hybrid=HYBRID_RETRIEVAL if hybrid is None else hybrid
+    )
+    # One process, many threads: serialize access to the Chroma collections
+    orchestrator.chroma.lock = threading.Lock()
+    return orchestrator
+
+
+def warm_up():
+    """
+    Load the embedding model before the first job instead of during it.
+    """
+    try:
+        from src.ingest.embeddings import get_model
+
+        get_model()
+    except Exception as e:
+        logger.warning(f"Embedding model warm-up failed, it will load on first use: {e}")
@@ -0,0 +1,497 @@
+import argparse
+import sys
+import os
+import json
+import time
+import socket
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.analyst import AnalystAgent
+from src.job_runner import REQUIRED_FIELDS, build_orchestrator, job_key, load_jobs, run_job, warm_up
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = os.getenv("JOBS_DB", "./output/jobs.sqlite3")
+# Worker threads per `jobs.py work` process, i.e. pipelines running at once
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Failed attempts wait JOB_RETRY_BACKOFF * 2^(attempt - 1) seconds, capped at JOB_RETRY_MAX
+JOB_RETRY_BACKOFF = float(os.getenv("JOB_RETRY_BACKOFF", "30"))
+JOB_RETRY_MAX = float(os.getenv("JOB_RETRY_MAX", "600"))
+# A running job whose worker has not checked in for this long is handed to another worker
+JOB_STALE_AFTER = float(os.getenv("JOB_STALE_AFTER", "120"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+# Columns returned by status(); the job payload and report are fetched separately
+STATUS_COLUMNS = ("id", "key", "status", "priority", "attempts", "max_attempts", "error",
+                  "created_at", "started_at", "finished_at", "not_before", "worker")
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def retry_delay(attempt: int, base: float = None, cap: float = None) -> float:
+    base = JOB_RETRY_BACKOFF if base is None else base
+    cap = JOB_RETRY_MAX if cap is None else cap
+    return min(cap, base * 2 ** max(0, attempt - 1))
+
+
+class JobQueue:
+    """
+    Persistent queue of report jobs backed by SQLite, shared by any number of
+    threads and processes.
+
+    Jobs run highest priority first, then oldest first. Submitting a job whose
+    key (see job_runner.job_key) is already queued or running returns the existing
+    job instead of adding a second one. Failed attempts are retried with
+    exponential backoff up to `max_attempts`, and jobs left running by a worker
+    that stopped checking in are put back on the queue by recover_stale().
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or JOBS_DB
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT NOT NULL,
+                    job TEXT NOT NULL,
+                    priority INTEGER NOT NULL DEFAULT 0,
+                    status TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    max_attempts INTEGER NOT NULL,
+                    not_before REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    heartbeat_at REAL,
+                    worker TEXT,
+                    error TEXT,
+                    result TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_next ON jobs(status, priority DESC, id)")
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_active_key ON jobs(key) "
+                "WHERE status IN ('queued', 'running')"
+            )
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Write transaction that takes the database lock up front, so a
+        read-then-update (claim, dedupe) cannot interleave with another writer.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def submit(self, job: dict, priority: int = 0, max_attempts: int = None) -> int:
+        """
+        Queue a job dict (company, ticker, from, to, top_k) and return its id.
+        A duplicate of a queued or running job returns that job's id; a queued
+        duplicate is raised to the higher of the two priorities.
+        """
+        missing = [f for f in REQUIRED_FIELDS if not job.get(f)]
+        if missing:
+            raise ValueError(f"Job is missing {', '.join(missing)}")
+        job = dict(job, top_k=int(job.get("top_k", 5)))
+        key = job_key(job)
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, status, priority FROM jobs WHERE key = ? AND status IN (?, ?)",
+                (key, QUEUED, RUNNING)
+            ).fetchone()
+            if row is not None:
+                job_id, status, current = row
+                if status == QUEUED and priority > current:
+                    conn.execute("UPDATE jobs SET priority = ? WHERE id = ?", (priority, job_id))
+                logger.info(f"Job {key} is already {status} as #{job_id}")
+                return job_id
+            cursor = conn.execute(
+                "INSERT INTO jobs (key, job, priority, status, max_attempts, not_before, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, json.dumps(job), priority, QUEUED,
+                 max_attempts if max_attempts is not None else JOB_MAX_ATTEMPTS, now, now)
+            )
+            return cursor.lastrowid
+
+    def status(self, job_id: int) -> Optional[Dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {', '.join(STATUS_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(STATUS_COLUMNS, row)) if row else None
+
+    def result(self, job_id: int) -> Optional[Dict]:
+        """
+        The report of a finished job, or None while it has none.
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def list(self, status: str = None, limit: int = 100) -> List[Dict]:
+        query = f"SELECT {', '.join(STATUS_COLUMNS)} FROM jobs"
+        params = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        return [dict(zip(STATUS_COLUMNS, row)) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a queued job. Running jobs are left to finish.
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ? AND status = ?",
+                (CANCELLED, time.time(), job_id, QUEUED)
+            )
+        return cursor.rowcount > 0
+
+    def claim(self, worker: str) -> Optional[Dict]:
+        """
+        Take the next runnable job for `worker`: {id, job, attempts, max_attempts}, or None.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id, job, attempts, max_attempts FROM jobs WHERE status = ? AND not_before <= ? "
+                "ORDER BY priority DESC, id ASC LIMIT 1",
+                (QUEUED, now)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, job, attempts, max_attempts = row
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = ?, started_at = ?, heartbeat_at = ?, worker = ? "
+                "WHERE id = ?",
+                (RUNNING, attempts + 1, now, now, worker, job_id)
+            )
+        return {"id": job_id, "job": json.loads(job), "attempts": attempts + 1, "max_attempts": max_attempts}
+
+    def complete(self, job_id: int, worker: str, report: dict) -> bool:
+        """
+        Store the report of a run claimed by `worker`. False (and nothing
+        written) if the job was requeued and is no longer that worker's.
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, finished_at = ? "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (DONE, json.dumps(report), time.time(), job_id, RUNNING, worker)
+            )
+        if cursor.rowcount == 0:
+            logger.warning(f"Job #{job_id} is no longer held by {worker}, dropping its result")
+            return False
+        return True
+
+    def fail(self, job_id: int, worker: str, error: str, report: dict = None) -> Optional[str]:
+        """
+        Record a failed attempt by `worker`: back to the queue after a backoff
+        delay, or 'failed' once the job is out of attempts. Returns the new
+        status, or None (nothing written) if the job is no longer that worker's.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND worker = ?",
+                (job_id, RUNNING, worker)
+            ).fetchone()
+            if row is None:
+                logger.warning(f"Job #{job_id} is no longer held by {worker}, dropping its failure")
+                return None
+            attempts, max_attempts = row
+            result = json.dumps(report) if report is not None else None
+            if attempts < max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, result = ?, not_before = ?, worker = NULL "
+                    "WHERE id = ? AND status = ? AND worker = ?",
+                    (QUEUED, error, result, now + retry_delay(attempts), job_id, RUNNING, worker)
+                )
+                return QUEUED
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, result = ?, finished_at = ? "
+                "WHERE id = ? AND status = ? AND worker = ?",
+                (FAILED, error, result, now, job_id, RUNNING, worker)
+            )
+            return FAILED
+
+    def heartbeat(self, process: str):
+        """
+        Mark every job running under one process's workers ("<process>:<n>") as alive.
+        """
+        pattern = process.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + ":%"
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = ? AND worker LIKE ? ESCAPE '\\'",
+                (time.time(), RUNNING, pattern)
+            )
+
+    def recover_stale(self, stale_after: float = None) -> int:
+        """
+        Requeue running jobs whose worker has not checked in for `stale_after`
+        seconds (e.g. the process was killed). A job that has already used all
+        its attempts is marked failed instead. Returns the number requeued.
+        """
+        stale_after = JOB_STALE_AFTER if stale_after is None else stale_after
+        now = time.time()
+        cutoff = now - stale_after
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = 'worker lost', finished_at = ? "
+                "WHERE status = ? AND heartbeat_at < ? AND attempts >= max_attempts",
+                (FAILED, now, RUNNING, cutoff)
+            )
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = 'worker lost', worker = NULL, not_before = ? "
+                "WHERE status = ? AND heartbeat_at < ?",
+                (QUEUED, now, RUNNING, cutoff)
+            )
+        if cursor.rowcount:
+            logger.warning(f"Requeued {cursor.rowcount} job(s) from workers that stopped responding")
+        return cursor.rowcount
+
+
+class JobWorkers:
+    """
+    Pool of worker threads that take jobs from a JobQueue and run them through
+    one shared, warm Orchestrator (as the report service does).
+    """
+
+    def __init__(self, queue: JobQueue, orchestrator=None, workers: int = JOB_WORKERS,
+                 poll_interval: float = JOB_POLL_INTERVAL, stale_after: float = JOB_STALE_AFTER):
+        self.queue = queue
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.name = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.stats = {"done": 0, "retried": 0, "failed": 0}
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        if self.orchestrator is None:
+            self.orchestrator = build_orchestrator()
+        self._stop.clear()
+        self.queue.recover_stale(self.stale_after)
+        self._threads = [
+            threading.Thread(target=self._work, args=(f"{self.name}:{i}",), daemon=True, name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._threads.append(threading.Thread(target=self._keepalive, daemon=True, name="job-heartbeat"))
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Started {self.workers} job worker(s) on {self.queue.path}")
+
+    def stop(self, timeout: float = None):
+        """
+        Stop taking new jobs and wait for the running ones to finish.
+        """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def idle(self) -> bool:
+        with self._lock:
+            return self._busy == 0
+
+    def drain(self, check_interval: float = None):
+        """
+        Run until no job is queued or running (including retries waiting out their backoff).
+        """
+        self.start()
+        try:
+            while True:
+                counts = self.queue.counts()
+                if not counts.get(QUEUED) and not counts.get(RUNNING) and self.idle():
+                    break
+                time.sleep(check_interval if check_interval is not None else self.poll_interval)
+        finally:
+            self.stop()
+
+    def _keepalive(self):
+        interval = max(self.stale_after / 3, 0.05)
+        while not self._stop.wait(interval):
+            try:
+                self.queue.heartbeat(self.name)
+                self.queue.recover_stale(self.stale_after)
+            except sqlite3.Error as e:
+                logger.warning(f"Job heartbeat failed: {e}")
+
+    def _work(self, worker: str):
+        while not self._stop.is_set():
+            try:
+                claimed = self.queue.claim(worker)
+            except sqlite3.Error as e:
+                logger.warning(f"Could not claim a job: {e}")
+                claimed = None
+            if claimed is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            with self._lock:
+                self._busy += 1
+            try:
+                self._execute(claimed, worker)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+    def _execute(self, claimed: dict, worker: str):
+        job_id, job = claimed["id"], claimed["job"]
+        key = job_key(job)
+        logger.info(f"Job #{job_id} {key}: attempt {claimed['attempts']}/{claimed['max_attempts']}")
+        report = None
+        try:
+            report = run_job(self.orchestrator, job)
+            error = "analysis fell back" if AnalystAgent.is_fallback(report) else None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if error is None:
+            outcome = DONE if self.queue.complete(job_id, worker, report) else None
+        else:
+            outcome = self.queue.fail(job_id, worker, error, report)
+            if outcome is not None:
+                logger.warning(f"Job #{job_id} {key} failed ({error}), now {outcome}")
+        if outcome is None:
+            # Requeued as stale while running; the run that holds it now records the outcome
+            return
+        with self._lock:
+            self.stats[{DONE: "done", QUEUED: "retried"}.get(outcome, "failed")] += 1
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Return the process-wide job queue at JOBS_DB.
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue()
+    return _queue
+
+
+def main():
+    """
+    Queue report jobs and run workers that process them.
+    """
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Persistent report job queue")
+    parser.add_argument("--db", default=JOBS_DB, help="SQLite file holding the queue")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Queue one job, or every job in a JSONL file")
+    submit.add_argument("--company")
+    submit.add_argument("--ticker")
+    submit.add_argument("--from", dest="from_date")
+    submit.add_argument("--to", dest="to_date")
+    submit.add_argument("--top-k", type=int, default=5)
+    submit.add_argument("--jobs", help="JSONL file of {company, ticker, from, to, top_k} jobs")
+    submit.add_argument("--priority", type=int, default=0, help="Higher runs first")
+    submit.add_argument("--max-attempts", type=int, default=JOB_MAX_ATTEMPTS)
+
+    status = commands.add_parser("status", help="Show one job, or recent jobs")
+    status.add_argument("id", type=int, nargs="?")
+    status.add_argument("--status", choices=[QUEUED, RUNNING, DONE, FAILED, CANCELLED])
+    status.add_argument("--limit", type=int, default=20)
+
+    result = commands.add_parser("result", help="Print a finished job's report")
+    result.add_argument("id", type=int)
+
+    cancel = commands.add_parser("cancel", help="Cancel a queued job")
+    cancel.add_argument("id", type=int)
+
+    work = commands.add_parser("work", help="Process jobs")
+    work.add_argument("--workers", type=int, default=JOB_WORKERS, help="Pipelines to run at once")
+    work.add_argument("--drain", action="store_true", help="Exit once the queue is empty")
+
+    args = parser.parse_args()
+    queue = JobQueue(args.db)
+
+    if args.command == "submit":
+        if args.jobs:
+            jobs = load_jobs(args.jobs)
+        else:
+            jobs = [{"company": args.company, "ticker": args.ticker, "from": args.from_date,
+                     "to": args.to_date, "top_k": args.top_k}]
+        for job in jobs:
+            job_id = queue.submit(job, priority=args.priority, max_attempts=args.max_attempts)
+            print(f"{job_id}\t{job_key(job)}")
+    elif args.command == "status":
+        if args.id is not None:
+            info = queue.status(args.id)
+            if info is None:
+                sys.exit(f"No job #{args.id}")
+            print(json.dumps(info, indent=2))
+        else:
+            print(json.dumps({"counts": queue.counts(), "jobs": queue.list(args.status, args.limit)}, indent=2))
+    elif args.command == "result":
+        report = queue.result(args.id)
+        if report is None:
+            sys.exit(f"Job #{args.id} has no report yet ({(queue.status(args.id) or {}).get('status', 'unknown')})")
+        print(json.dumps(report, indent=2))
+    elif args.command == "cancel":
+        if not queue.cancel(args.id):
+            sys.exit(f"Job #{args.id} is not queued")
+    elif args.command == "work":
+        workers = JobWorkers(queue, workers=args.workers)
+        warm_up()
+        if args.drain:
+            workers.drain()
+            print(json.dumps(workers.stats, indent=2))
+            return
+        workers.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            logger.info("Stopping workers after their current jobs...")
+            workers.stop()
+
+
+if __name__ == "__main__":
+    main()
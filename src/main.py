@@ -7,7 +7,7 @@ from dotenv import load_dotenv
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.orchestrator import Orchestrator
+from src.orchestrator import Orchestrator, RETRIEVAL_MODE, HYBRID_RETRIEVAL
 
 def main():
     load_dotenv()
@@ -18,10 +18,14 @@ def main():
     parser.add_argument("--from-date", required=True, help="Start Date (YYYY-MM-DD)")
     parser.add_argument("--to-date", required=True, help="End Date (YYYY-MM-DD)")
     parser.add_argument("--top-k", type=int, default=5, help="Number of docs to retrieve")
+    parser.add_argument("--retrieval", choices=["single", "aspects"], default=RETRIEVAL_MODE,
+                        help="Single catch-all query, or per-aspect queries merged for diversity")
+    parser.add_argument("--hybrid", action="store_true", default=HYBRID_RETRIEVAL,
+                        help="Fuse keyword (BM25) and vector search results")
     
     args = parser.parse_args()
     
-    orchestrator = Orchestrator()
+    orchestrator = Orchestrator(retrieval_mode=args.retrieval, hybrid=args.hybrid)
     report = orchestrator.run(
         company=args.company,
         ticker=args.ticker,
@@ -1,39 +1,53 @@
 import logging
 import json
 import os
+import time
 from datetime import datetime, timezone
 
+from src import telemetry
 from src.agents.data_collector import DataCollector
 from src.ingest.chroma_ingest import ChromaIngest
 from src.agents.analyst import AnalystAgent
 
 logger = logging.getLogger(__name__)
 
+# "single": one catch-all query; "aspects": one query per aspect merged with MMR
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "single")
+# Fuse BM25 with vector search in single-query mode
+HYBRID_RETRIEVAL = os.getenv("HYBRID_RETRIEVAL", "0") == "1"
+ASPECT_QUERIES = {
+    "performance": "Latest financial performance, earnings, revenue and margins of {company}",
+    "strategy": "Strategic moves, products, partnerships and acquisitions by {company}",
+    "risks": "Risks, regulatory issues, lawsuits and competitive threats facing {company}",
+    "outlook": "Market outlook, guidance and analyst expectations for {company}",
+}
+
 class Orchestrator:
-    def __init__(self):
+    def __init__(self, retrieval_mode: str = RETRIEVAL_MODE, hybrid: bool = HYBRID_RETRIEVAL, chroma=None):
+        if retrieval_mode not in ("single", "aspects"):
+            raise ValueError(f"Unknown retrieval mode '{retrieval_mode}'")
         self.collector = DataCollector()
-        self.chroma = ChromaIngest()
+        # `chroma` lets several processes share one store owned elsewhere (see batch.ChromaManager)
+        self.chroma = chroma if chroma is not None else ChromaIngest()
         self.analyst = AnalystAgent()
+        self.retrieval_mode = retrieval_mode
+        self.hybrid = hybrid
 
-    def run(self, company: str, ticker: str, from_date: str, to_date_param: str, top_k: int = 5):
+    def _prepare(self, company: str, ticker: str, from_date: str, to_date_param: str, top_k: int):
         """
-        Run the full pipeline:
-        1. Collect Data
-        2. Ingest
-        3. Retrieve
-        4. Analyze
+        Phases 1-3: collect, ingest and retrieve.
+        Returns (price summary, retrieved documents, retrieval query).
         """
-        logger.info(f"--- Starting Pipeline for {company} ({ticker}) ---")
-        
         # 1. Collect
         logger.info("Phase 1: Data Collection")
         # Ensure dates are strings YYYY-MM-DD
-        data = self.collector.collect(
-            company_name=company,
-            ticker=ticker,
-            from_date=from_date,
-            to_date=to_date_param
-        )
+        with telemetry.span("collect"):
+            data = self.collector.collect(
+                company_name=company,
+                ticker=ticker,
+                from_date=from_date,
+                to_date=to_date_param
+            )
         articles = data.get("articles", [])
         prices = data.get("prices", {})
         
@@ -41,30 +55,96 @@ class Orchestrator:
             logger.warning("No articles found. Proceeding with caution.")
         else:
             logger.info(f"Collected {len(articles)} articles.")
+        telemetry.count("articles.collected", len(articles))
 
         # 2. Ingest
         logger.info("Phase 2: Ingestion")
-        self.chroma.ingest_articles(ticker, articles)
+        with telemetry.span("ingest"):
+            stats = self.chroma.ingest_articles(ticker, articles)
+        for key, value in (stats or {}).items():
+            telemetry.count(f"ingest.{key}", value)
 
         # 3. Retrieve
         logger.info("Phase 3: Retrieval")
         # Query for general company news + specific analysis context
         query_text = f"Latest financial performance, strategic moves, risks, and market outlook for {company}"
-        retrieved_docs = self.chroma.query(ticker, query_text, top_k=top_k)
-        
-        # 4. Analyze
-        logger.info("Phase 4: Analysis")
-        report = self.analyst.analyze(
-            company=company,
-            price_summary=prices,
-            doc_snippets=retrieved_docs
-        )
-        
-        # Save run artifact (optional debug)
-        self._save_result(ticker, report)
-        
+        with telemetry.span("retrieve", mode=self.retrieval_mode):
+            if self.retrieval_mode == "aspects":
+                aspect_queries = {name: q.format(company=company) for name, q in ASPECT_QUERIES.items()}
+                retrieved_docs = self.chroma.query_aspects(
+                    ticker, aspect_queries, top_k=top_k, from_date=from_date, to_date=to_date_param
+                )
+            else:
+                retrieved_docs = self.chroma.query(
+                    ticker, query_text, top_k=top_k, from_date=from_date, to_date=to_date_param, hybrid=self.hybrid
+                )
+        telemetry.count("docs.retrieved", len(retrieved_docs))
+        return prices, retrieved_docs, query_text
+
+    def run(self, company: str, ticker: str, from_date: str, to_date_param: str, top_k: int = 5):
+        """
+        Run the full pipeline:
+        1. Collect Data
+        2. Ingest
+        3. Retrieve
+        4. Analyze
+        """
+        logger.info(f"--- Starting Pipeline for {company} ({ticker}) ---")
+        with telemetry.run("pipeline", ticker=ticker) as recorder:
+            prices, retrieved_docs, query_text = self._prepare(company, ticker, from_date, to_date_param, top_k)
+
+            # 4. Analyze
+            logger.info("Phase 4: Analysis")
+            with telemetry.span("analyze"):
+                report = self.analyst.analyze(
+                    company=company,
+                    price_summary=prices,
+                    doc_snippets=retrieved_docs,
+                    query=query_text
+                )
+            self._attach_telemetry(report, recorder)
+
+            # Save run artifact (optional debug)
+            self._save_result(ticker, report)
+
         return report
 
+    def run_stream(self, company: str, ticker: str, from_date: str, to_date_param: str, top_k: int = 5):
+        """
+        Same pipeline as run, but the analysis is streamed: yields the events of
+        AnalystAgent.analyze_stream, ending with the final report.
+        """
+        # The run's telemetry context lives across yields, so keep it out of the consumer's
+        return telemetry.isolate(self._run_stream(company, ticker, from_date, to_date_param, top_k))
+
+    def _run_stream(self, company: str, ticker: str, from_date: str, to_date_param: str, top_k: int):
+        logger.info(f"--- Starting Streaming Pipeline for {company} ({ticker}) ---")
+        with telemetry.run("pipeline", ticker=ticker, stream=True) as recorder:
+            prices, retrieved_docs, query_text = self._prepare(company, ticker, from_date, to_date_param, top_k)
+
+            # 4. Analyze
+            logger.info("Phase 4: Analysis (streaming)")
+            start = time.perf_counter()
+            for event in self.analyst.analyze_stream(
+                company=company,
+                price_summary=prices,
+                doc_snippets=retrieved_docs,
+                query=query_text
+            ):
+                if event["type"] == "report":
+                    telemetry.record_span("analyze", (time.perf_counter() - start) * 1000)
+                    self._attach_telemetry(event["report"], recorder)
+                    self._save_result(ticker, event["report"])
+                yield event
+
+    @staticmethod
+    def _attach_telemetry(report: dict, recorder):
+        """
+        Add the run's phase durations and counters to the report when TELEMETRY_REPORT=1.
+        """
+        if recorder is not None and telemetry.TELEMETRY_IN_REPORT:
+            report["telemetry"] = recorder.summary()
+
     def _save_result(self, ticker, report):
         os.makedirs("output", exist_ok=True)
         fname = f"output/report_{ticker}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
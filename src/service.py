@@ -0,0 +1,223 @@
+import argparse
+import sys
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import parse_qsl, urlsplit
+from dotenv import load_dotenv
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.agents.analyst import AnalystAgent
+from src.job_runner import REQUIRED_FIELDS, build_orchestrator, job_key, run_job, warm_up
+
+logger = logging.getLogger(__name__)
+
+# Finished reports are served from memory for this many seconds
+SERVICE_RESULT_TTL = int(os.getenv("SERVICE_RESULT_TTL", "300"))
+# Most recent reports kept in memory
+SERVICE_CACHE_SIZE = int(os.getenv("SERVICE_CACHE_SIZE", "256"))
+# Pipelines allowed to run at the same time; further distinct requests wait
+SERVICE_MAX_CONCURRENT = int(os.getenv("SERVICE_MAX_CONCURRENT", "4"))
+
+
+class ReportService:
+    """
+    Long-lived wrapper around one Orchestrator, so the embedding model, Chroma
+    client and HTTP pools stay warm between requests.
+
+    Identical requests (same ticker, window and top_k, see job_runner.job_key) that
+    arrive while one is running wait for that run instead of starting their
+    own, and finished reports are served from a small in-memory TTL/LRU cache.
+    """
+
+    def __init__(self, orchestrator=None, result_ttl: int = SERVICE_RESULT_TTL,
+                 cache_size: int = SERVICE_CACHE_SIZE, max_concurrent: int = SERVICE_MAX_CONCURRENT):
+        self.orchestrator = orchestrator if orchestrator is not None else build_orchestrator()
+        self.result_ttl = result_ttl
+        self.cache_size = cache_size
+        self.started = time.time()
+        self.stats = {"computed": 0, "memory": 0, "coalesced": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._inflight: Dict[str, Future] = {}
+        self._results: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+    def _recent(self, key: str):
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        stored_at, report = entry
+        if time.time() - stored_at > self.result_ttl:
+            del self._results[key]
+            return None
+        self._results.move_to_end(key)
+        return report
+
+    def _remember(self, key: str, report: dict):
+        self._results[key] = (time.time(), report)
+        self._results.move_to_end(key)
+        while len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+    def get_report(self, job: dict) -> Tuple[dict, str]:
+        """
+        Report for a job dict (company, ticker, from, to, top_k).
+        Returns (report, source) with source 'memory', 'coalesced' or 'computed'.
+        """
+        key = job_key(job)
+        with self._lock:
+            report = self._recent(key)
+            if report is not None:
+                self.stats["memory"] += 1
+                return report, "memory"
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            logger.info(f"Joining in-flight run for {key}")
+            return future.result(), "coalesced"
+
+        try:
+            with self._slots:
+                report = run_job(self.orchestrator, job)
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self.stats["errors"] += 1
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # Failed analyses are not worth repeating for the whole TTL
+            if not AnalystAgent.is_fallback(report):
+                self._remember(key, report)
+            self._inflight.pop(key, None)
+            self.stats["computed"] += 1
+        future.set_result(report)
+        return report, "computed"
+
+    def health(self) -> dict:
+        with self._lock:
+            return {
+                "status": "ok",
+                "uptime_s": round(time.time() - self.started, 1),
+                "inflight": len(self._inflight),
+                "cached_reports": len(self._results),
+                "requests": dict(self.stats),
+            }
+
+
+class ReportHandler(BaseHTTPRequestHandler):
+    """
+    GET /report?company=..&ticker=..&from=..&to=..[&top_k=..], POST /report with
+    the same fields as JSON, and GET /healthz.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/healthz":
+            return self._send_json(200, self.server.service.health())
+        if parts.path == "/report":
+            return self._report(dict(parse_qsl(parts.query)))
+        self._send_json(404, {"error": f"Unknown path {parts.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if urlsplit(self.path).path != "/report":
+            self.rfile.read(length)
+            return self._send_json(404, {"error": f"Unknown path {self.path}"})
+        try:
+            job = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send_json(400, {"error": "Body must be a JSON object"})
+        self._report(job if isinstance(job, dict) else {})
+
+    def _report(self, job: dict):
+        missing = [f for f in REQUIRED_FIELDS if not job.get(f)]
+        if missing:
+            return self._send_json(400, {"error": f"Missing fields: {', '.join(missing)}"})
+        try:
+            job["top_k"] = int(job.get("top_k", 5))
+        except (TypeError, ValueError):
+            return self._send_json(400, {"error": "top_k must be an integer"})
+
+        start = time.perf_counter()
+        try:
+            report, source = self.server.service.get_report(job)
+        except Exception as e:
+            logger.error(f"Report for {job_key(job)} failed: {e}")
+            return self._send_json(500, {"error": str(e)})
+        self._send_json(200, {
+            "key": job_key(job),
+            "source": source,
+            "elapsed_s": round(time.perf_counter() - start, 3),
+            "report": report,
+        })
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info(f"{self.address_string()} {format % args}")
+
+
+def make_server(service: ReportService, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ReportHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def main():
+    """
+    Serve reports over HTTP from one warm process.
+    """
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+
+    from src.orchestrator import RETRIEVAL_MODE, HYBRID_RETRIEVAL
+
+    parser = argparse.ArgumentParser(description="Report service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--retrieval", choices=["single", "aspects"], default=RETRIEVAL_MODE)
+    parser.add_argument("--hybrid", action="store_true", default=HYBRID_RETRIEVAL)
+    parser.add_argument("--max-concurrent", type=int, default=SERVICE_MAX_CONCURRENT,
+                        help="Pipelines allowed to run at once")
+    parser.add_argument("--no-warm", action="store_true", help="Skip loading the embedding model at startup")
+    args = parser.parse_args()
+
+    service = ReportService(build_orchestrator(args.retrieval, args.hybrid), max_concurrent=args.max_concurrent)
+    if not args.no_warm:
+        warm_up()
+
+    server = make_server(service, args.host, args.port)
+    logger.info(f"Serving reports on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
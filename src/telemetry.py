@@ -0,0 +1,252 @@
+import os
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Off by default; when off, span() and count() return after one ContextVar lookup
+TELEMETRY_ENABLED = os.getenv("TELEMETRY", "0") == "1"
+# Attach a 'telemetry' block (phase durations and counters) to saved reports
+TELEMETRY_IN_REPORT = os.getenv("TELEMETRY_REPORT", "0") == "1"
+# Where finished runs are exported: a .jsonl file gets one line per run,
+# anything else is rewritten as Prometheus text with process-wide totals
+TELEMETRY_EXPORT = os.getenv("TELEMETRY_EXPORT", "")
+METRIC_PREFIX = "finintel"
+
+_recorder: ContextVar[Optional["Recorder"]] = ContextVar("telemetry_recorder", default=None)
+_parent: ContextVar[Optional[str]] = ContextVar("telemetry_parent", default=None)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Recorder:
+    """
+    Spans and counters collected during one pipeline run.
+    Shared by every thread that runs in a copy of the run's context.
+    """
+
+    def __init__(self, name: str, labels: Dict[str, str] = None):
+        self.name = name
+        self.labels = dict(labels or {})
+        self.started = time.time()
+        self.spans: List[Dict] = []
+        self.counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add_span(self, span: Dict):
+        with self._lock:
+            self.spans.append(span)
+
+    def add(self, name: str, value: float):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def summary(self) -> Dict:
+        """
+        Compact view for reports: total milliseconds per span name plus counters.
+        """
+        durations = {}
+        with self._lock:
+            for span in self.spans:
+                durations[span["name"]] = round(durations.get(span["name"], 0.0) + span["duration_ms"], 3)
+            counters = dict(self.counters)
+        return {"spans_ms": durations, "counters": counters}
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "run": self.name,
+                "labels": self.labels,
+                "started": self.started,
+                "spans": list(self.spans),
+                "counters": dict(self.counters),
+            }
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "attrs", "start", "token")
+
+    def __init__(self, recorder: Recorder, name: str, attrs: Dict):
+        self.recorder = recorder
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.token = _parent.set(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = (time.perf_counter() - self.start) * 1000
+        _parent.reset(self.token)
+        span = {"name": self.name, "parent": _parent.get(), "duration_ms": round(duration, 3)}
+        if self.attrs:
+            span["attrs"] = self.attrs
+        if exc_type is not None:
+            span["error"] = exc_type.__name__
+        self.recorder.add_span(span)
+        return False
+
+
+def span(name: str, **attrs):
+    """
+    Context manager timing a block under the active run; a shared no-op outside one.
+    """
+    recorder = _recorder.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return _Span(recorder, name, attrs)
+
+
+def count(name: str, value: float = 1):
+    """
+    Add to a counter of the active run (no-op outside one).
+    """
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(name, value)
+
+
+def record_span(name: str, duration_ms: float, **attrs):
+    """
+    Record an already measured duration, for work that cannot sit inside a
+    `with` block (e.g. spread across a generator's yields).
+    """
+    recorder = _recorder.get()
+    if recorder is not None:
+        entry = {"name": name, "parent": _parent.get(), "duration_ms": round(duration_ms, 3)}
+        if attrs:
+            entry["attrs"] = attrs
+        recorder.add_span(entry)
+
+
+def current() -> Optional[Recorder]:
+    return _recorder.get()
+
+
+def bind(fn):
+    """
+    Callable that runs `fn` in a copy of the caller's context, so spans and
+    counters from pool threads land in the caller's run. Call once per submit.
+    """
+    if _recorder.get() is None:
+        return fn
+    ctx = copy_context()
+    return lambda *args, **kwargs: ctx.run(fn, *args, **kwargs)
+
+
+def isolate(generator):
+    """
+    Iterate `generator` in its own copy of the caller's context. A run() or
+    span() held open across its yields then stays inside that copy instead of
+    leaking into the consumer, even if the consumer stops early.
+    """
+    ctx = copy_context()
+    try:
+        while True:
+            try:
+                item = ctx.run(next, generator)
+            except StopIteration:
+                return
+            yield item
+    finally:
+        ctx.run(generator.close)
+
+
+# Process-wide totals for the Prometheus exporter: (family, sample suffix, labels) -> value
+_totals: Dict[Tuple[str, str, Tuple], float] = {}
+_totals_lock = threading.Lock()
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def _accumulate(recorder: Recorder):
+    def add(key, value):
+        _totals[key] = _totals.get(key, 0) + value
+
+    with _totals_lock:
+        add(("runs", "_total", ()), 1)
+        for name, value in recorder.counters.items():
+            add((_metric_name(name), "_total", ()), value)
+        for span_ in recorder.spans:
+            labels = (("span", span_["name"]),)
+            add(("span_seconds", "_sum", labels), span_["duration_ms"] / 1000)
+            add(("span_seconds", "_count", labels), 1)
+
+
+def prometheus_text() -> str:
+    """
+    Totals for all finished runs in Prometheus text exposition format.
+    """
+    with _totals_lock:
+        items = sorted(_totals.items())
+    lines = []
+    typed = set()
+    for (family, suffix, labels), value in items:
+        name = f"{METRIC_PREFIX}_{family}"
+        if name not in typed:
+            lines.append(f"# TYPE {name} {'summary' if family == 'span_seconds' else 'counter'}")
+            typed.add(name)
+        label_text = "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}" if labels else ""
+        lines.append(f"{name}{suffix}{label_text} {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def export(recorder: Recorder, path: str = None):
+    """
+    Write a finished run to `path` (default TELEMETRY_EXPORT): JSON lines for
+    *.jsonl, otherwise Prometheus text with the process-wide totals.
+    """
+    path = path or TELEMETRY_EXPORT
+    if not path:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".jsonl"):
+        with open(path, "a") as f:
+            f.write(json.dumps(recorder.to_dict()) + "\n")
+    else:
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(prometheus_text())
+        os.replace(tmp, path)
+
+
+@contextmanager
+def run(name: str, enabled: bool = None, **labels):
+    """
+    Collect spans and counters for one pipeline run. Yields the Recorder, or
+    None when telemetry is disabled. The run is exported when it ends.
+    """
+    if not (TELEMETRY_ENABLED if enabled is None else enabled):
+        yield None
+        return
+    recorder = Recorder(name, labels)
+    token = _recorder.set(recorder)
+    try:
+        with span(name):
+            yield recorder
+    finally:
+        _recorder.reset(token)
+        _accumulate(recorder)
+        try:
+            export(recorder)
+        except OSError as e:
+            logger.warning(f"Telemetry export failed: {e}")
@@ -0,0 +1,33 @@
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Tuple
+
+
+def to_timestamp(value: str) -> Optional[int]:
+    """
+    UNIX seconds for an ISO 8601 string ('Z' suffix allowed, naive means UTC),
+    or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def day_range(from_date: str = None, to_date: str = None) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Inclusive UNIX-second bounds for a run's date window.
+    Plain 'YYYY-MM-DD' dates cover the whole UTC day; full timestamps are used as-is.
+    """
+    start = end = None
+    if from_date:
+        start = to_timestamp(from_date)
+    if to_date:
+        end = to_timestamp(to_date)
+        if end is not None and "T" not in to_date:
+            end += int(timedelta(days=1).total_seconds()) - 1
+    return start, end
@@ -0,0 +1,57 @@
+import re
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ocid", "cmpid",
+    "ref", "ref_src", "src", "smid", "guccounter", "guce_referrer", "guce_referrer_sig",
+    "yptr", "ncid", "soc_src", "soc_trk", "__source", "taid", "mod", "feedtype",
+}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize an article URL so the same page always maps to the same string:
+    lowercase scheme/host without 'www.', default ports, fragments, tracking
+    params and trailing slashes removed, remaining query params sorted.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or "http").lower()
+    if scheme == "http":
+        # http and https copies of a page are the same article
+        scheme = "https"
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def _normalize_text(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "")).strip().lower()
+
+
+def make_article_id(url: str, title: str = "", text: str = "") -> str:
+    """
+    Deterministic article ID.
+    Derived from the canonical URL when there is one, so a re-fetched article
+    with edited text keeps its ID and is updated in place; otherwise derived
+    from the normalized title and text.
+    """
+    canonical = canonicalize_url(url)
+    if canonical:
+        basis = f"url:{canonical}"
+    else:
+        basis = f"content:{_normalize_text(title)}\n{_normalize_text(text)}"
+    return hashlib.sha1(basis.encode("utf-8")).hexdigest()
@@ -0,0 +1,75 @@
+import json
+from typing import List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """
+    Parse a JSON object that arrives in chunks and report each top-level
+    member as soon as its value is complete.
+
+    Text before the opening brace (e.g. a model preamble) is ignored. Only
+    complete members are decoded, so partial strings are never surfaced.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, object]]:
+        """
+        Consume the next chunk; returns the (key, value) members it completed.
+        """
+        members = []
+        if self.done or not chunk:
+            return members
+        self._buffer += chunk
+        buf = self._buffer
+        for i in range(self._pos, len(buf)):
+            c = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                continue
+            if self._depth == 0 and c != "{":
+                continue  # Preamble before the object
+            if c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = i + 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(buf[self._member_start:i], members)
+                    self.done = True
+                    self._pos = i + 1
+                    return members
+            elif c == "," and self._depth == 1:
+                self._emit(buf[self._member_start:i], members)
+                self._member_start = i + 1
+        self._pos = len(buf)
+        return members
+
+    @staticmethod
+    def _emit(segment: str, members: list):
+        segment = segment.strip()
+        if not segment:
+            return
+        members.extend(json.loads("{" + segment + "}").items())
+
+    @property
+    def text(self) -> str:
+        """
+        Everything received so far.
+        """
+        return self._buffer
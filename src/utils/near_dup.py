@@ -0,0 +1,88 @@
+import re
+import zlib
+from typing import List, Tuple
+
+import numpy as np
+
+# Prime just above 2**32, so (a * h + b) fits in uint64 for 32-bit shingle hashes
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(np.iinfo(np.uint64).max)
+
+
+def _normalize(text: str) -> str:
+    text = re.sub(r"[^a-z0-9 ]+", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _shingle_hashes(text: str, k: int) -> np.ndarray:
+    norm = _normalize(text)
+    if len(norm) <= k:
+        shingles = {norm} if norm else set()
+    else:
+        shingles = {norm[i:i + k] for i in range(len(norm) - k + 1)}
+    return np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    LSH (bands, rows) with bands * rows == num_perm whose S-curve midpoint,
+    (1 / bands) ** (1 / rows), sits just below the threshold so true
+    near-duplicates become candidates with high probability.
+    """
+    target = max(0.05, threshold - 0.1)
+    options = [(b, num_perm // b) for b in range(1, num_perm + 1) if num_perm % b == 0]
+    return min(options, key=lambda br: abs((1 / br[0]) ** (1 / br[1]) - target))
+
+
+class NearDuplicateDetector:
+    """
+    MinHash + LSH near-duplicate detection over character shingles.
+
+    Each text gets a `num_perm`-value MinHash signature; signatures are split
+    into bands and only texts sharing a band bucket are compared, so the cost
+    grows roughly linearly with the number of texts. A pair counts as a
+    duplicate when its estimated Jaccard similarity reaches `threshold`.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        sigs = np.full((len(texts), self.num_perm), _MAX_HASH, dtype=np.uint64)
+        for i, text in enumerate(texts):
+            hashes = _shingle_hashes(text, self.shingle_size)
+            if len(hashes):
+                sigs[i] = ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+        return sigs
+
+    def duplicate_mask(self, texts: List[str]) -> np.ndarray:
+        """
+        Boolean mask, True for texts that near-duplicate an earlier kept text.
+        """
+        sigs = self.signatures(texts)
+        empty = (sigs == _MAX_HASH).all(axis=1)
+        buckets = [dict() for _ in range(self.bands)]
+        is_dup = np.zeros(len(texts), dtype=bool)
+
+        for i in range(len(texts)):
+            if empty[i]:
+                continue
+            band_keys = [sigs[i, b * self.rows:(b + 1) * self.rows].tobytes() for b in range(self.bands)]
+            candidates = set()
+            for b, key in enumerate(band_keys):
+                candidates.update(buckets[b].get(key, ()))
+            if candidates:
+                cand = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+                similarity = (sigs[cand] == sigs[i]).mean(axis=1)
+                if (similarity >= self.threshold).any():
+                    is_dup[i] = True
+                    continue
+            for b, key in enumerate(band_keys):
+                buckets[b].setdefault(key, []).append(i)
+        return is_dup
@@ -1,26 +1,79 @@
-from jsonschema import validate, ValidationError
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from .schemas import ARTICLE_SCHEMA, ANALYST_OUTPUT_SCHEMA
 import logging
 
 logger = logging.getLogger(__name__)
 
+SCHEMAS = {
+    "article": ARTICLE_SCHEMA,
+    "analyst_output": ANALYST_OUTPUT_SCHEMA,
+}
+
+@lru_cache(maxsize=None)
+def get_validator(name: str):
+    """
+    Compiled validator for a named schema; the schema itself is checked once.
+    Same semantics as jsonschema.validate (no format checking).
+    """
+    from jsonschema.validators import validator_for
+
+    schema = SCHEMAS[name]
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+def _error_key(error) -> str:
+    """
+    Short, instance-independent description used to group failures.
+    """
+    if error.validator == "required":
+        return error.message
+    path = "/".join(str(p) for p in error.absolute_path) or "<root>"
+    return f"{path}: {error.validator}"
+
 def validate_article(data):
     """
     Validate an article object against ARTICLE_SCHEMA.
     """
+    from jsonschema import ValidationError
+
     try:
-        validate(instance=data, schema=ARTICLE_SCHEMA)
+        get_validator("article").validate(data)
         return True
     except ValidationError as e:
         logger.error(f"Article validation failed: {e.message}")
         raise
 
+def validate_articles(items: List[Dict]) -> Tuple[List[Dict], Dict]:
+    """
+    Validate a list of articles in one pass.
+    Returns (valid items, summary) where summary holds 'total', 'invalid' and
+    'errors' (failure description -> count), logged as a single line.
+    """
+    validator = get_validator("article")
+    valid = []
+    errors = {}
+    for item in items:
+        if validator.is_valid(item):
+            valid.append(item)
+            continue
+        for key in {_error_key(e) for e in validator.iter_errors(item)}:
+            errors[key] = errors.get(key, 0) + 1
+
+    summary = {"total": len(items), "invalid": len(items) - len(valid), "errors": errors}
+    if errors:
+        logger.warning(f"{summary['invalid']}/{summary['total']} articles failed validation: {errors}")
+    return valid, summary
+
 def validate_analyst_output(data):
     """
     Validate analyst output against ANALYST_OUTPUT_SCHEMA.
     """
+    from jsonschema import ValidationError
+
     try:
-        validate(instance=data, schema=ANALYST_OUTPUT_SCHEMA)
+        get_validator("analyst_output").validate(data)
         return True
     except ValidationError as e:
         logger.error(f"Analyst output validation failed: {e.message}")
@@ -9,22 +9,55 @@ from dotenv import load_dotenv
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.agents.analyst import AnalystAgent
+from src.orchestrator import Orchestrator
+
 # Setup
 load_dotenv()
 logging.basicConfig(level=logging.INFO)
 st.set_page_config(page_title="Company Intelligence Agent", layout="wide")
 
-import streamlit as st
-import sys
-import os
-import json
-import logging
-from datetime import datetime, timedelta
+# How long a generated report is served from memory (seconds)
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "3600"))
+
+
+@st.cache_resource(show_spinner="Initializing agents...")
+def get_orchestrator():
+    """
+    One Orchestrator (Chroma client, API clients, embedding model) per server
+    process, shared across reruns and sessions.
+    """
+    return Orchestrator()
+
+
+class FallbackReport(Exception):
+    """
+    Raised instead of returning a failed analysis, so st.cache_data does not keep it.
+    """
+
+    def __init__(self, report: dict):
+        super().__init__(report.get("summary", "Analysis failed"))
+        self.report = report
+
+
+@st.cache_data(ttl=REPORT_CACHE_TTL, max_entries=200, show_spinner=False)
+def build_report(company: str, ticker: str, from_date: str, to_date: str, top_k: int, refresh_token: int = 0):
+    """
+    Memoized report for a (company, ticker, date range, top_k) request.
+    Bumping `refresh_token` forces a fresh run for that request.
+    """
+    report = get_orchestrator().run(
+        company=company,
+        ticker=ticker,
+        from_date=from_date,
+        to_date_param=to_date,
+        top_k=top_k
+    )
+    if AnalystAgent.is_fallback(report):
+        raise FallbackReport(report)
+    return report
 
-# Add project root to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.orchestrator import Orchestrator
 st.markdown("Generate evidence-backed intelligence reports using AI agents.")
 
 # Sidebar Inputs
@@ -49,31 +82,38 @@ with st.sidebar:
     top_k = st.slider("Top-K Sources", min_value=3, max_value=20, value=5)
     
     generate_btn = st.button("Generate Report", type="primary")
+    refresh_btn = st.button("Refresh Report", help="Ignore the cached report and run the pipeline again")
 
 # Main Content
-if generate_btn:
+if generate_btn or refresh_btn:
     if not company_name or not ticker:
         st.error("Please provide both Company Name and Ticker.")
     else:
         try:
-            status_container = st.container()
+            request_key = (company_name, ticker.upper(), str(start_date), str(end_date), top_k)
+            refresh_tokens = st.session_state.setdefault("refresh_tokens", {})
+            if refresh_btn:
+                refresh_tokens[request_key] = refresh_tokens.get(request_key, 0) + 1
+
             with st.status("Running Agentic Pipeline...", expanded=True) as status:
-                st.write("Initializing agents...")
-                orchestrator = Orchestrator()
-                
                 st.write("🕵️‍♀️ Collecting data (News + Prices)...")
                 
-                # We simply call run directly. 
+                # Repeat requests are answered from the memoized report layer.
                 # In a more complex app, we might hook into logs to update status in real-time.
-                report = orchestrator.run(
-                    company=company_name,
-                    ticker=ticker,
-                    from_date=str(start_date),
-                    to_date_param=str(end_date),
-                    top_k=top_k
-                )
-                
-                status.update(label="Analysis Complete!", state="complete", expanded=False)
+                try:
+                    report = build_report(
+                        company_name,
+                        ticker.upper(),
+                        str(start_date),
+                        str(end_date),
+                        top_k,
+                        refresh_token=refresh_tokens.get(request_key, 0)
+                    )
+                    status.update(label="Analysis Complete!", state="complete", expanded=False)
+                except FallbackReport as e:
+                    # Shown once but not cached: the next click runs the pipeline again
+                    report = e.report
+                    status.update(label="Analysis failed, try again shortly", state="error", expanded=False)
             
             # Display Report
             st.divider()
@@ -2,10 +2,11 @@ import pytest
 import json
 from unittest.mock import MagicMock, patch
 from src.agents.analyst import AnalystAgent
+from src.clients.cache import ResponseCache
 
 @pytest.fixture
-def analyst():
-    return AnalystAgent()
+def analyst(tmp_path):
+    return AnalystAgent(cache=ResponseCache(path=str(tmp_path / "llm.sqlite3")))
 
 def test_analyze_flow(analyst):
     mock_response = {
@@ -28,3 +29,76 @@ def test_analyze_flow(analyst):
         assert report["sentiment"] == "positive"
         assert report["summary"] == "Test Summary"
         assert report["confidence"] == 0.8
+
+def test_identical_requests_are_cached(analyst):
+    mock_response = {
+        "choices": [{
+            "message": {
+                "content": json.dumps({
+                    "summary": "Cached Summary",
+                    "sentiment": "neutral",
+                    "key_drivers": [],
+                    "risks": [],
+                    "evidence": [],
+                    "confidence": 0.5
+                })
+            }
+        }]
+    }
+    docs = [{"id": "1", "metadata": {"url": "u"}, "snippet": "s"}]
+
+    with patch.object(analyst, '_call_groq', return_value=mock_response) as mock_call:
+        first = analyst.analyze("Test Corp", {"current_price": 1.0}, docs)
+        second = analyst.analyze("Test Corp", {"current_price": 1.0}, docs)
+        changed = analyst.analyze("Test Corp", {"current_price": 2.0}, docs)
+
+    assert mock_call.call_count == 2
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["summary"] == "Cached Summary"
+    assert changed["cached"] is False
+
+def test_failed_analysis_is_marked_as_fallback(analyst):
+    with patch.object(analyst, '_call_groq', side_effect=RuntimeError("groq down")):
+        report = analyst.analyze("Test Corp", {}, [])
+    assert AnalystAgent.is_fallback(report)
+    # A real report is never mistaken for the fallback, whatever its wording
+    lookalike = {k: v for k, v in report.items() if k != "fallback"}
+    assert not AnalystAgent.is_fallback(lookalike)
+    assert not AnalystAgent.is_fallback(None)
+
+def test_analyze_stream_yields_fields_then_report(analyst):
+    content = json.dumps({
+        "summary": "Streamed",
+        "sentiment": "negative",
+        "key_drivers": ["Demand"],
+        "risks": ["Debt"],
+        "evidence": [],
+        "confidence": 0.4
+    })
+    chunks = [content[i:i + 7] for i in range(0, len(content), 7)]
+    docs = [{"id": "1", "metadata": {"url": "u"}, "snippet": "s"}]
+
+    with patch.object(analyst, '_stream_groq', return_value=iter(chunks)):
+        events = list(analyst.analyze_stream("Test Corp", {}, docs))
+
+    fields = [e["name"] for e in events if e["type"] == "field"]
+    assert fields == ["summary", "sentiment", "key_drivers", "risks", "evidence", "confidence"]
+    assert events[-1]["type"] == "report"
+    assert events[-1]["report"]["sentiment"] == "negative"
+    assert events[-1]["report"]["cached"] is False
+
+def test_stream_groq_parses_sse(analyst):
+    analyst.api_key = "k"
+    response = MagicMock()
+    response.iter_lines.return_value = [
+        'data: {"choices": [{"delta": {"role": "assistant"}}]}',
+        '',
+        'data: {"choices": [{"delta": {"content": "{\\"a\\""}}]}',
+        'data: {"choices": [{"delta": {"content": ": 1}"}}]}',
+        'data: [DONE]',
+    ]
+    with patch("src.agents.analyst.transport.post", return_value=response) as mock_post:
+        assert "".join(analyst._stream_groq([])) == '{"a": 1}'
+    assert mock_post.call_args.kwargs["stream"] is True
+    response.close.assert_called_once()
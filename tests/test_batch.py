@@ -0,0 +1,95 @@
+import json
+import os
+from functools import partial
+import pytest
+from src.ingest.chroma_ingest import ChromaIngest
+from src.batch import _run_job, job_key, load_jobs, load_completed, parse_limits, run_batch
+
+def test_parse_limits():
+    assert parse_limits(["finnhub=2", "groq=1"]) == {"finnhub.io": 2, "api.groq.com": 1}
+    with pytest.raises(ValueError):
+        parse_limits(["finnhub=zero"])
+
+def test_resume_skips_completed_jobs(tmp_path):
+    jobs_file = tmp_path / "jobs.jsonl"
+    jobs = [
+        {"company": "Tesla", "ticker": "TSLA", "from": "2024-01-01", "to": "2024-01-07", "top_k": 5},
+        {"company": "Tesla", "ticker": "tsla", "from": "2024-01-01", "to": "2024-01-07"},
+    ]
+    jobs_file.write_text("\n".join(json.dumps(j) for j in jobs) + "\n")
+    output = tmp_path / "results.jsonl"
+    output.write_text(json.dumps({"key": job_key(jobs[0]), "status": "ok"}) + "\n{\"torn")
+
+    assert load_completed(str(output)) == {"TSLA|2024-01-01|2024-01-07|5"}
+    # Both lines are the same job and it already succeeded, so no worker is started
+    summary = run_batch(load_jobs(str(jobs_file)), str(output), workers=1)
+    assert summary == {"ok": 0, "error": 0, "skipped": 2}
+
+def test_fallback_analyses_are_recorded_as_errors(tmp_path, monkeypatch):
+    from src.agents.analyst import AnalystAgent
+
+    class FallbackOrchestrator:
+        def run(self, **kwargs):
+            return AnalystAgent._fallback_report()
+
+    monkeypatch.setattr("src.batch._orchestrator", FallbackOrchestrator())
+    record = _run_job({"company": "Tesla", "ticker": "TSLA", "from": "2024-01-01", "to": "2024-01-07"})
+    assert record["status"] == "error" and record["error"] == "analysis fell back"
+
+    output = tmp_path / "results.jsonl"
+    output.write_text(json.dumps(record) + "\n")
+    # A resumed run tries the job again
+    assert load_completed(str(output)) == set()
+
+WORDS = ["revenue", "recall", "factory", "lawsuit", "guidance", "merger"]
+
+def _fake_embed(texts):
+    import numpy as np
+    return np.array([[float(len(t)), 1.0, 0.5] for t in texts])
+
+class RecordingChroma(ChromaIngest):
+    def owner_pid(self):
+        return os.getpid()
+
+def _test_chroma(persist_dir):
+    # Runs in the batch's ChromaManager process, out of reach of the test's patches
+    from unittest.mock import patch
+    patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed).start()
+    return RecordingChroma(persist_dir=persist_dir)
+
+class ChromaOnlyOrchestrator:
+    """
+    Ingests one article per job into the shared store, then reports which
+    articles the store returns to this worker.
+    """
+
+    def __init__(self, chroma):
+        self.chroma = chroma
+
+    def run(self, company, ticker, from_date, to_date_param, top_k=5):
+        word = WORDS[int(from_date[-2:]) - 1]
+        self.chroma.ingest_articles(ticker, [{
+            "id": word, "title": f"{company} {word}", "text": f"{word} " * 20, "source": "Wire",
+            "url": f"https://news.example/{word}", "published_at": f"{from_date}T12:00:00Z",
+        }])
+        seen = [d["id"] for d in self.chroma.query(ticker, "news", top_k=len(WORDS))]
+        return {"summary": f"{ticker} {word}", "seen": seen, "pid": os.getpid(), "store": self.chroma.owner_pid()}
+
+def test_pool_workers_share_one_chroma_store(tmp_path):
+    persist_dir = str(tmp_path / "chroma")
+    jobs = [{"company": "Acme", "ticker": "ACME", "from": f"2024-01-0{d}", "to": "2024-01-09"}
+            for d in range(1, len(WORDS) + 1)]
+    output = tmp_path / "results.jsonl"
+    summary = run_batch(jobs, str(output), workers=2, chroma_factory=partial(_test_chroma, persist_dir),
+                        orchestrator_factory=ChromaOnlyOrchestrator)
+
+    assert summary == {"ok": len(WORDS), "error": 0, "skipped": 0}
+    reports = [json.loads(line)["report"] for line in output.read_text().splitlines()]
+    workers = {r["pid"] for r in reports}
+    stores = {r["store"] for r in reports}
+    # Jobs ran in worker processes, and all of them used one store living in none of them
+    assert os.getpid() not in workers
+    assert len(stores) == 1 and not stores & (workers | {os.getpid()})
+    # The last query ran after every ingest, whichever worker did it
+    assert max(len(r["seen"]) for r in reports) == len(WORDS)
+    assert ChromaIngest(persist_dir=persist_dir).ensure_collection("ticker_acme").count() == len(WORDS)
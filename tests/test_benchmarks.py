@@ -0,0 +1,48 @@
+import json
+from benchmarks import run as bench
+from benchmarks.fixtures import fake_embed, synthetic_news
+
+def test_compare_flags_regressions_by_direction():
+    baseline = {"s": {"total_s": 1.0, "ingest_docs_per_s": 1000.0, "retrieval": {"q": {"p50_ms": 10.0}}, "articles": 3}}
+    current = {"s": {"total_s": 1.5, "ingest_docs_per_s": 700.0, "retrieval": {"q": {"p50_ms": 10.5}}, "articles": 30}}
+    regressions = bench.compare(current, baseline, tolerance=0.2)
+    assert [r.split(":")[0] for r in regressions] == ["s.ingest_docs_per_s", "s.total_s"]
+    assert bench.compare(baseline, baseline) == []
+
+def test_fake_embeddings_and_synthetic_news_are_deterministic():
+    news = synthetic_news(50, "Tesla", "2023-10-01", "2023-10-31")
+    assert news == synthetic_news(50, "Tesla", "2023-10-01", "2023-10-31")
+    assert len({n["url"] for n in news}) == 50
+    vectors = fake_embed([n["summary"] for n in news])
+    assert vectors.shape == (50, 384)
+    assert abs(float((vectors ** 2).sum(axis=1).max()) - 1.0) < 1e-5
+
+def test_benchmark_run_writes_results_and_baseline(tmp_path):
+    output, baseline = tmp_path / "latest.json", tmp_path / "baseline.json"
+    args = ["--fake-embeddings", "--sizes", "200", "--queries", "2",
+            "--output", str(output), "--baseline", str(baseline)]
+    assert bench.main(args + ["--save-baseline"]) == 0
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {"sample", "synthetic_200"}
+    scenario = results["synthetic_200"]
+    assert {"collect", "ingest", "retrieve", "analyze"} <= set(scenario["phases"])
+    assert scenario["report_fallback"] is False
+    assert scenario["retrieval"]["query_hybrid"]["p50_ms"] > 0
+
+    # A baseline far faster than anything achievable makes every timing regress
+    fast = json.loads(baseline.read_text())
+    fast["results"]["synthetic_200"]["total_s"] = 1e-6
+    baseline.write_text(json.dumps(fast))
+    assert bench.main(args) == 1
+    assert any(r.startswith("synthetic_200.total_s") for r in json.loads(output.read_text())["regressions"])
+
+def test_hnsw_benchmark_reports_recall_per_setting(tmp_path):
+    from benchmarks import hnsw
+    output = tmp_path / "hnsw.json"
+    args = ["--docs", "300", "--queries", "5", "--top-k", "5", "--m", "8", "--construction-ef", "50",
+            "--search-ef", "5", "50", "--output", str(output)]
+    assert hnsw.main(args) == 0
+    rows = json.loads(output.read_text())["results"]
+    assert [(r["M"], r["search_ef"]) for r in rows] == [(8, 5), (8, 50)]
+    assert all(0.0 <= r["recall"] <= 1.0 and r["p50_ms"] > 0 for r in rows)
+    assert rows[1]["recall"] >= rows[0]["recall"]
@@ -0,0 +1,56 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from src.clients.cache import ResponseCache, ttl_for_date, RESPONSE_CACHE_TTL
+from src.clients.finnhub_client import FinnhubClient
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(path=str(tmp_path / "responses.sqlite3"))
+
+def test_roundtrip_ignores_secrets_and_param_order(cache):
+    cache.set("https://api/x", {"symbol": "TSLA", "from": "2023-01-01", "token": "a"}, [{"id": 1}])
+    assert cache.get("https://api/x", {"from": "2023-01-01", "token": "b", "symbol": "TSLA"}) == [{"id": 1}]
+    assert cache.get("https://api/x", {"symbol": "NVDA", "from": "2023-01-01"}) is None
+
+def test_expired_entries_are_misses(cache):
+    cache.set("e", {"q": 1}, {"v": 1}, ttl=-1)
+    assert cache.get("e", {"q": 1}) is None
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "r.sqlite3"), max_bytes=60)
+    cache.set("e", {"q": 1}, "a" * 20)
+    cache.set("e", {"q": 2}, "b" * 20)
+    cache.get("e", {"q": 1})  # refresh q=1 so q=2 is least recently used
+    cache.set("e", {"q": 3}, "c" * 20)
+    assert cache.get("e", {"q": 1}) is not None
+    assert cache.get("e", {"q": 2}) is None
+    assert cache.get("e", {"q": 3}) is not None
+
+def test_past_ranges_never_expire():
+    assert ttl_for_date("2023-10-31") is None
+    assert ttl_for_date("2999-01-01") == RESPONSE_CACHE_TTL
+
+def test_finnhub_news_served_from_cache(cache, monkeypatch):
+    monkeypatch.setenv("FINNHUB_API_KEY", "k")
+    client = FinnhubClient(cache=cache)
+    response = MagicMock()
+    response.json.return_value = [{"id": 1, "headline": "h"}]
+    with patch("src.clients.finnhub_client.transport.get", return_value=response) as mock_get:
+        first = client.fetch_company_news("TSLA", "2023-10-01", "2023-10-31")
+        second = client.fetch_company_news("TSLA", "2023-10-01", "2023-10-31")
+    assert first == second == [{"id": 1, "headline": "h"}]
+    assert mock_get.call_count == 1
+
+def test_finnhub_empty_prices_are_not_cached_for_good(monkeypatch):
+    monkeypatch.setenv("FINNHUB_API_KEY", "k")
+    cache = MagicMock()
+    cache.get.return_value = None
+    client = FinnhubClient(cache=cache)
+    response = MagicMock()
+    # A window in the past: real candles are kept forever, "no_data" only briefly
+    for payload, expected, ttl in (({"s": "ok", "c": [1.0], "t": [1]}, {"s": "ok", "c": [1.0], "t": [1]}, None),
+                                   ({"s": "no_data"}, {}, RESPONSE_CACHE_TTL)):
+        response.json.return_value = payload
+        with patch("src.clients.finnhub_client.transport.get", return_value=response):
+            assert client.fetch_prices("TSLA", from_timestamp=1696118400, to_timestamp=1698710400) == expected
+        assert cache.set.call_args.kwargs["ttl"] == ttl
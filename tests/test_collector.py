@@ -6,7 +6,8 @@ from src.agents.data_collector import DataCollector
 def collector():
     with patch('src.agents.data_collector.FinnhubClient'), \
          patch('src.agents.data_collector.NewsApiClient'), \
-         patch('src.agents.data_collector.SerperClient'):
+         patch('src.agents.data_collector.SerperClient'), \
+         patch('src.agents.data_collector.get_price_store', return_value=None):
         return DataCollector()
 
 def test_normalize_finnhub(collector):
@@ -33,3 +34,59 @@ def test_deduplicate(collector):
     urls = [a['url'] for a in unique]
     assert "http://a.com" in urls
     assert "http://b.com" in urls
+
+def _finnhub_items(n):
+    return [{
+        "datetime": 1698228000,
+        "headline": f"Headline {i}",
+        "summary": "Summary",
+        "url": f"http://test.com/{i}",
+        "source": "Test Source"
+    } for i in range(n)]
+
+def test_collect_concurrent_skips_serper_when_enough(collector):
+    collector.finnhub.fetch_company_news.return_value = _finnhub_items(6)
+    collector.newsapi.search_articles.return_value = []
+    collector.serper.search_web.return_value = [{"title": "Web", "snippet": "s", "link": "http://web.com"}]
+    collector.finnhub.fetch_prices.return_value = {"s": "ok", "c": [100.0, 110.0]}
+
+    data = collector.collect("Test Corp", "TST", "2023-10-01", "2023-10-31")
+    assert len(data["articles"]) == 6
+    assert all(a["source"] != "SerperWeb" for a in data["articles"])
+    assert data["prices"]["change_percent"] == pytest.approx(10.0)
+    assert {"finnhub_news", "newsapi", "finnhub_prices", "total"} <= set(data["timings"])
+
+def test_collect_concurrent_uses_serper_when_thin(collector):
+    collector.finnhub.fetch_company_news.side_effect = Exception("down")
+    collector.newsapi.search_articles.return_value = []
+    collector.serper.search_web.return_value = [{"title": "Web", "snippet": "s", "link": "http://web.com"}]
+    collector.finnhub.fetch_prices.return_value = {}
+
+    data = collector.collect("Test Corp", "TST", "2023-10-01", "2023-10-31")
+    assert [a["source"] for a in data["articles"]] == ["SerperWeb"]
+    assert "serper" in data["timings"]
+    assert data["prices"] == {}
+
+def test_deduplicate_canonical_urls_and_near_duplicates(collector):
+    body = "Regulators in Brussels opened a formal investigation into the company's driver assistance software on Monday."
+    articles = [
+        {"url": "https://news.com/story?utm_source=feed", "title": "EU probes Tesla", "text": body, "id": "1"},
+        {"url": "http://www.news.com/story", "title": "EU opens Tesla probe", "text": "x", "id": "2"},
+        {"url": "https://wire.com/a", "title": "EU probes Tesla software", "text": body, "id": "3"},
+        {"url": "https://other.com/b", "title": "Nvidia earnings", "text": "Chip sales soared.", "id": "4"},
+    ]
+    unique = collector._deduplicate(articles)
+    assert [a["id"] for a in unique] == ["1", "4"]
+
+def test_price_summary_uses_price_store(collector, tmp_path):
+    from src.clients.price_store import PriceStore
+    collector.price_store = PriceStore(str(tmp_path))
+    collector.finnhub.fetch_prices.return_value = {
+        "s": "ok", "t": [1696118400, 1696204800], "c": [100.0, 110.0], "o": [100.0, 108.0],
+        "h": [101.0, 111.0], "l": [99.0, 107.0], "v": [10.0, 30.0]
+    }
+    first = collector._fetch_price_summary("TST", "2023-10-01", "2023-10-02")
+    second = collector._fetch_price_summary("TST", "2023-10-01", "2023-10-02")
+    assert first == second
+    assert first["change_percent"] == pytest.approx(10.0)
+    assert collector.finnhub.fetch_prices.call_count == 1
@@ -0,0 +1,32 @@
+from src.agents.context_packer import ContextPacker, estimate_tokens
+
+def _doc(doc_id, text, published="2024-01-05T00:00:00Z", distance=0.3):
+    return {"id": doc_id, "snippet": text[:500], "full_text": text, "distance": distance,
+            "metadata": {"url": f"http://news.com/{doc_id}", "published_at": published}}
+
+def test_overlapping_snippets_are_dropped():
+    text = "Tesla reports record deliveries in the fourth quarter beating analyst estimates by a wide margin."
+    docs = [_doc("a", text), _doc("b", text + " Shares rose."), _doc("c", "Regulators open a probe into autopilot crashes.")]
+    packed = ContextPacker(token_budget=1000).pack(docs, "Tesla deliveries")
+    assert sorted(d["id"] for d in packed) == ["a", "c"]
+
+def test_budget_is_respected_and_ids_kept():
+    docs = [_doc(str(i), f"Headline {i}\n" + "Filler sentence about nothing. " * 40 + "Tesla margins improved.", distance=0.1 * i)
+            for i in range(10)]
+    packer = ContextPacker(token_budget=300, max_doc_tokens=60)
+    packed = packer.pack(docs, "Tesla margins")
+    used = sum(estimate_tokens(d["snippet"]) + estimate_tokens(f"ID: {d['id']}\nURL: {d['metadata']['url']}\n") for d in packed)
+    assert 0 < len(packed) < len(docs)
+    assert used <= 300
+    for d in packed:
+        assert d["metadata"]["url"] == f"http://news.com/{d['id']}"
+        assert d["snippet"].startswith(f"Headline {d['id']}")
+        assert "Tesla margins improved." in d["snippet"]
+    # Most relevant (smallest distance) first
+    assert packed[0]["id"] == "0"
+
+def test_recency_breaks_relevance_ties():
+    docs = [_doc("old", "Old news about the company.", published="2024-01-01T00:00:00Z"),
+            _doc("new", "Fresh update on quarterly outlook.", published="2024-01-10T00:00:00Z")]
+    packed = ContextPacker().pack(docs, "company outlook")
+    assert [d["id"] for d in packed] == ["new", "old"]
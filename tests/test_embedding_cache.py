@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from unittest.mock import patch
+from src.ingest.embedding_cache import EmbeddingCache, text_key
+
+def _key(text):
+    return text_key("test-model", text)
+
+def test_put_get_and_persistence(tmp_path):
+    cache = EmbeddingCache("test-model", capacity=4, cache_dir=str(tmp_path))
+    cache.put_many([_key("a"), _key("b")], np.array([[1, 2], [3, 4]], dtype=np.float32))
+
+    reopened = EmbeddingCache("test-model", capacity=4, cache_dir=str(tmp_path))
+    assert np.array_equal(reopened.get(_key("b")), [3, 4])
+    assert reopened.get(_key("missing")) is None
+
+def test_hits_survive_eviction_of_their_slot(tmp_path):
+    cache = EmbeddingCache("test-model", capacity=2, cache_dir=str(tmp_path))
+    cache.put_many([_key("a"), _key("b")], np.array([[1, 1, 1], [2, 2, 2]], dtype=np.float32))
+    hit = cache.get(_key("a"))
+    cache.get(_key("b"))
+    # "a" is now least recently used, so "c" takes its slot
+    cache.put_many([_key("c")], np.array([[7, 7, 7]], dtype=np.float32))
+    assert cache.get(_key("a")) is None
+    assert hit.tolist() == [1, 1, 1]
+
+def test_late_writer_does_not_truncate_cache_created_by_another(tmp_path):
+    # Both open an empty directory, e.g. two pool workers starting together
+    first = EmbeddingCache("test-model", capacity=4, cache_dir=str(tmp_path))
+    second = EmbeddingCache("test-model", capacity=4, cache_dir=str(tmp_path))
+    first.put_many([_key("a")], np.array([[1, 2]], dtype=np.float32))
+    second.put_many([_key("b")], np.array([[3, 4]], dtype=np.float32))
+
+    reopened = EmbeddingCache("test-model", capacity=4, cache_dir=str(tmp_path))
+    assert np.array_equal(reopened.get(_key("a")), [1, 2])
+    assert np.array_equal(reopened.get(_key("b")), [3, 4])
+    assert np.array_equal(second.get(_key("a")), [1, 2])
+
+def test_lru_eviction(tmp_path):
+    cache = EmbeddingCache("test-model", capacity=2, cache_dir=str(tmp_path))
+    cache.put_many([_key("a")], np.array([[1.0]]))
+    cache.put_many([_key("b")], np.array([[2.0]]))
+    cache.get(_key("a"))
+    cache.put_many([_key("c")], np.array([[3.0]]))
+    assert cache.get(_key("b")) is None
+    assert cache.get(_key("a")) is not None
+    assert cache.get(_key("c")) is not None
+
+def test_embed_texts_only_encodes_misses(tmp_path):
+    from src.ingest import embeddings
+    cache = EmbeddingCache(embeddings.MODEL_NAME, capacity=8, cache_dir=str(tmp_path))
+    fake = lambda texts: np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+    with patch.object(embeddings, "get_embedding_cache", return_value=cache), \
+         patch.object(embeddings, "_encode", side_effect=fake) as mock_encode:
+        first = embeddings.embed_texts(["aa", "bbb", "aa"])
+        second = embeddings.embed_texts(["bbb", "cccc"])
+    assert first.tolist() == [[2.0, 1.0], [3.0, 1.0], [2.0, 1.0]]
+    assert second.tolist() == [[3.0, 1.0], [4.0, 1.0]]
+    assert [c.args[0] for c in mock_encode.call_args_list] == [["aa", "bbb"], ["cccc"]]
+
+def test_embed_texts_keeps_hits_when_misses_evict_them(tmp_path):
+    from src.ingest import embeddings
+    cache = EmbeddingCache(embeddings.MODEL_NAME, capacity=2, cache_dir=str(tmp_path))
+    fake = lambda texts: np.array([[float(len(t))] * 3 for t in texts], dtype=np.float32)
+    with patch.object(embeddings, "get_embedding_cache", return_value=cache), \
+         patch.object(embeddings, "_encode", side_effect=fake):
+        embeddings.embed_texts(["a", "bb"])
+        # "a" is a hit, and storing the two misses reuses every slot, including its own
+        result = embeddings.embed_texts(["a", "ccccccc", "dddd"])
+    assert result.tolist() == [[1.0] * 3, [7.0] * 3, [4.0] * 3]
@@ -0,0 +1,85 @@
+import json
+import pytest
+import requests
+from unittest.mock import patch
+from src.clients import transport
+from src.clients.cache import ResponseCache
+from src.clients.fixtures import FixtureStore, body_digest, fixture_key
+from src.clients.standin_server import StandInServer
+
+NEWS_URL = "https://finnhub.io/api/v1/company-news"
+NEWS = [{"id": 1, "headline": "Recorded", "summary": "s", "url": "http://a.com", "datetime": 1698228000}]
+
+def _response(payload, status=200):
+    response = requests.models.Response()
+    response.status_code = status
+    response._content = json.dumps(payload).encode("utf-8")
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Set-Cookie"] = "session=secret"
+    return response
+
+@pytest.fixture
+def fixture_dir(tmp_path):
+    yield str(tmp_path / "http")
+    transport.set_mode("live")
+
+def test_key_ignores_secrets_and_json_formatting():
+    assert fixture_key("GET", NEWS_URL, {"symbol": "TSLA", "token": "a"}) == \
+        fixture_key("get", NEWS_URL + "?symbol=TSLA", {"token": "b"})
+    assert body_digest({"q": "x", "num": 5}) == body_digest('{"num": 5, "q": "x"}')
+    assert fixture_key("POST", NEWS_URL, body={"q": "x"}) != fixture_key("POST", NEWS_URL, body={"q": "y"})
+
+def test_record_then_replay(fixture_dir):
+    params = {"symbol": "TSLA", "from": "2024-01-01", "to": "2024-01-07", "token": "secret-token"}
+    transport.set_mode("record", fixture_dir)
+    with patch.object(transport.get_session(), "request", return_value=_response(NEWS)):
+        assert transport.get(NEWS_URL, params=params).json() == NEWS
+
+    saved = open(FixtureStore(fixture_dir).path(NEWS_URL, fixture_key("GET", NEWS_URL, params))).read()
+    assert "secret" not in saved
+
+    transport.set_mode("replay", fixture_dir)
+    with patch.object(transport.get_session(), "request") as live:
+        assert transport.get(NEWS_URL, params=dict(params, token="other")).json() == NEWS
+        with pytest.raises(requests.ConnectionError):
+            transport.get(NEWS_URL, params=dict(params, symbol="AAPL"))
+        live.assert_not_called()
+
+@pytest.fixture
+def server(fixture_dir):
+    store = FixtureStore(fixture_dir)
+    store.save("GET", NEWS_URL, {"symbol": "TSLA", "from": "2024-01-01", "to": "2024-01-07"}, None,
+               200, {"Content-Type": "application/json"}, json.dumps(NEWS).encode("utf-8"))
+    srv = StandInServer(fixture_dir, seed=0)
+    srv.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+def test_standin_serves_clients_through_base_url(server, tmp_path, monkeypatch):
+    from src.clients import finnhub_client
+    monkeypatch.setenv("FINNHUB_API_KEY", "key")
+    monkeypatch.setattr(finnhub_client, "BASE_URL", server.base_urls()["FINNHUB_BASE_URL"])
+    client = finnhub_client.FinnhubClient(cache=ResponseCache(str(tmp_path / "c.sqlite3")))
+    assert client.fetch_company_news("TSLA", "2024-01-01", "2024-01-07") == NEWS
+
+    missing = transport.get(f"{server.base_url}/finnhub.io/api/v1/company-news", params={"symbol": "AAPL"})
+    assert missing.status_code == 404
+    assert transport.get(f"{server.base_url}/_standin/stats").json() == \
+        {"served": 1, "missing": 1, "errors": 0, "rate_limited": 0}
+
+def test_standin_injects_errors_and_rate_limits(server):
+    url = f"{server.base_url}/finnhub.io/api/v1/company-news"
+    params = {"symbol": "TSLA", "from": "2024-01-01", "to": "2024-01-07"}
+    server.rate_limit_rate = 1.0
+    response = transport.get(url, params=params)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    server.rate_limit_rate, server.error_rate = 0.0, 1.0
+    assert transport.get(url, params=params).status_code == 500
+
+    server.error_rate, server.latency = 0.0, 0.05
+    response = transport.get(url, params=params)
+    assert response.json() == NEWS
+    assert response.elapsed.total_seconds() >= 0.05
@@ -0,0 +1,12 @@
+from src.utils.ids import canonicalize_url, make_article_id
+
+def test_canonicalize_url_strips_tracking_and_noise():
+    a = canonicalize_url("HTTP://www.Example.com/news/story/?utm_source=x&b=2&a=1#top")
+    b = canonicalize_url("https://example.com/news/story?a=1&b=2&fbclid=abc")
+    assert a == b == "https://example.com/news/story?a=1&b=2"
+
+def test_article_id_is_stable():
+    url = "https://example.com/story?utm_medium=rss"
+    assert make_article_id(url, "Title", "v1") == make_article_id("https://www.example.com/story", "Title", "v2")
+    assert make_article_id("", "Title", "Body") == make_article_id("", " title ", "body")
+    assert make_article_id("", "Title", "Body") != make_article_id("", "Title", "Other")
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import budget for the CLI's entry modules, in milliseconds
+IMPORT_BUDGET_MS = 750
+# Heavy libraries that must only load when first used
+DEFERRED_MODULES = ["chromadb", "sentence_transformers", "torch", "jsonschema", "requests"]
+
+def _import_times(module: str) -> dict:
+    """
+    Run `python -X importtime -c "import <module>"` in a fresh interpreter and
+    return {module name: cumulative microseconds}.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+@pytest.mark.parametrize("module", ["src.orchestrator", "src.main"])
+def test_heavy_libraries_are_not_imported_eagerly(module):
+    times = _import_times(module)
+    loaded = [m for m in DEFERRED_MODULES if m in times]
+    assert not loaded, f"{module} eagerly imports {loaded}"
+
+def test_import_time_budget():
+    times = _import_times("src.main")
+    assert times["src.main"] / 1000 < IMPORT_BUDGET_MS
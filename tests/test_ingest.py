@@ -36,3 +36,232 @@ def test_ingest_and_query(chroma_client):
     assert len(results) >= 1
     assert "AI in Finance" in results[0]['snippet']
     assert results[0]['id'] == "test_1"
+
+def _fake_embed(texts):
+    import numpy as np
+    return np.array([[float(len(t)), 1.0, 0.5] for t in texts])
+
+def test_ingest_is_incremental(tmp_path):
+    from unittest.mock import patch
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    base = {"source": "Tech", "url": "http://test.com/a", "published_at": "2023-01-01T00:00:00",
+            "language": "en", "ingested_at": "2023-01-01T00:00:00"}
+    first = [dict(base, id="a", title="A", text="alpha"), dict(base, id="b", title="B", text="beta")]
+
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed) as mock_embed:
+        assert client.ingest_articles("TEST", first) == {"added": 2, "updated": 0, "skipped": 0}
+
+        second = [dict(base, id="a", title="A", text="alpha"), dict(base, id="b", title="B", text="beta v2"),
+                  dict(base, id="c", title="C", text="gamma")]
+        assert client.ingest_articles("TEST", second) == {"added": 1, "updated": 1, "skipped": 1}
+        # Only the changed and new documents were embedded on the second run
+        assert mock_embed.call_args[0][0] == ["B\nbeta v2", "C\ngamma"]
+
+def test_compact_duplicates(tmp_path):
+    from unittest.mock import patch
+    from src.utils.ids import make_article_id
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    base = {"source": "Tech", "title": "A", "text": "alpha", "published_at": "2023-01-01T00:00:00",
+            "language": "en", "ingested_at": "2023-01-01T00:00:00"}
+    stable_id = make_article_id("http://test.com/a")
+    articles = [
+        dict(base, id="uuid-1", url="http://test.com/a?utm_source=rss"),
+        dict(base, id=stable_id, url="http://test.com/a"),
+        dict(base, id="uuid-2", url="http://test.com/b"),
+    ]
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        client.ingest_articles("TEST", articles)
+
+    assert client.compact_duplicates("TEST") == {"kept": 2, "removed": 1}
+    remaining = client.ensure_collection("ticker_test").get()["ids"]
+    assert sorted(remaining) == sorted([stable_id, "uuid-2"])
+    assert client.list_tickers() == ["test"]
+    # An unknown ticker (e.g. a typo on the command line) is not created
+    assert client.compact_duplicates("TYPO") == {"kept": 0, "removed": 0}
+    assert client.list_tickers() == ["test"]
+
+def test_query_aspects_single_call_with_mmr(tmp_path):
+    import numpy as np
+    from unittest.mock import patch
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    vectors = {
+        "Earnings beat\nRevenue up": [1.0, 0.0, 0.0],
+        "Earnings beat again\nRevenue up again": [0.99, 0.01, 0.0],
+        "Lawsuit filed\nRegulators": [0.0, 1.0, 0.0],
+        "performance": [1.0, 0.0, 0.0],
+        "risks": [0.0, 1.0, 0.0],
+    }
+    fake = lambda texts: np.array([vectors[t] for t in texts])
+    base = {"source": "s", "published_at": "2024-01-01T00:00:00", "language": "en", "ingested_at": "2024-01-01T00:00:00"}
+    articles = [
+        dict(base, id="e1", title="Earnings beat", text="Revenue up", url="http://n.com/1"),
+        dict(base, id="e2", title="Earnings beat again", text="Revenue up again", url="http://n.com/2"),
+        dict(base, id="l1", title="Lawsuit filed", text="Regulators", url="http://n.com/3"),
+    ]
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=fake) as mock_embed:
+        client.ingest_articles("TEST", articles)
+        results = client.query_aspects("TEST", {"performance": "performance", "risks": "risks"}, top_k=2)
+
+    # Both aspect queries embedded in one batch
+    assert mock_embed.call_args[0][0] == ["performance", "risks"]
+    # The near-duplicate earnings story loses to the diverse lawsuit story
+    assert [r["id"] for r in results] == ["e1", "l1"]
+    assert "risks" in results[1]["aspects"]
+
+def test_query_filters_by_date_window(tmp_path):
+    from unittest.mock import patch
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    base = {"source": "s", "text": "news", "language": "en", "ingested_at": "2024-02-01T00:00:00"}
+    articles = [
+        dict(base, id="jan", title="January", url="http://n.com/jan", published_at="2024-01-15T12:00:00Z"),
+        dict(base, id="feb", title="February", url="http://n.com/feb", published_at="2024-02-01T23:30:00+00:00"),
+        dict(base, id="web", title="Web result", url="http://n.com/web", published_at="2024-06-01T00:00:00Z",
+             date_estimated=True),
+    ]
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        client.ingest_articles("TEST", articles)
+        in_window = client.query("TEST", "news", top_k=5, from_date="2024-02-01", to_date="2024-02-01")
+        unfiltered = client.query("TEST", "news", top_k=5)
+
+    assert sorted(r["id"] for r in in_window) == ["feb", "web"]
+    assert in_window[0]["metadata"]["published_ts"] > 0
+    assert len(unfiltered) == 3
+
+def test_hybrid_query_surfaces_exact_matches(tmp_path):
+    import numpy as np
+    from unittest.mock import patch
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    # Dense vectors rank the generic story first; only BM25 sees the exact product name
+    vectors = {"Market wrap\nStocks rose": [1.0, 0.0], "Product news\nBlackwell GPU ships": [0.0, 1.0],
+               "Blackwell": [1.0, 0.1]}
+    fake = lambda texts: np.array([vectors[t] for t in texts])
+    base = {"source": "s", "published_at": "2024-01-01T00:00:00Z", "language": "en", "ingested_at": "2024-01-01T00:00:00"}
+    articles = [
+        dict(base, id="wrap", title="Market wrap", text="Stocks rose", url="http://n.com/1"),
+        dict(base, id="gpu", title="Product news", text="Blackwell GPU ships", url="http://n.com/2"),
+    ]
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=fake):
+        client.ingest_articles("TEST", articles)
+        dense = client.query("TEST", "Blackwell", top_k=1)
+        hybrid = client.query("TEST", "Blackwell", top_k=1, hybrid=True)
+
+    assert dense[0]["id"] == "wrap"
+    assert hybrid[0]["id"] == "gpu"
+    assert (tmp_path / "chroma" / "lexical" / "ticker_test.npz").exists()
+
+def _dated_articles(days_ago, now):
+    from datetime import datetime, timezone
+    base = {"source": "s", "language": "en", "ingested_at": "2024-01-01T00:00:00"}
+    return [
+        dict(base, id=f"d{age}", title=f"Story {age}", text=f"news from {age} days ago", url=f"http://n.com/{age}",
+             published_at=datetime.fromtimestamp(now - age * 86400, timezone.utc).isoformat())
+        for age in days_ago
+    ]
+
+def test_retention_by_age_and_count(tmp_path):
+    import time
+    from unittest.mock import patch
+    now = time.time()
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        client.ingest_articles("TEST", _dated_articles([1, 5, 10, 40, 100], now))
+
+    assert client.apply_retention("TEST", max_age_days=30, now=now) == {"expired": 2, "trimmed": 0, "kept": 3}
+    assert client.apply_retention("TEST", max_docs=2, now=now) == {"expired": 0, "trimmed": 1, "kept": 2}
+    remaining = client.ensure_collection("ticker_test").get()["ids"]
+    assert sorted(remaining) == ["d1", "d5"]
+    # The lexical index loses the same documents
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        hits = client.query("TEST", "news days ago", top_k=5, hybrid=True)
+    assert sorted(h["id"] for h in hits) == ["d1", "d5"]
+    assert client.apply_retention("MISSING", max_age_days=1) == {"expired": 0, "trimmed": 0, "kept": 0}
+
+def test_retention_ignores_estimated_dates(tmp_path):
+    import time
+    from unittest.mock import patch
+    now = time.time()
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    # Web results carry their fetch time, not a publish date
+    web = [dict(a, id=f"web{a['id']}", url=f"{a['url']}/web", text=f"web result {a['text']}", date_estimated=True)
+           for a in _dated_articles([0, 200], now)]
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        client.ingest_articles("TEST", _dated_articles([1, 100], now) + web)
+
+    assert client.apply_retention("TEST", max_age_days=30, now=now) == {"expired": 1, "trimmed": 0, "kept": 3}
+    # Estimated dates sort as unknown, so a recently fetched web result goes before a dated article
+    assert client.apply_retention("TEST", max_docs=1, now=now) == {"expired": 0, "trimmed": 2, "kept": 1}
+    assert client.ensure_collection("ticker_test").get()["ids"] == ["d1"]
+
+def test_rebuild_keeps_documents_and_embeddings(tmp_path):
+    import time
+    import numpy as np
+    from unittest.mock import patch
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    articles = _dated_articles(range(1, 21), time.time())
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed) as mock_embed:
+        client.ingest_articles("TEST", articles)
+        before = client.ensure_collection("ticker_test").get(include=["embeddings", "metadatas"])
+        embedded = mock_embed.call_count
+
+        stats = client.rebuild("TEST", hnsw={"M": 8, "construction_ef": 64, "search_ef": 32})
+        # Nothing was embedded again
+        assert mock_embed.call_count == embedded
+        hits = client.query("TEST", "news", top_k=3, hybrid=True)
+
+    assert stats["documents"] == 20
+    assert stats["hnsw"] == {"M": 8, "construction_ef": 64, "search_ef": 32}
+    after = client.ensure_collection("ticker_test").get(include=["embeddings", "metadatas"])
+    order = {doc_id: i for i, doc_id in enumerate(after["ids"])}
+    assert sorted(after["ids"]) == sorted(before["ids"])
+    for i, doc_id in enumerate(before["ids"]):
+        assert np.allclose(after["embeddings"][order[doc_id]], before["embeddings"][i])
+        assert after["metadatas"][order[doc_id]] == before["metadatas"][i]
+    assert len(hits) == 3
+    assert client.list_tickers() == ["test"]
+
+def test_rebuild_recovers_from_interrupted_copy(tmp_path):
+    import time
+    from unittest.mock import patch
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        client.ingest_articles("TEST", _dated_articles([1, 2, 3], time.time()))
+    # A half-finished copy next to the intact original is discarded
+    client.client.create_collection("ticker_test__rebuild")
+    assert client.list_tickers() == ["test"]
+    assert client.rebuild("TEST")["documents"] == 3
+    assert "ticker_test__rebuild" not in client._collection_names()
+
+def test_hnsw_params_per_ticker_and_tuning(tmp_path):
+    import time
+    from unittest.mock import patch
+    with patch.dict("src.ingest.chroma_ingest.HNSW_OVERRIDES", {"big": {"M": 32, "search_ef": 200}}):
+        client = ChromaIngest(persist_dir=str(tmp_path / "chroma"), hnsw={"construction_ef": 150})
+        assert client.hnsw_params("BIG") == {"construction_ef": 150, "M": 32, "search_ef": 200}
+        assert client.hnsw_params("small") == {"construction_ef": 150}
+        with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+            client.ingest_articles("BIG", _dated_articles([1, 2], time.time()))
+
+    col = client.ensure_collection("ticker_big")
+    assert client.hnsw_settings(col) == {"M": 32, "construction_ef": 150, "search_ef": 200}
+    # search_ef alone is changed in place, M needs a rebuild
+    with patch.object(client, "rebuild", wraps=client.rebuild) as rebuild:
+        assert client.tune_hnsw("BIG", search_ef=50)["search_ef"] == 50
+        assert not rebuild.called
+        assert client.tune_hnsw("BIG", M=12) == {"M": 12, "construction_ef": 150, "search_ef": 50}
+        assert rebuild.called
+    with pytest.raises(ValueError, match="Unknown HNSW"):
+        ChromaIngest(persist_dir=str(tmp_path / "chroma"), hnsw={"ef": 1}).hnsw_params("x")
+
+def test_compact_maintain_rebuilds_after_large_deletions(tmp_path):
+    import time
+    from unittest.mock import patch
+    from src.ingest.compact import maintain
+    client = ChromaIngest(persist_dir=str(tmp_path / "chroma"))
+    with patch("src.ingest.chroma_ingest.embed_texts", side_effect=_fake_embed):
+        client.ingest_articles("TEST", _dated_articles([1, 2, 3, 50, 60], time.time()))
+
+    small = maintain(client, "TEST", max_docs=4, rebuild_threshold=0.5)
+    assert small["retention"]["trimmed"] == 1 and "rebuild" not in small
+    large = maintain(client, "TEST", max_age_days=30, rebuild_threshold=0.2)
+    assert large["retention"]["expired"] == 1
+    assert large["rebuild"]["documents"] == 3
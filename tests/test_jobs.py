@@ -0,0 +1,175 @@
+import threading
+import time
+import pytest
+from src.jobs import JobQueue, JobWorkers, retry_delay
+
+JOB = {"company": "Tesla", "ticker": "TSLA", "from": "2024-01-01", "to": "2024-01-07", "top_k": 5}
+
+class FakeOrchestrator:
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def run(self, company, ticker, from_date, to_date_param, top_k=5):
+        with self.lock:
+            self.calls.append(ticker)
+            attempt = len(self.calls)
+        time.sleep(self.delay)
+        if attempt <= self.failures:
+            raise RuntimeError("groq timeout")
+        return {"summary": f"{ticker} report", "confidence": 0.8}
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+def test_submit_status_and_result(queue):
+    job_id = queue.submit(dict(JOB))
+    status = queue.status(job_id)
+    assert status["status"] == "queued"
+    assert status["key"] == "TSLA|2024-01-01|2024-01-07|5"
+    assert queue.result(job_id) is None
+    assert queue.status(999) is None
+
+    claimed = queue.claim("w1")
+    assert claimed["id"] == job_id and claimed["job"]["ticker"] == "TSLA" and claimed["attempts"] == 1
+    queue.complete(job_id, "w1", {"summary": "ok"})
+    assert queue.status(job_id)["status"] == "done"
+    assert queue.result(job_id) == {"summary": "ok"}
+
+def test_submit_rejects_incomplete_jobs(queue):
+    with pytest.raises(ValueError, match="ticker"):
+        queue.submit({"company": "Tesla", "from": "2024-01-01", "to": "2024-01-07"})
+
+def test_duplicates_of_active_jobs_are_not_queued_twice(queue):
+    first = queue.submit(dict(JOB), priority=1)
+    assert queue.submit(dict(JOB, company="Tesla Inc", ticker="tsla"), priority=5) == first
+    assert queue.status(first)["priority"] == 5
+    assert queue.counts() == {"queued": 1}
+
+    queue.claim("w1")
+    assert queue.submit(dict(JOB)) == first
+    queue.complete(first, "w1", {"summary": "ok"})
+    # Finished jobs can be queued again, e.g. to refresh a report
+    assert queue.submit(dict(JOB)) != first
+
+def test_claim_order_follows_priority_then_age(queue):
+    low = queue.submit(dict(JOB, ticker="AAA"))
+    high = queue.submit(dict(JOB, ticker="BBB"), priority=10)
+    later_low = queue.submit(dict(JOB, ticker="CCC"))
+    assert [queue.claim("w")["id"] for _ in range(3)] == [high, low, later_low]
+    assert queue.claim("w") is None
+
+def test_failed_attempts_back_off_then_fail(queue):
+    job_id = queue.submit(dict(JOB), max_attempts=2)
+    queue.claim("w")
+    assert queue.fail(job_id, "w", "boom") == "queued"
+    status = queue.status(job_id)
+    assert status["error"] == "boom"
+    assert status["not_before"] > time.time()
+    # Not runnable until the backoff has passed
+    assert queue.claim("w") is None
+
+    with queue._transaction() as conn:
+        conn.execute("UPDATE jobs SET not_before = 0")
+    assert queue.claim("w")["attempts"] == 2
+    assert queue.fail(job_id, "w", "boom again") == "failed"
+    assert queue.status(job_id)["status"] == "failed"
+
+def test_retry_delay_is_exponential_and_capped():
+    assert [retry_delay(n, base=10, cap=50) for n in (1, 2, 3, 4)] == [10, 20, 40, 50]
+
+def test_cancel_only_affects_queued_jobs(queue):
+    queued = queue.submit(dict(JOB, ticker="AAA"))
+    running = queue.submit(dict(JOB, ticker="BBB"), priority=1)
+    queue.claim("w")
+    assert queue.cancel(queued)
+    assert not queue.cancel(running)
+    assert queue.status(queued)["status"] == "cancelled"
+
+def test_stale_running_jobs_are_recovered_after_restart(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    queue = JobQueue(path)
+    crashed = queue.submit(dict(JOB, ticker="AAA"), max_attempts=3)
+    exhausted = queue.submit(dict(JOB, ticker="BBB"), max_attempts=1)
+    queue.claim("dead-host:1:0")
+    queue.claim("dead-host:1:0")
+
+    # A fresh process opens the same file; the old worker's heartbeat is long gone
+    reopened = JobQueue(path)
+    assert reopened.recover_stale(stale_after=60) == 0
+    with reopened._transaction() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - 120")
+    assert reopened.recover_stale(stale_after=60) == 1
+    assert reopened.status(crashed)["status"] == "queued"
+    assert reopened.status(exhausted)["status"] == "failed"
+    assert reopened.claim("w")["attempts"] == 2
+
+def test_heartbeat_keeps_live_jobs_running(queue):
+    job_id = queue.submit(dict(JOB))
+    queue.claim("host:1:abc:0")
+    with queue._transaction() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - 120")
+    queue.heartbeat("host:1:abc")
+    assert queue.recover_stale(stale_after=60) == 0
+    assert queue.status(job_id)["status"] == "running"
+
+def test_heartbeat_only_covers_its_own_process(queue):
+    ids = [queue.submit(dict(JOB, ticker=t)) for t in ("AAA", "BBB", "CCC")]
+    queue.claim("my_host:1:ab:0")
+    queue.claim("my_host:1:abc:0")   # Another process whose name starts the same
+    queue.claim("myXhost:1:ab:0")    # "_" is not a wildcard
+    with queue._transaction() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - 120")
+    queue.heartbeat("my_host:1:ab")
+    assert queue.recover_stale(stale_after=60) == 2
+    assert [queue.status(i)["status"] for i in ids] == ["running", "queued", "queued"]
+
+def test_workers_drain_queue_in_parallel_with_retries(queue, monkeypatch):
+    monkeypatch.setattr("src.jobs.JOB_RETRY_BACKOFF", 0.0)
+    orchestrator = FakeOrchestrator(failures=1, delay=0.05)
+    ids = [queue.submit(dict(JOB, ticker=t)) for t in ("AAA", "BBB", "CCC", "DDD")]
+
+    workers = JobWorkers(queue, orchestrator, workers=3, poll_interval=0.01)
+    workers.drain(check_interval=0.01)
+
+    assert [queue.status(i)["status"] for i in ids] == ["done"] * 4
+    assert queue.result(ids[0])["summary"] == "AAA report"
+    assert workers.stats == {"done": 4, "retried": 1, "failed": 0}
+    assert len(orchestrator.calls) == 5
+
+def test_fallback_reports_count_as_failures(queue):
+    from src.agents.analyst import AnalystAgent
+
+    class FallbackOrchestrator:
+        def run(self, **kwargs):
+            return AnalystAgent._fallback_report()
+
+    job_id = queue.submit(dict(JOB), max_attempts=1)
+    workers = JobWorkers(queue, FallbackOrchestrator(), workers=1, poll_interval=0.01)
+    workers.drain(check_interval=0.01)
+    status = queue.status(job_id)
+    assert status["status"] == "failed"
+    assert status["error"] == "analysis fell back"
+    # The fallback report is still available to show
+    assert queue.result(job_id)["confidence"] == AnalystAgent._fallback_report()["confidence"]
+
+def test_late_outcome_from_a_lost_worker_is_ignored(queue):
+    job_id = queue.submit(dict(JOB))
+    queue.claim("old-host:1:0")
+    with queue._transaction() as conn:
+        conn.execute("UPDATE jobs SET heartbeat_at = heartbeat_at - 120")
+    assert queue.recover_stale(stale_after=60) == 1
+    queue.claim("new-host:2:0")
+
+    # The first worker finishes late; the re-run it was handed to keeps the job
+    assert not queue.complete(job_id, "old-host:1:0", {"summary": "stale"})
+    assert queue.fail(job_id, "old-host:1:0", "timeout") is None
+    status = queue.status(job_id)
+    assert status["status"] == "running" and status["worker"] == "new-host:2:0"
+    assert queue.result(job_id) is None
+
+    assert queue.complete(job_id, "new-host:2:0", {"summary": "fresh"})
+    assert queue.result(job_id) == {"summary": "fresh"}
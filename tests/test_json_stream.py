@@ -0,0 +1,19 @@
+import json
+from src.utils.json_stream import IncrementalJSONObjectParser
+
+def test_fields_complete_incrementally():
+    doc = {"summary": "Rising, \"strongly\" {up}", "sentiment": "positive",
+           "key_drivers": ["a", "b,c"], "evidence": [{"article_id": "1", "url": "u"}], "confidence": 0.7}
+    text = "Sure:\n" + json.dumps(doc)
+    parser = IncrementalJSONObjectParser()
+    seen = []
+    for i in range(0, len(text), 3):
+        seen.extend(parser.feed(text[i:i + 3]))
+    assert parser.done
+    assert [name for name, _ in seen] == list(doc)
+    assert dict(seen) == doc
+
+def test_partial_member_is_not_emitted():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"summary": "half') == []
+    assert parser.feed(' done", "sent') == [("summary", "half done")]
@@ -0,0 +1,29 @@
+from src.ingest.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+def test_tokenize_keeps_tickers_and_names():
+    assert tokenize("AT&T and NVDA's Q3 results") == ["at&t", "nvda's", "q3", "results"]
+
+def test_bm25_search_persist_and_remove(tmp_path):
+    path = str(tmp_path / "lexical" / "ticker_test.npz")
+    index = LexicalIndex(path)
+    index.upsert(
+        ["a", "b", "c"],
+        ["Jensen Huang unveils Blackwell GPU", "Nvidia earnings beat estimates", "Blackwell Blackwell delays hit supply"],
+        [100, 200, 300],
+        [False, False, False]
+    )
+    index.save()
+
+    reloaded = LexicalIndex(path)
+    hits = reloaded.search("blackwell", top_n=5)
+    assert [doc_id for doc_id, _ in hits] == ["c", "a"]
+    assert reloaded.search("jensen huang", top_n=5)[0][0] == "a"
+    # Date window excludes 'c'
+    assert [d for d, _ in reloaded.search("blackwell", start_ts=0, end_ts=250)] == ["a"]
+
+    reloaded.remove(["a"])
+    assert [d for d, _ in reloaded.search("blackwell")] == ["c"]
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["x", "y"], ["y", "z"]])
+    assert [d for d, _ in fused] == ["y", "x", "z"]
@@ -0,0 +1,31 @@
+import numpy as np
+from src.utils.near_dup import NearDuplicateDetector, choose_bands
+
+WIRE = ("Tesla shares jumped 5% on Tuesday after the electric carmaker reported record quarterly deliveries, "
+        "beating Wall Street expectations as demand for the Model Y stayed strong in China and Europe.")
+
+def test_syndicated_copies_are_flagged():
+    texts = [
+        "Tesla deliveries hit record " + WIRE,
+        "Tesla posts record deliveries, shares jump " + WIRE + " (Reuters)",
+        "Nvidia unveils new data center chips as AI demand keeps growing across cloud providers worldwide.",
+    ]
+    mask = NearDuplicateDetector(threshold=0.7).duplicate_mask(texts)
+    assert mask.tolist() == [False, True, False]
+
+def test_threshold_is_configurable():
+    texts = ["alpha beta gamma delta epsilon zeta", "alpha beta gamma delta epsilon theta"]
+    assert NearDuplicateDetector(threshold=0.5).duplicate_mask(texts).tolist() == [False, True]
+    assert NearDuplicateDetector(threshold=0.95).duplicate_mask(texts).tolist() == [False, False]
+
+def test_choose_bands_partitions_signature():
+    bands, rows = choose_bands(64, 0.8)
+    assert bands * rows == 64
+
+def test_scales_to_thousands():
+    rng = np.random.default_rng(0)
+    words = [f"w{i}" for i in range(5000)]
+    texts = [" ".join(rng.choice(words, 40)) for _ in range(3000)]
+    mask = NearDuplicateDetector().duplicate_mask(texts + texts[:10])
+    assert mask[-10:].all()
+    assert not mask[:3000].any()
@@ -0,0 +1,79 @@
+import numpy as np
+from unittest.mock import patch
+from src.clients.price_store import PriceStore, merge_intervals, subtract_intervals
+
+DAY = 86400
+T0 = 1704067200  # 2024-01-01
+
+class FakeFinnhub:
+    """
+    Serves one daily candle per day (close = day number) and records requested ranges.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def fetch_prices(self, symbol, resolution, from_timestamp, to_timestamp):
+        self.calls.append((from_timestamp, to_timestamp))
+        t = list(range(T0 + ((from_timestamp - T0 + DAY - 1) // DAY) * DAY, to_timestamp + 1, DAY))
+        if not t:
+            return {}
+        closes = [float((ts - T0) // DAY) for ts in t]
+        return {"s": "ok", "t": t, "o": closes, "h": closes, "l": closes, "c": closes, "v": [1.0] * len(t)}
+
+def test_interval_helpers():
+    assert merge_intervals([(5, 9), (0, 4), (20, 30)]) == [[0, 9], [20, 30]]
+    assert subtract_intervals(0, 40, [[5, 9], [20, 30]]) == [(0, 4), (10, 19), (31, 40)]
+    assert subtract_intervals(6, 8, [[5, 9]]) == []
+
+def test_only_gaps_are_fetched(tmp_path):
+    store, client = PriceStore(str(tmp_path)), FakeFinnhub()
+    first = store.get("TST", T0, T0 + 9 * DAY, fetch=client.fetch_prices)
+    assert first["c"].tolist() == [float(i) for i in range(10)]
+
+    # Sliding the window forward by two days only asks for those two days
+    second = store.get("TST", T0 + 2 * DAY, T0 + 11 * DAY, fetch=client.fetch_prices)
+    assert client.calls == [(T0, T0 + 9 * DAY), (T0 + 9 * DAY + 1, T0 + 11 * DAY)]
+    assert second["c"].tolist() == [float(i) for i in range(2, 12)]
+
+    # Fully covered ranges never hit the provider
+    store.get("TST", T0 + 3 * DAY, T0 + 5 * DAY, fetch=client.fetch_prices)
+    assert len(client.calls) == 2
+    assert store.coverage("TST") == [[T0, T0 + 11 * DAY]]
+
+def test_reads_are_views_into_the_mapped_file(tmp_path):
+    store = PriceStore(str(tmp_path))
+    store.get("TST", T0, T0 + 4 * DAY, fetch=FakeFinnhub().fetch_prices)
+    rows = store.read("TST", T0 + DAY, T0 + 3 * DAY)
+    assert len(rows) == 3
+    assert isinstance(rows.base, np.memmap) or isinstance(rows, np.memmap)
+    assert not rows.flags.writeable
+
+def test_today_is_not_marked_covered(tmp_path):
+    store, client = PriceStore(str(tmp_path)), FakeFinnhub()
+    with patch("src.clients.price_store._start_of_today", return_value=T0 + 3 * DAY):
+        store.get("TST", T0, T0 + 3 * DAY, fetch=client.fetch_prices)
+        store.get("TST", T0, T0 + 3 * DAY, fetch=client.fetch_prices)
+    assert store.coverage("TST") == [[T0, T0 + 3 * DAY - 1]]
+    assert client.calls[1] == (T0 + 3 * DAY, T0 + 3 * DAY)
+
+def test_empty_ranges_are_remembered(tmp_path):
+    store, client = PriceStore(str(tmp_path)), FakeFinnhub()
+    client.fetch_prices = lambda *args: client.calls.append(args) or {}
+    assert store.get("TST", T0, T0 + DAY, fetch=client.fetch_prices) == {}
+    assert store.get("TST", T0, T0 + DAY, fetch=client.fetch_prices) == {}
+    assert len(client.calls) == 1
+
+def test_skipped_fetches_are_not_recorded_as_covered(tmp_path):
+    from unittest.mock import MagicMock
+    from src.clients.finnhub_client import FinnhubClient
+    store = PriceStore(str(tmp_path))
+    with patch.dict("os.environ", {"FINNHUB_API_KEY": ""}):
+        keyless = FinnhubClient(cache=MagicMock())
+    assert keyless.fetch_prices("TST", "D", T0, T0 + 3 * DAY) is None
+    assert store.get("TST", T0, T0 + 3 * DAY, fetch=keyless.fetch_prices) == {}
+    assert store.coverage("TST") == []
+
+    # Once a key is set, the range is fetched normally
+    client = FakeFinnhub()
+    assert list(store.get("TST", T0, T0 + 3 * DAY, fetch=client.fetch_prices)["c"]) == [0.0, 1.0, 2.0, 3.0]
+    assert client.calls == [(T0, T0 + 3 * DAY)]
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from src.analytics.prices import (
+    align_panel, gap_mask, max_drawdown, realized_volatility, summarize, summarize_panel, volume_spike_mask, vwap,
+)
+
+DAY = 86400
+T0 = 1704153600  # 2024-01-02
+
+def _candles(closes, opens=None, volumes=None, start=T0):
+    n = len(closes)
+    return {
+        "s": "ok",
+        "c": closes,
+        "o": opens or closes,
+        "h": [c + 1 for c in closes],
+        "l": [c - 1 for c in closes],
+        "v": volumes or [100] * n,
+        "t": [start + i * DAY for i in range(n)],
+    }
+
+def test_summary_keeps_original_keys():
+    summary = summarize({"s": "ok", "c": [100.0, 120.0, 90.0, 110.0]})
+    assert summary["current_price"] == 110.0
+    assert summary["start_price"] == 100.0
+    assert summary["high"] == 120.0
+    assert summary["low"] == 90.0
+    assert summary["change_percent"] == pytest.approx(10.0)
+    assert summary["max_drawdown_percent"] == pytest.approx(-25.0)
+    assert summary["vwap"] is None
+    assert summarize({}) == {}
+
+def test_metrics_match_reference_values():
+    closes = np.array([100.0, 102.0, 99.0, 105.0, 110.0])
+    log_ret = np.diff(np.log(closes))
+    assert realized_volatility(closes) == pytest.approx(log_ret.std(ddof=1) * np.sqrt(252))
+    assert max_drawdown(closes) == pytest.approx(99 / 102 - 1)
+    v = np.array([1.0, 3.0])
+    assert vwap(np.array([11.0, 21.0]), np.array([9.0, 19.0]), np.array([10.0, 20.0]), v) == pytest.approx(17.5)
+
+def test_gap_days_and_volume_spikes():
+    payload = _candles([100, 101, 102, 103, 104, 105, 106, 107],
+                       opens=[100, 101, 105, 103, 104, 105, 106, 107],
+                       volumes=[100, 100, 100, 100, 100, 100, 100, 1000])
+    summary = summarize(payload)
+    assert summary["gap_days"] == ["2024-01-04"]
+    assert summary["volume_spikes"] == ["2024-01-09"]
+    assert gap_mask(np.array([1.0, 1.0]), np.array([1.0, 1.0])).tolist() == [False, False]
+    assert volume_spike_mask(np.array([1.0, 1.0, 1.0])).tolist() == [False, False, False]
+
+def test_panel_aligns_tickers_and_matches_single():
+    a = _candles([100, 101, 103, 102])
+    b = _candles([50, 55, 60], start=T0 + DAY)
+    tickers, t, panel = align_panel({"A": a, "B": b, "C": {}})
+    assert tickers == ["A", "B"]
+    assert len(t) == 4
+    assert np.isnan(panel["c"][1, 0])
+
+    summaries = summarize_panel({"A": a, "B": b, "C": {}})
+    assert summaries["C"] == {}
+    assert summaries["A"] == summarize(a)
+    assert summaries["B"] == summarize(b)
+
+def test_panel_matches_single_for_different_calendars():
+    # A trades every day; B skips days 1 and 3 (e.g. a different exchange holiday calendar)
+    a = _candles([100, 101, 103, 102, 104, 106], opens=[100, 101, 110, 102, 104, 106])
+    b_days = [0, 2, 4, 5]
+    b = {
+        "s": "ok",
+        "c": [50, 55, 53, 58],
+        "o": [50, 54, 53, 57],
+        "h": [51, 56, 54, 59],
+        "l": [49, 54, 52, 57],
+        "v": [100, 120, 90, 400],
+        "t": [T0 + d * DAY for d in b_days],
+    }
+    summaries = summarize_panel({"A": a, "B": b})
+    assert summaries["A"] == summarize(a)
+    assert summaries["B"] == summarize(b)
+    # B's gap from 50 to an open of 54 spans A-only days and is still found
+    assert summaries["B"]["gap_days"] == ["2024-01-04", "2024-01-06", "2024-01-07"]
+    assert summaries["B"]["volatility_percent"] is not None
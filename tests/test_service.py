@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+import pytest
+import requests
+from src.service import ReportService, make_server
+
+JOB = {"company": "Tesla", "ticker": "TSLA", "from": "2024-01-01", "to": "2024-01-07", "top_k": 5}
+
+class SlowOrchestrator:
+    def __init__(self, delay=0.2, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def run(self, company, ticker, from_date, to_date_param, top_k=5):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("provider down")
+        return {"summary": f"{ticker} report", "confidence": 0.8}
+
+def _concurrently(fn, n):
+    results, errors = [], []
+    def call():
+        try:
+            results.append(fn())
+        except Exception as e:
+            errors.append(e)
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+def test_identical_requests_share_one_run():
+    orch = SlowOrchestrator()
+    service = ReportService(orch)
+    results, errors = _concurrently(lambda: service.get_report(dict(JOB)), 5)
+    assert not errors
+    assert orch.calls == 1
+    assert sorted(source for _, source in results) == ["coalesced"] * 4 + ["computed"]
+
+    report, source = service.get_report(dict(JOB, company="Tesla Inc"))
+    assert source == "memory"
+    assert report == {"summary": "TSLA report", "confidence": 0.8}
+    assert service.get_report(dict(JOB, top_k=3))[1] == "computed"
+    assert orch.calls == 2
+
+def test_results_expire_and_are_bounded():
+    orch = SlowOrchestrator(delay=0)
+    service = ReportService(orch, result_ttl=0, cache_size=1)
+    service.get_report(dict(JOB))
+    time.sleep(0.01)
+    assert service.get_report(dict(JOB))[1] == "computed"
+
+    service = ReportService(orch, cache_size=1)
+    service.get_report(dict(JOB))
+    service.get_report(dict(JOB, ticker="AAPL"))
+    assert service.get_report(dict(JOB))[1] == "computed"
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    orch = SlowOrchestrator(fail=True)
+    service = ReportService(orch)
+    results, errors = _concurrently(lambda: service.get_report(dict(JOB)), 3)
+    assert not results
+    assert len(errors) == 3 and orch.calls == 1
+    orch.fail = False
+    assert service.get_report(dict(JOB))[1] == "computed"
+    assert service.health()["requests"]["errors"] == 1
+
+@pytest.fixture
+def server():
+    srv = make_server(ReportService(SlowOrchestrator(delay=0)), port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+def test_http_api(server):
+    health = requests.get(f"{server}/healthz").json()
+    assert health["status"] == "ok" and health["inflight"] == 0
+
+    first = requests.get(f"{server}/report", params=JOB).json()
+    assert first["source"] == "computed"
+    assert first["key"] == "TSLA|2024-01-01|2024-01-07|5"
+    second = requests.post(f"{server}/report", data=json.dumps(JOB)).json()
+    assert second["source"] == "memory"
+    assert second["report"] == first["report"]
+
+    missing = requests.get(f"{server}/report", params={"ticker": "TSLA"})
+    assert missing.status_code == 400
+    assert "company" in missing.json()["error"]
+    assert requests.get(f"{server}/nope").status_code == 404
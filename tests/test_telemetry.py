@@ -0,0 +1,124 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+from src import telemetry
+
+def test_disabled_is_a_no_op():
+    with telemetry.run("pipeline", enabled=False) as recorder:
+        assert recorder is None
+        assert telemetry.span("collect") is telemetry.span("ingest")
+        telemetry.count("articles", 3)
+    assert telemetry.current() is None
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        with telemetry.span("x"):
+            pass
+    assert time.perf_counter() - start < 0.5
+
+def test_spans_nest_and_counters_add_up(tmp_path):
+    with patch.object(telemetry, "TELEMETRY_EXPORT", ""):
+        with telemetry.run("pipeline", enabled=True, ticker="TSLA") as recorder:
+            with telemetry.span("collect"):
+                with telemetry.span("provider.finnhub_news"):
+                    telemetry.count("articles.raw", 2)
+                telemetry.count("articles.raw", 3)
+            try:
+                with telemetry.span("analyze"):
+                    raise ValueError("boom")
+            except ValueError:
+                pass
+    spans = {s["name"]: s for s in recorder.spans}
+    assert spans["provider.finnhub_news"]["parent"] == "collect"
+    assert spans["collect"]["parent"] == "pipeline"
+    assert spans["analyze"]["error"] == "ValueError"
+    assert recorder.counters == {"articles.raw": 5}
+    assert set(recorder.summary()["spans_ms"]) == {"pipeline", "collect", "provider.finnhub_news", "analyze"}
+
+def test_bind_carries_the_run_into_pool_threads():
+    def work(i):
+        with telemetry.span("provider.call"):
+            telemetry.count("calls")
+        return i
+
+    with telemetry.run("pipeline", enabled=True) as recorder:
+        with telemetry.span("collect"), ThreadPoolExecutor(4) as pool:
+            results = [f.result() for f in [pool.submit(telemetry.bind(work), i) for i in range(8)]]
+    assert results == list(range(8))
+    assert recorder.counters["calls"] == 8
+    assert {s["parent"] for s in recorder.spans if s["name"] == "provider.call"} == {"collect"}
+
+def test_exporters(tmp_path):
+    path = tmp_path / "runs.jsonl"
+    with patch.object(telemetry, "TELEMETRY_EXPORT", str(path)):
+        for _ in range(2):
+            with telemetry.run("pipeline", enabled=True, ticker="TSLA"):
+                telemetry.count("cache.llm.hit")
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(lines) == 2
+    assert lines[0]["labels"] == {"ticker": "TSLA"}
+    assert lines[0]["counters"] == {"cache.llm.hit": 1}
+
+    prom = tmp_path / "metrics.prom"
+    with telemetry.run("pipeline", enabled=True) as recorder:
+        pass
+    telemetry.export(recorder, str(prom))
+    text = prom.read_text()
+    assert "# TYPE finintel_span_seconds summary" in text
+    assert 'finintel_span_seconds_count{span="pipeline"}' in text
+    assert "finintel_cache_llm_hit_total" in text
+
+def test_orchestrator_attaches_timing_block():
+    with patch("src.orchestrator.DataCollector"), patch("src.orchestrator.ChromaIngest"), \
+         patch("src.orchestrator.AnalystAgent"):
+        from src.orchestrator import Orchestrator
+        orch = Orchestrator()
+    orch.collector.collect.return_value = {"articles": [{"id": "1"}], "prices": {}, "timings": {}}
+    orch.chroma.ingest_articles.return_value = {"added": 1, "updated": 0, "skipped": 0}
+    orch.chroma.query.return_value = [{"id": "1"}]
+    orch.analyst.analyze.return_value = {"summary": "s"}
+    orch._save_result = MagicMock()
+
+    with patch.object(telemetry, "TELEMETRY_ENABLED", True), \
+         patch.object(telemetry, "TELEMETRY_IN_REPORT", True), \
+         patch.object(telemetry, "TELEMETRY_EXPORT", ""):
+        report = orch.run("Tesla", "TSLA", "2024-01-01", "2024-01-07")
+    block = report["telemetry"]
+    assert {"collect", "ingest", "retrieve", "analyze"} <= set(block["spans_ms"])
+    assert block["counters"]["ingest.added"] == 1
+    assert block["counters"]["docs.retrieved"] == 1
+
+    # Disabled (the default): reports are left untouched
+    orch.analyst.analyze.return_value = {"summary": "s"}
+    assert "telemetry" not in orch.run("Tesla", "TSLA", "2024-01-01", "2024-01-07")
+
+def test_run_stream_keeps_its_recorder_to_itself():
+    with patch("src.orchestrator.DataCollector"), patch("src.orchestrator.ChromaIngest"), \
+         patch("src.orchestrator.AnalystAgent"):
+        from src.orchestrator import Orchestrator
+        orch = Orchestrator()
+    orch.collector.collect.return_value = {"articles": [], "prices": {}, "timings": {}}
+    orch.chroma.ingest_articles.return_value = {}
+    orch.chroma.query.return_value = []
+    orch.analyst.analyze_stream.side_effect = lambda **kwargs: iter([
+        {"type": "field", "name": "summary", "value": "s"},
+        {"type": "report", "report": {"summary": "s"}},
+    ])
+    orch._save_result = MagicMock()
+
+    with patch.object(telemetry, "TELEMETRY_ENABLED", True), \
+         patch.object(telemetry, "TELEMETRY_IN_REPORT", True), \
+         patch.object(telemetry, "TELEMETRY_EXPORT", ""):
+        events = list(orch.run_stream("Tesla", "TSLA", "2024-01-01", "2024-01-07"))
+        assert "analyze" in events[-1]["report"]["telemetry"]["spans_ms"]
+
+        with telemetry.run("outer") as outer:
+            stream = orch.run_stream("Tesla", "TSLA", "2024-01-01", "2024-01-07")
+            next(stream)
+            # The stream's run is not visible to the consumer between events...
+            assert telemetry._recorder.get() is outer
+            # ...and abandoning it leaves the consumer's run in place
+            stream.close()
+            assert telemetry._recorder.get() is outer
+    assert telemetry._recorder.get() is None
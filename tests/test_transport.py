@@ -0,0 +1,20 @@
+import pytest
+from unittest.mock import patch
+from src.clients import transport
+
+def test_shared_session_is_reused():
+    assert transport.get_session() is transport.get_session()
+
+def test_configure_sets_pool_sizes():
+    transport.configure(pool_connections=3, pool_maxsize=7)
+    adapter = transport.get_session().get_adapter("https://finnhub.io")
+    assert adapter._pool_connections == 3
+    assert adapter._pool_maxsize == 7
+    transport.configure()
+
+def test_request_applies_default_timeout():
+    with patch.object(transport.get_session(), "request") as mock_request:
+        transport.get("https://example.com", params={"a": 1})
+        _, kwargs = mock_request.call_args
+        assert kwargs["timeout"] == (transport.CONNECT_TIMEOUT, transport.READ_TIMEOUT)
+        assert kwargs["params"] == {"a": 1}
@@ -0,0 +1,20 @@
+from src.utils.validators import get_validator, validate_articles
+
+def _article(**overrides):
+    art = {"id": "1", "source": "s", "title": "t", "text": "x", "url": "http://a.com",
+           "published_at": "2024-01-01T00:00:00Z", "ingested_at": "2024-01-01T00:00:00Z"}
+    art.update(overrides)
+    return art
+
+def test_validator_is_compiled_once():
+    assert get_validator("article") is get_validator("article")
+
+def test_validate_articles_batch_summary():
+    bad_type = _article(id=2)
+    missing = _article()
+    del missing["url"]
+    valid, summary = validate_articles([_article(), bad_type, missing, _article(id=3)])
+    assert valid == [_article()]
+    assert summary["total"] == 4
+    assert summary["invalid"] == 3
+    assert summary["errors"] == {"id: type": 2, "'url' is a required property": 1}